@@ -1,5 +1,6 @@
 from django.contrib import admin
 from django.contrib.auth.admin import UserAdmin
+from marine_lms.paginators import EstimatedCountPaginator
 from .models import User, Position, ShipType
 
 
@@ -19,8 +20,12 @@ class CustomUserAdmin(UserAdmin):
     model = User
     list_display = ("username", "email", "phone_number", "position", "ship_type", "role", "is_active")
     list_filter = ("role", "position", "ship_type", "is_active", "is_staff")
+    list_select_related = ("position", "ship_type")
+    autocomplete_fields = ("position", "ship_type")
     search_fields = ("username", "email", "phone_number")
     ordering = ("username",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
     fieldsets = (
         (None, {"fields": ("username", "password")}),
@@ -0,0 +1,29 @@
+"""
+Read-only serialization straight from ``.values()`` rows, mirroring the
+output of the matching ModelSerializers (see courses.fast_serializers).
+"""
+from courses.fast_serializers import format_datetime
+
+
+# ----------------------------
+# AdminUserSerializer
+# ----------------------------
+def fast_admin_users(users):
+    rows = users.values(
+        "id", "username", "email", "phone_number", "role",
+        "position__name", "ship_type__name", "last_login", "created_at"
+    )
+    return [
+        {
+            "id": row["id"],
+            "username": row["username"],
+            "email": row["email"],
+            "phone_number": row["phone_number"],
+            "role": row["role"],
+            "position": row["position__name"],
+            "ship_type": row["ship_type__name"],
+            "last_login": format_datetime(row["last_login"]),
+            "created_at": format_datetime(row["created_at"]),
+        }
+        for row in rows.iterator(chunk_size=2000)
+    ]
@@ -1,4 +1,4 @@
-from django.contrib.auth.models import AbstractUser
+from django.contrib.auth.models import AbstractUser, UserManager
 from django.db import models
 from django.utils import timezone
 
@@ -25,6 +25,13 @@ class Position(BaseModel):
         return self.name
 
 
+class ActiveUserManager(UserManager):
+    """Default manager: hides soft-deleted users (see User.soft_delete)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class User(AbstractUser, BaseModel):
     phone_number = models.CharField(max_length=20, blank=True, null=True)
     position = models.ForeignKey(Position, on_delete=models.SET_NULL, null=True, blank=True)
@@ -35,6 +42,21 @@ class User(AbstractUser, BaseModel):
         ('employee', 'Employee'),
     )
     role = models.CharField(max_length=20, choices=ROLE_CHOICES, default='employee')
+    deleted_at = models.DateTimeField(blank=True, null=True, db_index=True)
+
+    objects = ActiveUserManager()
+    all_objects = UserManager()
+
+    def soft_delete(self):
+        """
+        Hide the user at once; ``manage.py purge_deleted`` removes the row and
+        its progress later in small batches. The username is released so it
+        can be registered again.
+        """
+        self.deleted_at = timezone.now()
+        self.is_active = False
+        self.username = f"deleted-{self.pk}-{self.username}"[:150]
+        self.save(update_fields=["deleted_at", "is_active", "username", "updated_at"])
 
     def __str__(self):
         return f"{self.username} ({self.position} - {self.ship_type})"
@@ -5,6 +5,7 @@ from .models import Position, ShipType
 from courses.models import Course, Module
 from progress.models import UserCourseProgress
 from django.contrib.auth.models import update_last_login
+from marine_lms import metrics
 
 User = get_user_model()
 
@@ -25,6 +26,7 @@ class CustomTokenObtainPairSerializer(TokenObtainPairSerializer):
 
         # Update last login manually
         update_last_login(None, self.user)
+        metrics.increment("logins_total")
 
         # Add custom response fields
         data['id'] = self.user.id
@@ -94,15 +96,11 @@ class AdminCourseSerializer(serializers.ModelSerializer):
         read_only=True,
         slug_field="name"
     )
-    modules_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
         fields = ["id", "title", "description", "ship_type", "positions", "modules_count"]
 
-    def get_modules_count(self, obj):
-        return obj.modules.count()
-
 
 class AdminUserSerializer(serializers.ModelSerializer):
     position = serializers.CharField(source="position.name", default=None)
@@ -133,7 +131,6 @@ class LearnerCourseProgressSerializer(serializers.ModelSerializer):
 
 class LearnerCourseSerializer(serializers.ModelSerializer):
     status = serializers.SerializerMethodField()
-    modules_count = serializers.SerializerMethodField()
 
     class Meta:
         model = Course
@@ -143,6 +140,3 @@ class LearnerCourseSerializer(serializers.ModelSerializer):
         user = self.context['request'].user
         progress = UserCourseProgress.objects.filter(user=user, course=obj).first()
         return progress.status if progress else "not_started"
-
-    def get_modules_count(self, obj):
-        return obj.modules.count()
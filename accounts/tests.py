@@ -1,3 +1,215 @@
-from django.test import TestCase
+import json
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.test import APIClient
+from courses.models import Course
+from marine_lms.nplusone import detect_n_plus_one
+from marine_lms.paginators import EstimatedCountPaginator
+from marine_lms.testing import AdminQueryBudgetTestCase
+from marine_lms.throttling import SlidingWindowThrottle
+from progress.models import UserCourseProgress
+from .models import Position, ShipType, User
 
-# Create your tests here.
+
+class AdminQueryBudgetTests(AdminQueryBudgetTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.ship_types = ShipType.objects.bulk_create([ShipType(name=f"Ship type {i}") for i in range(3)])
+        cls.positions = Position.objects.bulk_create([Position(name=f"Position {i}") for i in range(3)])
+
+    def add_rows(self, count):
+        start = User.objects.count()
+        User.objects.bulk_create([
+            User(
+                username=f"crew-{start + i}", email=f"crew-{start + i}@example.com",
+                ship_type=self.ship_types[i % 3], position=self.positions[i % 3]
+            )
+            for i in range(count)
+        ])
+
+    def test_user_changelist(self):
+        self.assert_bounded(reverse("admin:accounts_user_changelist"))
+
+    def test_user_change_form(self):
+        self.add_rows(40)
+        user = User.objects.exclude(pk=self.admin.pk).first()
+        url = reverse("admin:accounts_user_change", args=[user.pk])
+        few = self.page_queries(url)
+        Position.objects.bulk_create([Position(name=f"Extra position {i}") for i in range(40)])
+        # Autocomplete widgets do not render every position as an <option>
+        self.assertEqual(self.page_queries(url), few)
+
+
+class AccountsQueryTests(TestCase):
+    """Admin lists run a fixed number of queries per request."""
+
+    @classmethod
+    def setUpTestData(cls):
+        ship_type = ShipType.objects.create(name="Tanker")
+        positions = Position.objects.bulk_create([Position(name=f"Position {i}") for i in range(3)])
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="admin", is_staff=True)
+        for i in range(6):
+            User.objects.create_user(f"crew-{i}", f"crew-{i}@example.com", "pw",
+                                     ship_type=ship_type, position=positions[i % 3])
+            course = Course.objects.create(title=f"Course {i}", ship_type=ship_type)
+            course.positions.set(positions[:i % 3 + 1])
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def test_employee_list(self):
+        with detect_n_plus_one(threshold=1):
+            response = self.client.get(reverse("user-list-create"))
+            rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual(len(rows), 6)
+
+    def test_admin_dashboard(self):
+        with detect_n_plus_one(threshold=1):
+            response = self.client.get(reverse("admin-dashboard"))
+        self.assertEqual(len(response.data["courses"]), 6)
+        self.assertEqual(response.data["courses"][2]["positions"], ["Position 0", "Position 1", "Position 2"])
+
+
+class UserAPITests(TestCase):
+    """Soft-deleted users and courses."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ship_type = ShipType.objects.create(name="Tanker")
+        cls.position = Position.objects.create(name="Master")
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="admin", is_staff=True)
+        cls.crew = User.objects.create_user(
+            "crew", "crew@example.com", "pw", ship_type=cls.ship_type, position=cls.position
+        )
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+    def employee_ids(self):
+        response = self.client.get(reverse("user-list-create"))
+        return [row["id"] for row in json.loads(b"".join(response.streaming_content))]
+
+    def test_soft_delete_hides_user_and_releases_username(self):
+        response = self.client.delete(reverse("user-detail", args=[self.crew.id]))
+        self.assertEqual(response.status_code, 204)
+
+        self.assertFalse(User.objects.filter(id=self.crew.id).exists())
+        deleted = User.all_objects.get(id=self.crew.id)
+        self.assertIsNotNone(deleted.deleted_at)
+        self.assertFalse(deleted.is_active)
+        self.assertEqual(self.client.get(reverse("user-detail", args=[self.crew.id])).status_code, 404)
+        self.assertNotIn(self.crew.id, self.employee_ids())
+
+        response = self.client.post(reverse("user-list-create"), {
+            "username": "crew", "email": "crew2@example.com", "password": "pw"
+        })
+        self.assertEqual(response.status_code, 201)
+
+    def test_purge_removes_deleted_user_and_progress(self):
+        course = Course.objects.create(title="Fire fighting", ship_type=self.ship_type)
+        UserCourseProgress.objects.create(user=self.crew, course=course, status="in_progress")
+        self.crew.soft_delete()
+
+        call_command("purge_deleted", chunk_size=1, stdout=StringIO())
+        self.assertFalse(User.all_objects.filter(id=self.crew.id).exists())
+        self.assertFalse(UserCourseProgress.objects.filter(user_id=self.crew.id).exists())
+        self.assertTrue(Course.objects.filter(id=course.id).exists())
+
+    def test_learner_dashboard_hides_deleted_courses(self):
+        courses = [
+            Course.objects.create(title=title, ship_type=self.ship_type) for title in ("Fire fighting", "Ballast")
+        ]
+        for course in courses:
+            course.positions.set([self.position])
+            UserCourseProgress.objects.create(user=self.crew, course=course, status="in_progress")
+        courses[0].soft_delete()
+
+        self.client.force_authenticate(self.crew)
+        data = self.client.get(reverse("learner-dashboard")).data
+        self.assertEqual([row["id"] for row in data["courses"]], [courses[1].id])
+        self.assertEqual(len(data["progress"]), 1)
+        self.assertEqual([row["course_id"] for row in data["assignments"]], [courses[1].id])
+
+
+class AdminEstimatedCountTests(AdminQueryBudgetTestCase):
+    """The users changelist pages with the planner's estimate once it is large."""
+
+    def setUp(self):
+        super().setUp()
+        self.url = reverse("admin:accounts_user_changelist")
+        User.objects.create_user("crew", "crew@example.com", "pw").soft_delete()
+
+    def result_count(self, params=None):
+        with mock.patch.object(EstimatedCountPaginator, "table_estimate", return_value=250000) as estimate:
+            response = self.client.get(self.url, params or {})
+        self.assertEqual(response.status_code, 200)
+        return response.context["cl"].result_count, estimate.called
+
+    def test_soft_delete_filter_still_estimates(self):
+        self.assertEqual(self.result_count(), (250000, True))
+
+    def test_filtered_list_counts_exactly(self):
+        self.assertEqual(self.result_count({"is_staff__exact": "1"}), (1, False))
+
+    def test_small_estimate_counts_exactly(self):
+        with mock.patch.object(EstimatedCountPaginator, "table_estimate", return_value=50):
+            response = self.client.get(self.url)
+        self.assertEqual(response.context["cl"].result_count, 1)
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {"login": "2/min", "login_ip": "5/min"},
+})
+class LoginThrottleTests(TestCase):
+    """Sliding-window limits on the login endpoint."""
+
+    START = 60.0 * 1000  # the start of a one-minute window
+
+    @classmethod
+    def setUpTestData(cls):
+        User.objects.create_user("crew", "crew@example.com", "pw")
+
+    def setUp(self):
+        cache.clear()
+        self.url = reverse("token_obtain_pair")
+
+    def login(self, username, at, password="wrong"):
+        with mock.patch.object(SlidingWindowThrottle, "timer", return_value=self.START + at):
+            return self.client.post(self.url, {"username": username, "password": password})
+
+    def test_username_limit_returns_429_with_retry_after(self):
+        self.assertEqual(self.login("crew", 0).status_code, 401)
+        self.assertEqual(self.login("CREW", 1).status_code, 401)
+
+        response = self.login("crew", 2, password="pw")
+        self.assertEqual(response.status_code, 429)
+        # Full window: wait for it to roll over, then half of the next one
+        self.assertEqual(response["Retry-After"], "88")
+
+    def test_other_usernames_are_not_limited(self):
+        self.login("crew", 0)
+        self.login("crew", 1)
+        self.assertEqual(self.login("mate", 2).status_code, 401)
+
+    def test_limit_slides_into_the_next_window(self):
+        self.login("crew", 0)
+        self.login("crew", 1)
+        self.assertEqual(self.login("crew", 89).status_code, 429)
+        self.assertEqual(self.login("crew", 90, password="pw").status_code, 200)
+
+    def test_ip_limit(self):
+        for index in range(5):
+            self.assertEqual(self.login(f"user-{index}", index).status_code, 401)
+        response = self.login("crew", 5, password="pw")
+        self.assertEqual(response.status_code, 429)
+        self.assertIn("Retry-After", response)
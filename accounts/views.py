@@ -2,6 +2,7 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
 from django.contrib.auth import get_user_model
+from django.db.models import Count
 from .models import Position, ShipType
 from .serializers import (
     UserSerializer,
@@ -15,16 +16,21 @@ from .serializers import (
     CustomTokenObtainPairSerializer,
     LearnerCourseSerializer
 )
+from .fast_serializers import fast_admin_users
 from courses.models import Course
-from progress.models import UserCourseProgress
+from progress.models import TrainingStatus, UserCourseProgress
 from rest_framework.permissions import IsAuthenticated
 from rest_framework_simplejwt.views import TokenObtainPairView
+from marine_lms.streaming import StreamingListMixin
+from marine_lms.throttling import IPThrottle, UsernameThrottle
 
 User = get_user_model()
 
 
 class CustomTokenObtainPairView(TokenObtainPairView):
     serializer_class = CustomTokenObtainPairSerializer
+    throttle_scope = "login"
+    throttle_classes = [UsernameThrottle, IPThrottle]
 
 
 class AdminDashboardAPIView(APIView):
@@ -41,31 +47,38 @@ class AdminDashboardAPIView(APIView):
         assigned_course_count = Course.objects.count()
 
         # Completion Rate (for employees only)
-        total_enrollments = UserCourseProgress.objects.filter(
-            user__role='employee'
-        ).count()
-
-        completed_courses = UserCourseProgress.objects.filter(
+        enrollments = UserCourseProgress.objects.filter(
             user__role='employee',
-            status='completed'
-        ).count()
+            user__deleted_at__isnull=True,
+            course__deleted_at__isnull=True
+        )
+        total_enrollments = enrollments.count()
+
+        completed_courses = enrollments.filter(status='completed').count()
 
         completion_rate = 0
         if total_enrollments > 0:
             completion_rate = (completed_courses / total_enrollments) * 100
 
         # ALL COURSES
-        courses = Course.objects.all()
+        courses = Course.objects.select_related("ship_type").prefetch_related("positions")
         course_data = AdminCourseSerializer(courses, many=True).data
 
         # ONLY EMPLOYEES
         users = User.objects.filter(role='employee')
-        user_data = AdminUserSerializer(users, many=True).data
+        user_data = fast_admin_users(users)
+
+        # Overdue / expiring / never started, from the nightly summary
+        training_status = {choice: 0 for choice, _ in TrainingStatus.STATUS_CHOICES}
+        training_status.update(
+            TrainingStatus.objects.values_list("status").annotate(n=Count("id")).order_by()
+        )
 
         data = {
             "active_user_count": active_user_count,
             "assigned_course_count": assigned_course_count,
             "completion_rate": round(completion_rate, 2),
+            "training_status": training_status,
             "courses": course_data,
             "users": user_data,
         }
@@ -79,11 +92,8 @@ class LearnerDashboardAPIView(APIView):
     def get(self, request):
         user = request.user
 
-        # 1. Assigned courses (based on ship type & position)
-        assigned_courses = Course.objects.filter(
-            ship_type=user.ship_type,
-            positions=user.position
-        ).distinct()
+        # 1. Assigned courses (materialized from ship type & position)
+        assigned_courses = Course.objects.filter(assignments__user=user)
 
         # 2. Course Details Serializer
         course_serializer = LearnerCourseSerializer(
@@ -96,13 +106,19 @@ class LearnerDashboardAPIView(APIView):
         profile_serializer = LearnerProfileSerializer(user)
 
         # 4. User Progress for all assigned courses
-        progress = UserCourseProgress.objects.filter(user=user)
+        progress = UserCourseProgress.objects.filter(user=user, course__deleted_at__isnull=True)
         progress_serializer = LearnerCourseProgressSerializer(progress, many=True)
 
+        # 5. Due dates
+        assignments = user.assignments.order_by("due_date", "course_id").values(
+            "course_id", "assigned_at", "due_date"
+        )
+
         return Response({
             "profile": profile_serializer.data,
             "progress": progress_serializer.data,
-            "courses": course_serializer.data
+            "courses": course_serializer.data,
+            "assignments": list(assignments)
         })
 
     
@@ -110,7 +126,7 @@ class LearnerDashboardAPIView(APIView):
 # ----------------------------
 # Position CRUD (Admin only)
 # ----------------------------
-class PositionAPIView(APIView):
+class PositionAPIView(StreamingListMixin, APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get_object(self, pk):
@@ -129,8 +145,7 @@ class PositionAPIView(APIView):
             return Response(serializer.data)
         else:
             positions = Position.objects.all()
-            serializer = PositionSerializer(positions, many=True)
-            return Response(serializer.data)
+            return self.list_response(request, positions, lambda objs: PositionSerializer(objs, many=True).data)
 
     # POST create (only list endpoint)
     def post(self, request):
@@ -174,7 +189,7 @@ class PositionAPIView(APIView):
 # ----------------------------
 # ShipType CRUD (Admin only)
 # ----------------------------
-class ShipTypeAPIView(APIView):
+class ShipTypeAPIView(StreamingListMixin, APIView):
     permission_classes = [permissions.IsAdminUser]
 
     def get_object(self, pk):
@@ -193,8 +208,7 @@ class ShipTypeAPIView(APIView):
             return Response(serializer.data)
         else:
             ship_types = ShipType.objects.all()
-            serializer = ShipTypeSerializer(ship_types, many=True)
-            return Response(serializer.data)
+            return self.list_response(request, ship_types, lambda objs: ShipTypeSerializer(objs, many=True).data)
 
     # POST create (only for list endpoint)
     def post(self, request):
@@ -238,8 +252,9 @@ class ShipTypeAPIView(APIView):
 # ----------------------------
 # Admin: User CRUD
 # ----------------------------
-class UserAPIView(APIView):
+class UserAPIView(StreamingListMixin, APIView):
     permission_classes = [permissions.IsAdminUser]
+    stream_list = True
 
     def get_object(self, pk):
         try:
@@ -257,9 +272,8 @@ class UserAPIView(APIView):
             return Response(serializer.data)
         else:
             # Fetch only employees
-            users = User.objects.filter(role='employee')
-            serializer = UserSerializer(users, many=True)
-            return Response(serializer.data)
+            users = User.objects.filter(role='employee').select_related('position', 'ship_type')
+            return self.list_response(request, users, lambda objs: UserSerializer(objs, many=True).data)
 
     # POST: Create user
     def post(self, request):
@@ -296,7 +310,8 @@ class UserAPIView(APIView):
         user = self.get_object(pk)
         if not user:
             return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
-        user.delete()
+        # Hidden now, purged in batches by `purge_deleted`
+        user.soft_delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 # ----------------------------
@@ -0,0 +1,15 @@
+from django.contrib import admin
+from marine_lms.paginators import EstimatedCountPaginator
+from .models import Certificate
+
+
+@admin.register(Certificate)
+class CertificateAdmin(admin.ModelAdmin):
+    list_display = ("user", "course", "status", "template_version", "completed_at", "updated_at")
+    list_filter = ("status",)
+    list_select_related = ("user__position", "user__ship_type", "course")
+    raw_id_fields = ("user", "course")
+    search_fields = ("user__username", "course__title")
+    readonly_fields = ("template_version", "content_hash", "file")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
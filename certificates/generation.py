@@ -0,0 +1,226 @@
+"""
+Certificate generation pipeline.
+
+``queue_certificate`` marks a (user, course) certificate pending when the
+course is completed; ``schedule_generation`` then drains the pending rows
+after commit on a background thread. PDFs are rendered in a process pool
+(certificates.template is CPU-bound and free of Django state) and stored
+content-addressed under ``certificates/<sha256>.pdf``, so identical output
+is written once and a row only changes when its bytes do.
+
+Rows rendered with an older TEMPLATE_VERSION are re-queued on download or
+by ``manage.py generate_certificates``.
+"""
+import hashlib
+import logging
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.core.files.storage import default_storage
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.utils import timezone
+from progress.models import UserCourseProgress
+from .models import Certificate
+from .template import TEMPLATE_VERSION, render_certificate
+
+logger = logging.getLogger(__name__)
+
+_dispatcher = ThreadPoolExecutor(max_workers=1, thread_name_prefix="certificates")
+_pool = None
+_lock = threading.Lock()
+_queued = False
+
+
+def render_pool():
+    """Lazily started; spawned rather than forked so no DB connection or thread is inherited."""
+    global _pool
+    with _lock:
+        if _pool is None:
+            _pool = ProcessPoolExecutor(
+                max_workers=settings.CERTIFICATE_RENDER_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return _pool
+
+
+def reset_render_pool():
+    """Drop a broken pool (a worker was killed) so the next batch starts a new one."""
+    global _pool
+    with _lock:
+        if _pool is not None:
+            _pool.shutdown(wait=False, cancel_futures=True)
+        _pool = None
+
+
+def needs_render(certificate):
+    """
+    Not rendered yet (or failed), or rendered with an older template. A
+    later completion of the same course keeps the certificate already issued.
+    """
+    return certificate.status != "ready" or certificate.template_version != TEMPLATE_VERSION
+
+
+def queue_certificate(user_id, course_id, completed_at):
+    """Mark the certificate pending if it is missing or out of date; returns it."""
+    certificate, created = Certificate.objects.get_or_create(
+        user_id=user_id, course_id=course_id,
+        defaults={"completed_at": completed_at}
+    )
+    if not created and needs_render(certificate):
+        certificate.status = "pending"
+        certificate.completed_at = completed_at
+        certificate.save(update_fields=["status", "completed_at", "updated_at"])
+    if certificate.status == "pending":
+        schedule_generation()
+    return certificate
+
+
+def queue_certificates(completions):
+    """
+    ``queue_certificate`` for many ``(user_id, course_id, completed_at)``
+    completions at once, for bulk writers that send no post_save.
+    """
+    completions = list(completions)
+    if not completions:
+        return
+    Certificate.objects.bulk_create(
+        [
+            Certificate(user_id=user_id, course_id=course_id, completed_at=completed_at)
+            for user_id, course_id, completed_at in completions
+        ],
+        batch_size=500,
+        ignore_conflicts=True
+    )
+    # A superset of the pairs, but any stale row there is due anyway
+    Certificate.objects.filter(
+        user_id__in={user_id for user_id, _, _ in completions},
+        course_id__in={course_id for _, course_id, _ in completions}
+    ).filter(Q(status="failed") | ~Q(template_version=TEMPLATE_VERSION)).update(status="pending")
+    schedule_generation()
+
+
+def queue_missing(batch_size=1000):
+    """
+    Queue certificates for every completed course that has none (completions
+    written in bulk send no signals) and re-queue ones rendered with an
+    older template. Returns ``(created, requeued)``.
+    """
+    completed = (
+        UserCourseProgress.objects
+        .filter(status="completed", user__deleted_at__isnull=True, course__deleted_at__isnull=True)
+        .exclude(Exists(Certificate.objects.filter(user=OuterRef("user"), course=OuterRef("course"))))
+        .values_list("user_id", "course_id", "completed_at")
+        .iterator(chunk_size=batch_size)
+    )
+    created, batch = 0, []
+    for user_id, course_id, completed_at in completed:
+        batch.append(Certificate(user_id=user_id, course_id=course_id, completed_at=completed_at))
+        if len(batch) >= batch_size:
+            created += len(Certificate.objects.bulk_create(batch, ignore_conflicts=True))
+            batch = []
+    created += len(Certificate.objects.bulk_create(batch, ignore_conflicts=True))
+
+    requeued = (
+        Certificate.objects
+        .filter(Q(status="failed") | ~Q(template_version=TEMPLATE_VERSION))
+        .exclude(status="pending")
+        .update(status="pending")
+    )
+    return created, requeued
+
+
+def certificate_context(certificate):
+    user, course = certificate.user, certificate.course
+    completed_at = certificate.completed_at
+    return {
+        "name": user.get_full_name() or user.username,
+        "course": course.title,
+        "ship_type": course.ship_type.name,
+        "completed": completed_at.date().isoformat() if completed_at else "",
+        "number": f"{certificate.id:08d}",
+    }
+
+
+def store(data):
+    """Save ``data`` under its sha256 unless already stored; returns ``(hash, name)``."""
+    content_hash = hashlib.sha256(data).hexdigest()
+    name = f"certificates/{content_hash}.pdf"
+    if not default_storage.exists(name):
+        name = default_storage.save(name, ContentFile(data))
+    return content_hash, name
+
+
+def generate_pending(batch_size=50):
+    """Render pending certificates until none are left; returns the number rendered."""
+    rendered = 0
+    while True:
+        certificates = list(
+            Certificate.objects.filter(status="pending")
+            .select_related("user", "course__ship_type")
+            .order_by("id")[:batch_size]
+        )
+        if not certificates:
+            return rendered
+
+        pool = render_pool()
+        futures = [pool.submit(render_certificate, certificate_context(c)) for c in certificates]
+        now = timezone.now()
+        for certificate, future in zip(certificates, futures):
+            certificate.updated_at = now
+            try:
+                certificate.content_hash, certificate.file = store(future.result())
+            except BrokenProcessPool:
+                reset_render_pool()
+                logger.exception("Render pool broke; certificate %s stays pending", certificate.id)
+                return rendered
+            except Exception:
+                logger.exception("Rendering certificate %s failed", certificate.id)
+                certificate.status = "failed"
+                continue
+            certificate.status = "ready"
+            certificate.template_version = TEMPLATE_VERSION
+            rendered += 1
+
+        # Skip rows re-queued with a newer completion date while rendering;
+        # they are picked up again by the next batch.
+        with transaction.atomic():
+            current = set(
+                Certificate.objects.select_for_update()
+                .filter(id__in=[c.id for c in certificates], status="pending")
+                .values_list("id", "completed_at")
+            )
+            Certificate.objects.bulk_update(
+                [c for c in certificates if (c.id, c.completed_at) in current],
+                ["status", "template_version", "content_hash", "file", "updated_at"]
+            )
+
+
+def schedule_generation():
+    """Drain the queue after commit; coalesces requests while a run is waiting."""
+    transaction.on_commit(_submit)
+
+
+def _submit():
+    global _queued
+    with _lock:
+        if _queued:
+            return
+        _queued = True
+    _dispatcher.submit(_generate_in_background)
+
+
+def _generate_in_background():
+    global _queued
+    with _lock:
+        _queued = False
+    close_old_connections()
+    try:
+        generate_pending()
+    except Exception:
+        logger.exception("Certificate generation failed")
+    finally:
+        connections.close_all()
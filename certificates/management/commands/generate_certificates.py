@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from certificates.generation import generate_pending, queue_missing
+
+
+class Command(BaseCommand):
+    help = (
+        "Queue certificates for completed courses that have none or were rendered "
+        "with an older template, then render every pending certificate."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=50, help="Certificates rendered per batch.")
+        parser.add_argument("--queue-only", action="store_true", help="Queue without rendering.")
+
+    def handle(self, *args, **options):
+        created, requeued = queue_missing()
+        self.stdout.write(f"Queued {created} new and {requeued} outdated or failed certificates.")
+        if options["queue_only"]:
+            return
+
+        rendered = generate_pending(batch_size=options["batch_size"])
+        self.stdout.write(self.style.SUCCESS(f"Rendered {rendered} certificates."))
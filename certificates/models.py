@@ -0,0 +1,32 @@
+from django.db import models
+from django.conf import settings
+from courses.models import Course
+
+
+class Certificate(models.Model):
+    """
+    Training certificate for a completed course. Rows double as the
+    generation queue: ``pending`` rows are rendered by
+    certificates.generation and the PDF is stored under its content hash.
+    """
+    STATUS_CHOICES = (
+        ('pending', 'Pending'),
+        ('ready', 'Ready'),
+        ('failed', 'Failed'),
+    )
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='certificates')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='certificates')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', db_index=True)
+    completed_at = models.DateTimeField(blank=True, null=True)
+    # certificates.template.TEMPLATE_VERSION the stored file was rendered with
+    template_version = models.PositiveIntegerField(default=0)
+    content_hash = models.CharField(max_length=64, blank=True)  # sha256 of the PDF
+    file = models.FileField(upload_to='certificates/', blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        unique_together = ('user', 'course')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.course.title} ({self.status})"
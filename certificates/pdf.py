@@ -0,0 +1,118 @@
+"""
+A small pure-Python PDF writer: single-font-family text, rectangles and
+lines on fixed-size pages, using the standard Helvetica fonts (nothing
+embedded).
+
+Output is deterministic for the same input - there is no creation date or
+document id - so identical certificates hash to the same stored file.
+Deliberately free of Django imports so it can run in a spawned process.
+"""
+import zlib
+
+# Helvetica advance widths (1/1000 em) for ASCII 32-126; Helvetica-Bold is
+# measured with the same table, which is close enough for centering.
+HELVETICA_WIDTHS = [
+    278, 278, 355, 556, 556, 889, 667, 191, 333, 333, 389, 584, 278, 333, 278, 278,
+    556, 556, 556, 556, 556, 556, 556, 556, 556, 556, 278, 278, 584, 584, 584, 556,
+    1015, 667, 667, 722, 722, 667, 611, 778, 722, 278, 500, 667, 556, 833, 722, 778,
+    667, 778, 722, 667, 611, 722, 667, 944, 667, 667, 611, 278, 278, 278, 469, 556,
+    333, 556, 556, 500, 556, 556, 278, 556, 556, 222, 222, 500, 222, 833, 556, 556,
+    556, 556, 333, 500, 278, 556, 500, 722, 500, 500, 500, 334, 260, 334, 584,
+]
+DEFAULT_WIDTH = 556
+
+FONTS = {"regular": b"/F1", "bold": b"/F2"}
+
+
+def text_width(text, size):
+    width = sum(
+        HELVETICA_WIDTHS[ord(char) - 32] if 32 <= ord(char) <= 126 else DEFAULT_WIDTH
+        for char in text
+    )
+    return width * size / 1000
+
+
+def _number(value):
+    return f"{value:.2f}".rstrip("0").rstrip(".").encode()
+
+
+def _string(text):
+    raw = text.encode("cp1252", errors="replace")
+    return b"(" + raw.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)") + b")"
+
+
+class Page:
+    """Drawing operations for one page; coordinates are points from the bottom left."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        self.ops = []
+
+    def text(self, x, y, size, text, weight="regular", align="left"):
+        if align == "center":
+            x -= text_width(text, size) / 2
+        elif align == "right":
+            x -= text_width(text, size)
+        self.ops.append(
+            b"BT " + FONTS[weight] + b" " + _number(size) + b" Tf "
+            + _number(x) + b" " + _number(y) + b" Td " + _string(text) + b" Tj ET"
+        )
+
+    def rect(self, x, y, width, height, line_width=1):
+        self.ops.append(
+            _number(line_width) + b" w " + b" ".join(map(_number, (x, y, width, height))) + b" re S"
+        )
+
+    def line(self, x1, y1, x2, y2, line_width=1):
+        self.ops.append(
+            _number(line_width) + b" w " + _number(x1) + b" " + _number(y1) + b" m "
+            + _number(x2) + b" " + _number(y2) + b" l S"
+        )
+
+    def content(self):
+        return b"\n".join(self.ops)
+
+
+def build_pdf(pages):
+    """Serialize ``pages`` to PDF bytes."""
+    objects = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        None,  # page tree, filled in once the page object numbers are known
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica /Encoding /WinAnsiEncoding >>",
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold /Encoding /WinAnsiEncoding >>",
+    ]
+    page_refs = []
+    for page in pages:
+        stream = zlib.compress(page.content(), 9)
+        objects.append(
+            b"<< /Length " + str(len(stream)).encode() + b" /Filter /FlateDecode >>\nstream\n"
+            + stream + b"\nendstream"
+        )
+        content_ref = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 " + _number(page.width) + b" "
+            + _number(page.height) + b"] /Resources << /Font << /F1 3 0 R /F2 4 0 R >> >> "
+            b"/Contents " + str(content_ref).encode() + b" 0 R >>"
+        )
+        page_refs.append(f"{len(objects)} 0 R".encode())
+    objects[1] = (
+        b"<< /Type /Pages /Kids [" + b" ".join(page_refs) + b"] /Count "
+        + str(len(pages)).encode() + b" >>"
+    )
+
+    out = bytearray(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += f"{number} 0 obj\n".encode() + body + b"\nendobj\n"
+
+    xref = len(out)
+    out += f"xref\n0 {len(objects) + 1}\n0000000000 65535 f \n".encode()
+    for offset in offsets:
+        out += f"{offset:010d} 00000 n \n".encode()
+    out += (
+        f"trailer\n<< /Size {len(objects) + 1} /Root 1 0 R >>\n"
+        f"startxref\n{xref}\n%%EOF\n"
+    ).encode()
+    return bytes(out)
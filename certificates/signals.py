@@ -0,0 +1,14 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+from progress.models import UserCourseProgress
+from .generation import queue_certificate
+
+
+# ----------------------------
+# Queue certificates on course completion
+# ----------------------------
+@receiver(post_save, sender=UserCourseProgress)
+def queue_certificate_on_completion(sender, instance, raw=False, **kwargs):
+    if raw or instance.status != "completed":
+        return
+    queue_certificate(instance.user_id, instance.course_id, instance.completed_at)
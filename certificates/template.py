@@ -0,0 +1,36 @@
+"""
+Certificate layout. Bump TEMPLATE_VERSION whenever the output changes;
+stored certificates rendered with an older version are regenerated.
+"""
+from .pdf import Page, build_pdf
+
+TEMPLATE_VERSION = 1
+
+PAGE_WIDTH, PAGE_HEIGHT = 842, 595  # A4 landscape, in points
+
+
+def render_certificate(context):
+    """
+    PDF bytes for ``context``: name, course, ship_type, completed (a date
+    string) and number. Runs in the render process pool, so it only uses
+    plain values.
+    """
+    page = Page(PAGE_WIDTH, PAGE_HEIGHT)
+    center = PAGE_WIDTH / 2
+
+    page.rect(28, 28, PAGE_WIDTH - 56, PAGE_HEIGHT - 56, line_width=3)
+    page.rect(38, 38, PAGE_WIDTH - 76, PAGE_HEIGHT - 76)
+
+    page.text(center, 470, 34, "Certificate of Training", weight="bold", align="center")
+    page.text(center, 410, 14, "This is to certify that", align="center")
+    page.text(center, 370, 26, context["name"], weight="bold", align="center")
+    page.line(center - 200, 360, center + 200, 360)
+    page.text(center, 320, 14, "has successfully completed the course", align="center")
+    page.text(center, 280, 22, context["course"], weight="bold", align="center")
+    if context.get("ship_type"):
+        page.text(center, 245, 12, f"Ship type: {context['ship_type']}", align="center")
+
+    page.text(80, 90, 11, f"Date of completion: {context['completed']}")
+    page.text(PAGE_WIDTH - 80, 90, 11, f"Certificate no. {context['number']}", align="right")
+
+    return build_pdf([page])
@@ -0,0 +1,141 @@
+import hashlib
+import shutil
+import tempfile
+from datetime import timedelta
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import Position, ShipType, User
+from courses.models import Course
+from progress.models import UserCourseProgress
+from .generation import generate_pending, queue_certificate, reset_render_pool
+from .models import Certificate
+from .template import TEMPLATE_VERSION
+
+
+class CertificateTests(TestCase):
+    """Queueing on completion, rendering and the download flow."""
+
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.media_root = tempfile.mkdtemp()
+        cls.media = override_settings(MEDIA_ROOT=cls.media_root, CERTIFICATE_RENDER_WORKERS=1)
+        cls.media.enable()
+
+    @classmethod
+    def tearDownClass(cls):
+        reset_render_pool()
+        cls.media.disable()
+        shutil.rmtree(cls.media_root, ignore_errors=True)
+        super().tearDownClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ship_type = ShipType.objects.create(name="Tanker")
+        cls.position = Position.objects.create(name="Master")
+        cls.course = Course.objects.create(title="Fire fighting", ship_type=cls.ship_type)
+        cls.course.positions.set([cls.position])
+        cls.learner = User.objects.create_user(
+            "learner", "learner@example.com", "pw", first_name="Ada", last_name="Lovelace",
+            ship_type=cls.ship_type, position=cls.position
+        )
+        cls.other = User.objects.create_user(
+            "other", "other@example.com", "pw", ship_type=cls.ship_type, position=cls.position
+        )
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="admin", is_staff=True)
+
+    def setUp(self):
+        self.client = APIClient()
+        self.client.force_authenticate(self.learner)
+        self.url = reverse("certificate-download", args=[self.course.id])
+
+    def complete(self, user=None):
+        return UserCourseProgress.objects.create(
+            user=user or self.learner, course=self.course,
+            status="completed", completed_at=timezone.now()
+        )
+
+    # ----------------------------
+    # Queue
+    # ----------------------------
+    def test_completion_queues_pending_certificate(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            progress = self.complete()
+        certificate = Certificate.objects.get(user=self.learner, course=self.course)
+        self.assertEqual(certificate.status, "pending")
+        self.assertEqual(certificate.completed_at, progress.completed_at)
+        self.assertEqual(len(callbacks), 1)  # generation scheduled after commit
+
+    def test_in_progress_does_not_queue(self):
+        UserCourseProgress.objects.create(user=self.learner, course=self.course, status="in_progress")
+        self.assertFalse(Certificate.objects.exists())
+
+    # ----------------------------
+    # Render
+    # ----------------------------
+    def test_generate_pending_renders_pdf(self):
+        self.complete()
+        self.assertEqual(generate_pending(), 1)
+
+        certificate = Certificate.objects.get(user=self.learner, course=self.course)
+        self.assertEqual(certificate.status, "ready")
+        self.assertEqual(certificate.template_version, TEMPLATE_VERSION)
+        with certificate.file.open("rb") as fh:
+            data = fh.read()
+        self.assertTrue(data.startswith(b"%PDF-"))
+        self.assertEqual(certificate.content_hash, hashlib.sha256(data).hexdigest())
+        self.assertEqual(certificate.file.name, f"certificates/{certificate.content_hash}.pdf")
+
+    def test_recompletion_keeps_ready_certificate(self):
+        progress = self.complete()
+        generate_pending()
+        certificate = queue_certificate(
+            self.learner.id, self.course.id, progress.completed_at + timedelta(days=1)
+        )
+        self.assertEqual(certificate.status, "ready")
+        self.assertEqual(certificate.completed_at, progress.completed_at)
+
+    def test_template_change_requeues(self):
+        progress = self.complete()
+        generate_pending()
+        Certificate.objects.update(template_version=TEMPLATE_VERSION - 1)
+        certificate = queue_certificate(self.learner.id, self.course.id, progress.completed_at)
+        self.assertEqual(certificate.status, "pending")
+
+    # ----------------------------
+    # Download
+    # ----------------------------
+    def test_download_requires_completion(self):
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+
+    def test_download_pending_returns_202_with_retry_after(self):
+        self.complete()
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data, {"status": "pending"})
+        self.assertIn("Retry-After", response)
+
+    def test_download_ready_pdf_and_not_modified(self):
+        self.complete()
+        generate_pending()
+        certificate = Certificate.objects.get()
+
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response["Content-Type"], "application/pdf")
+        self.assertEqual(response["ETag"], f'"{certificate.content_hash}"')
+        self.assertTrue(b"".join(response.streaming_content).startswith(b"%PDF-"))
+        response.close()
+
+        response = self.client.get(self.url, HTTP_IF_NONE_MATCH=f'"{certificate.content_hash}"')
+        self.assertEqual(response.status_code, 304)
+
+    def test_only_admins_download_for_other_users(self):
+        self.complete(self.other)
+        self.assertEqual(self.client.get(self.url, {"user": self.other.id}).status_code, 403)
+
+        admin = APIClient()
+        admin.force_authenticate(self.admin)
+        self.assertEqual(admin.get(self.url, {"user": self.other.id}).status_code, 202)
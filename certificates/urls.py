@@ -0,0 +1,6 @@
+from django.urls import path
+from .views import CertificateDownloadAPIView
+
+urlpatterns = [
+    path('<int:course_id>/download/', CertificateDownloadAPIView.as_view(), name='certificate-download'),
+]
@@ -0,0 +1,67 @@
+from django.conf import settings
+from django.http import FileResponse, HttpResponseNotModified
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+from rest_framework.views import APIView
+from progress.models import UserCourseProgress
+from .generation import needs_render, queue_certificate
+from .models import Certificate
+
+
+class CertificateDownloadAPIView(APIView):
+    """
+    The learner's certificate PDF for a completed course (admins may pass
+    ?user=<id>). Files are content-addressed, so the ETag is the content
+    hash and a matching If-None-Match gets a 304 without touching storage.
+    While a certificate is being (re)generated the response is 202.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, course_id):
+        user_id = request.user.id
+        if request.query_params.get("user"):
+            if not (request.user.is_staff or request.user.role == 'admin'):
+                return Response({"detail": "You do not have permission to perform this action."},
+                                status=status.HTTP_403_FORBIDDEN)
+            try:
+                user_id = int(request.query_params["user"])
+            except ValueError:
+                return Response({"detail": "user must be an integer id."},
+                                status=status.HTTP_400_BAD_REQUEST)
+
+        certificate = (
+            Certificate.objects
+            .filter(user_id=user_id, course_id=course_id, course__deleted_at__isnull=True)
+            .first()
+        )
+        if certificate is None or needs_render(certificate):
+            progress = (
+                UserCourseProgress.objects
+                .filter(user_id=user_id, course_id=course_id, status="completed",
+                        course__deleted_at__isnull=True)
+                .first()
+            )
+            if progress is None:
+                return Response({"detail": "Course not completed"}, status=status.HTTP_404_NOT_FOUND)
+            certificate = queue_certificate(user_id, course_id, progress.completed_at)
+            if certificate.status == "failed":
+                return Response({"detail": "Certificate generation failed"},
+                                status=status.HTTP_500_INTERNAL_SERVER_ERROR)
+            response = Response({"status": certificate.status}, status=status.HTTP_202_ACCEPTED)
+            response["Retry-After"] = str(settings.CERTIFICATE_RETRY_AFTER)
+            return response
+
+        etag = f'"{certificate.content_hash}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            response = FileResponse(
+                certificate.file.open("rb"),
+                content_type="application/pdf",
+                filename=f"certificate-{certificate.course_id}.pdf"
+            )
+        response["ETag"] = etag
+        response["Cache-Control"] = "private, no-cache"
+        return response
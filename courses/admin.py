@@ -1,4 +1,5 @@
 from django.contrib import admin
+from marine_lms.paginators import EstimatedCountPaginator
 from .models import Course, Module, Quiz, Question, ModuleFile
 
 
@@ -28,6 +29,8 @@ class ModuleInline(admin.TabularInline):
 class CourseAdmin(admin.ModelAdmin):
     list_display = ("title", "ship_type")
     list_filter = ("ship_type", "positions")
+    list_select_related = ("ship_type",)
+    autocomplete_fields = ("ship_type",)
     search_fields = ("title", "description")
     inlines = [ModuleInline]
 
@@ -38,8 +41,10 @@ class CourseAdmin(admin.ModelAdmin):
 @admin.register(Module)
 class ModuleAdmin(admin.ModelAdmin):
     list_display = ("title", "course")
-    search_fields = ("title", "description")
-    list_filter = ("course",)
+    search_fields = ("title", "description", "course__title")
+    list_filter = ("course__ship_type",)
+    list_select_related = ("course",)
+    autocomplete_fields = ("course",)
     fields = ("course", "title", "description", "video_url", "video")   # NEW
     inlines = [ModuleFileInline]
 
@@ -51,11 +56,18 @@ class QuestionInline(admin.TabularInline):
 @admin.register(Quiz)
 class QuizAdmin(admin.ModelAdmin):
     list_display = ("id", "module")
+    list_select_related = ("module__course",)
+    autocomplete_fields = ("module",)
+    search_fields = ("module__title", "module__course__title")
     inlines = [QuestionInline]
 
 
 @admin.register(Question)
 class QuestionAdmin(admin.ModelAdmin):
     list_display = ("question_text", "quiz", "correct_answer")
-    search_fields = ("question_text",)
-    list_filter = ("quiz", "correct_answer")
+    search_fields = ("question_text", "quiz__module__title")
+    list_filter = ("correct_answer",)
+    list_select_related = ("quiz__module",)
+    autocomplete_fields = ("quiz",)
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
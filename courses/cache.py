@@ -0,0 +1,152 @@
+import hashlib
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import F
+from rest_framework.renderers import JSONRenderer
+from marine_lms.performance import measure
+from .models import CatalogVersion, Quiz, Question
+from .snapshots import published_quiz
+
+_invalidation_deferred = ContextVar("courses_invalidation_deferred", default=False)
+
+
+# ----------------------------
+# Deferred invalidation
+# ----------------------------
+@contextmanager
+def defer_invalidation():
+    """
+    Silence the per-row invalidation signals inside the block; bulk writers
+    invalidate once for the whole batch afterwards.
+    """
+    token = _invalidation_deferred.set(True)
+    try:
+        yield
+    finally:
+        _invalidation_deferred.reset(token)
+
+
+def invalidation_deferred():
+    return _invalidation_deferred.get()
+
+
+# ----------------------------
+# Catalog version
+# ----------------------------
+# The version lives in the database rather than the cache: with a per-process
+# cache (LocMemCache) a bump would only reach the worker that made it.
+def get_catalog_version():
+    version = CatalogVersion.objects.filter(pk=1).values_list("version", flat=True).first()
+    if version is None:
+        # Seed from the clock so a recreated row never reuses a number that
+        # older cached payloads were stored under.
+        row, _ = CatalogVersion.objects.get_or_create(
+            pk=1, defaults={"version": time.time_ns() // 1_000_000}
+        )
+        version = row.version
+    return version
+
+
+def bump_catalog_version():
+    if not CatalogVersion.objects.filter(pk=1).update(version=F("version") + 1):
+        get_catalog_version()
+
+
+# ----------------------------
+# Eligibility-group responses
+# ----------------------------
+ALL_COURSES = "all"
+
+
+def eligibility_group(user):
+    """Learner catalog payloads only depend on the user's (ship type, position)."""
+    return f"{user.ship_type_id}:{user.position_id}"
+
+
+def cached_catalog_data(name, group, build, *parts):
+    """
+    Return the cached payload for ``name`` shared by everyone in ``group``,
+    building it with ``build()`` on a miss.
+    """
+    key = ":".join(
+        ["catalog", str(get_catalog_version()), name, group]
+        + [str(part) for part in parts]
+    )
+    data = cache.get(key)
+    if data is None:
+        with measure("serialize"):
+            data = build()
+        cache.set(key, data, settings.CATALOG_CACHE_TIMEOUT)
+    return data
+
+
+# ----------------------------
+# Learner quiz payloads
+# ----------------------------
+LEARNER_QUESTION_FIELDS = ("id", "question_text", "option_a", "option_b", "option_c", "option_d")
+
+
+def quiz_payload_key(quiz_id, version, snapshot=None):
+    # Keyed by version: a bump (or a new snapshot) makes older payloads
+    # unreachable in every worker without having to delete them
+    return f"quiz-payload:{quiz_id}:{version}:{snapshot or 0}"
+
+
+def bump_quiz_versions(quiz_ids):
+    """Bump the version of these quizzes, retiring their cached payloads."""
+    quiz_ids = list(quiz_ids)
+    if not quiz_ids:
+        return
+    Quiz.objects.filter(id__in=quiz_ids).update(version=F("version") + 1)
+
+
+def get_quiz_payload(quiz):
+    """
+    Pre-rendered learner JSON (no answer keys) and its strong ETag for
+    ``quiz``, a dict with the quiz's id, version, draw_size, module_id,
+    course_id and the course's latest snapshot version (None if unpublished).
+    Published courses serve the quiz as published; None if it is not in the
+    snapshot.
+    """
+    key = quiz_payload_key(quiz["id"], quiz["version"], quiz["snapshot"])
+    payload = cache.get(key)
+    if payload is None:
+        payload = build_quiz_payload(quiz)
+        if payload is not None:
+            cache.set(key, payload, settings.CATALOG_CACHE_TIMEOUT)
+    return payload
+
+
+def build_quiz_payload(quiz):
+    if quiz["snapshot"] is None:
+        questions = list(
+            Question.objects.filter(quiz_id=quiz["id"])
+            .order_by("id").values(*LEARNER_QUESTION_FIELDS)
+        )
+    else:
+        published = published_quiz(quiz["course_id"], quiz["snapshot"], quiz["id"])
+        if published is None:
+            return None
+        questions = [
+            {field: question[field] for field in LEARNER_QUESTION_FIELDS}
+            for question in published["questions"]
+        ]
+
+    data = {
+        "id": quiz["id"],
+        "module": quiz["module_id"],
+        "version": quiz["version"],
+        "snapshot": quiz["snapshot"],
+        "draw_size": quiz["draw_size"],
+        "questions": questions,
+    }
+    with measure("serialize"):
+        body = JSONRenderer().render(data)
+
+    return {
+        "body": body,
+        "etag": f'"{quiz["id"]}-{quiz["version"]}-{hashlib.sha256(body).hexdigest()[:16]}"',
+    }
@@ -0,0 +1,125 @@
+"""
+Deep-clone a course to other ship types.
+
+The copy is made with a fixed number of bulk statements regardless of
+course size: one read and one bulk insert per table (course, positions,
+modules, files, quiz, questions). Stored media is shared by reference -
+the clone's FileFields point at the same file names, no bytes are copied.
+
+Relies on bulk_create returning primary keys (PostgreSQL, SQLite 3.35+,
+MariaDB 10.5+).
+"""
+from collections import Counter
+from django.db import transaction
+from django.db.models.signals import m2m_changed
+from accounts.models import Position
+from .models import Course, Module, ModuleFile, Quiz, Question
+
+BATCH_SIZE = 1000
+
+
+def clone_course(course, ship_type_ids, title=None):
+    """Copy ``course`` once per ship type; returns the new courses."""
+    position_ids = list(course.positions.values_list("id", flat=True))
+    through = Course.positions.through
+
+    with transaction.atomic():
+        modules = list(Module.objects.filter(course=course).order_by("id"))
+        clones = Course.objects.bulk_create([
+            Course(
+                title=title or course.title,
+                description=course.description,
+                ship_type_id=ship_type_id,
+                modules_count=len(modules)
+            )
+            for ship_type_id in ship_type_ids
+        ])
+
+        through.objects.bulk_create(
+            [
+                through(course_id=clone.id, position_id=position_id)
+                for clone in clones
+                for position_id in position_ids
+            ],
+            batch_size=BATCH_SIZE
+        )
+
+        new_modules = Module.objects.bulk_create(
+            [
+                Module(
+                    course_id=clone.id,
+                    title=module.title,
+                    description=module.description,
+                    video_url=module.video_url,
+                    video=module.video.name
+                )
+                for clone in clones
+                for module in modules
+            ],
+            batch_size=BATCH_SIZE
+        )
+        # Same (clone, module) order as the comprehension above
+        module_map = {
+            (clone.id, module.id): new_modules[i * len(modules) + j].id
+            for i, clone in enumerate(clones)
+            for j, module in enumerate(modules)
+        }
+
+        files = ModuleFile.objects.filter(module__course=course).order_by("id")
+        ModuleFile.objects.bulk_create(
+            [
+                ModuleFile(module_id=module_map[(clone.id, file.module_id)], file=file.file.name)
+                for clone in clones
+                for file in files
+            ],
+            batch_size=BATCH_SIZE
+        )
+
+        questions = list(Question.objects.filter(quiz__module__course=course).order_by("id"))
+        question_counts = Counter(question.quiz_id for question in questions)
+
+        quizzes = list(Quiz.objects.filter(module__course=course).order_by("id"))
+        new_quizzes = Quiz.objects.bulk_create(
+            [
+                Quiz(
+                    module_id=module_map[(clone.id, quiz.module_id)],
+                    draw_size=quiz.draw_size,
+                    questions_count=question_counts[quiz.id]
+                )
+                for clone in clones
+                for quiz in quizzes
+            ],
+            batch_size=BATCH_SIZE
+        )
+        quiz_map = {
+            (clone.id, quiz.id): new_quizzes[i * len(quizzes) + j].id
+            for i, clone in enumerate(clones)
+            for j, quiz in enumerate(quizzes)
+        }
+
+        Question.objects.bulk_create(
+            [
+                Question(
+                    quiz_id=quiz_map[(clone.id, question.quiz_id)],
+                    question_text=question.question_text,
+                    option_a=question.option_a,
+                    option_b=question.option_b,
+                    option_c=question.option_c,
+                    option_d=question.option_d,
+                    correct_answer=question.correct_answer
+                )
+                for clone in clones
+                for question in questions
+            ],
+            batch_size=BATCH_SIZE
+        )
+
+        # bulk_create sends no signals; announce the position assignments so
+        # cache invalidation and reporting receivers see the new courses.
+        for clone in clones:
+            m2m_changed.send(
+                sender=through, instance=clone, action="post_add", reverse=False,
+                model=Position, pk_set=set(position_ids), using=clone._state.db
+            )
+
+    return clones
@@ -0,0 +1,70 @@
+"""
+Denormalized child counters: Course.modules_count and Quiz.questions_count.
+
+Single-row creates, deletes and re-parenting keep them exact with F()
+updates (see courses.signals). Bulk writes, which send no per-row signals,
+call ``recount_modules`` / ``recount_questions`` for the parents they touched;
+``manage.py repair_counters`` uses the same functions to verify or repair the
+whole table.
+"""
+from django.db.models import Count, F, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from .models import Course, Module, Quiz, Question
+
+
+def _actual(model, parent_field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{parent_field: OuterRef("pk")})
+            .order_by()
+            .values(parent_field)
+            .annotate(n=Count("pk"))
+            .values("n"),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def actual_modules_count():
+    return _actual(Module, "course")
+
+
+def actual_questions_count():
+    return _actual(Question, "quiz")
+
+
+def adjust(model, pk, field, delta):
+    model._base_manager.filter(pk=pk).update(**{field: F(field) + delta})
+
+
+def recount_modules(course_ids=None):
+    """Reset modules_count from the module table; returns the rows updated."""
+    courses = Course.all_objects.all()
+    if course_ids is not None:
+        courses = courses.filter(pk__in=list(course_ids))
+    return courses.update(modules_count=actual_modules_count())
+
+
+def recount_questions(quiz_ids=None):
+    """Reset questions_count from the question table; returns the rows updated."""
+    quizzes = Quiz.objects.all()
+    if quiz_ids is not None:
+        quizzes = quizzes.filter(pk__in=list(quiz_ids))
+    return quizzes.update(questions_count=actual_questions_count())
+
+
+def drifted_courses():
+    return (
+        Course.all_objects.annotate(actual=actual_modules_count())
+        .exclude(modules_count=F("actual"))
+        .values_list("id", "modules_count", "actual")
+    )
+
+
+def drifted_quizzes():
+    return (
+        Quiz.objects.annotate(actual=actual_questions_count())
+        .exclude(questions_count=F("actual"))
+        .values_list("id", "questions_count", "actual")
+    )
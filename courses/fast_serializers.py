@@ -0,0 +1,173 @@
+"""
+Read-only serialization straight from ``.values()`` rows.
+
+These mirror the output of the matching ModelSerializers field for field
+(same keys, order and formatting) for the hot list endpoints, without
+building a serializer field tree per object. Related rows are loaded with
+one query per relation and stitched together in Python.
+"""
+from collections import defaultdict
+from rest_framework import serializers
+from .models import Course, Module, ModuleFile, Quiz, Question
+
+_datetime = serializers.DateTimeField()
+_module_video_storage = Module._meta.get_field("video").storage
+_module_file_storage = ModuleFile._meta.get_field("file").storage
+
+# Learner-facing: answer keys stay out of course details (see courses.snapshots)
+QUESTION_DETAIL_FIELDS = ("id", "question_text", "option_a", "option_b", "option_c", "option_d")
+
+
+def format_datetime(value):
+    """Same output as serializers.DateTimeField (ISO 8601, UTC as 'Z')."""
+    if value is None:
+        return None
+    return _datetime.to_representation(value)
+
+
+def _file_url(storage, name):
+    """Same output as serializers.FileField without a request in context."""
+    if not name:
+        return None
+    return storage.url(name)
+
+
+def _files_by_module(module_filter):
+    files = defaultdict(list)
+    rows = ModuleFile.objects.filter(**module_filter).order_by("id").values_list("module_id", "id", "file")
+    for module_id, file_id, name in rows:
+        files[module_id].append({"id": file_id, "file": _file_url(_module_file_storage, name)})
+    return files
+
+
+# ----------------------------
+# ModuleSerializer
+# ----------------------------
+def fast_modules(modules):
+    modules = modules.order_by("id")
+    rows = list(modules.values(
+        "id", "created_at", "updated_at", "title", "description", "video_url", "video", "course_id"
+    ))
+    files = _files_by_module({"module__in": modules.values("id")})
+
+    return [
+        {
+            "id": row["id"],
+            "files": files.get(row["id"], []),
+            "created_at": format_datetime(row["created_at"]),
+            "updated_at": format_datetime(row["updated_at"]),
+            "title": row["title"],
+            "description": row["description"],
+            "video_url": row["video_url"],
+            "video": _file_url(_module_video_storage, row["video"]),
+            "course": row["course_id"],
+        }
+        for row in rows
+    ]
+
+
+# ----------------------------
+# QuestionSerializer
+# ----------------------------
+def fast_questions(questions):
+    rows = questions.order_by("id").values(
+        "id", "created_at", "updated_at", "question_text",
+        "option_a", "option_b", "option_c", "option_d", "correct_answer", "quiz_id"
+    )
+    return [
+        {
+            "id": row["id"],
+            "created_at": format_datetime(row["created_at"]),
+            "updated_at": format_datetime(row["updated_at"]),
+            "question_text": row["question_text"],
+            "option_a": row["option_a"],
+            "option_b": row["option_b"],
+            "option_c": row["option_c"],
+            "option_d": row["option_d"],
+            "correct_answer": row["correct_answer"],
+            "quiz": row["quiz_id"],
+        }
+        for row in rows.iterator(chunk_size=2000)
+    ]
+
+
+# ----------------------------
+# CourseDetailSerializer
+# ----------------------------
+def _named(row, prefix=""):
+    return {
+        "id": row[prefix + "id"],
+        "name": row[prefix + "name"],
+        "created_at": format_datetime(row[prefix + "created_at"]),
+        "updated_at": format_datetime(row[prefix + "updated_at"]),
+    }
+
+
+def fast_course_details(courses):
+    course_ids = courses.values("id")
+    rows = list(courses.values(
+        "id", "title", "description",
+        "ship_type__id", "ship_type__name", "ship_type__created_at", "ship_type__updated_at"
+    ))
+
+    positions = defaultdict(list)
+    position_rows = (
+        Course.positions.through.objects
+        .filter(course__in=course_ids)
+        .order_by("course_id", "position_id")
+        .values(
+            "course_id", "position__id", "position__name",
+            "position__created_at", "position__updated_at"
+        )
+    )
+    for row in position_rows:
+        positions[row["course_id"]].append(_named(row, "position__"))
+
+    questions = defaultdict(list)
+    question_rows = (
+        Question.objects
+        .filter(quiz__module__course__in=course_ids)
+        .order_by("id")
+        .values("quiz_id", *QUESTION_DETAIL_FIELDS)
+    )
+    for row in question_rows:
+        questions[row.pop("quiz_id")].append(row)
+
+    quizzes = {
+        module_id: {"id": quiz_id, "questions": questions.get(quiz_id, [])}
+        for quiz_id, module_id in Quiz.objects
+        .filter(module__course__in=course_ids)
+        .values_list("id", "module_id")
+    }
+
+    files = _files_by_module({"module__course__in": course_ids})
+
+    modules = defaultdict(list)
+    module_rows = (
+        Module.objects
+        .filter(course__in=course_ids)
+        .order_by("id")
+        .values("id", "course_id", "title", "description", "video_url", "video")
+    )
+    for row in module_rows:
+        modules[row["course_id"]].append({
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "video_url": row["video_url"],
+            "video": _file_url(_module_video_storage, row["video"]),
+            "files": files.get(row["id"], []),
+            "quiz": quizzes.get(row["id"]),
+        })
+
+    return [
+        {
+            "id": row["id"],
+            "title": row["title"],
+            "description": row["description"],
+            "ship_type": _named(row, "ship_type__"),
+            "positions": positions.get(row["id"], []),
+            "modules": modules.get(row["id"], []),
+        }
+        for row in rows
+    ]
@@ -0,0 +1,130 @@
+import time
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from rest_framework.renderers import JSONRenderer
+from accounts.fast_serializers import fast_admin_users
+from accounts.models import Position, ShipType
+from accounts.serializers import AdminUserSerializer
+from courses.fast_serializers import fast_course_details, fast_modules, fast_questions
+from courses.models import Course, Module, ModuleFile, Quiz, Question
+from courses.serializers import CourseDetailSerializer, ModuleSerializer, QuestionSerializer
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Benchmark the values()-based fast serializers against the DRF "
+        "ModelSerializers on synthetic rows (rolled back afterwards) and "
+        "check that both render to identical JSON."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+        parser.add_argument("--repeat", type=int, default=3)
+
+    def handle(self, *args, **options):
+        renderer = JSONRenderer()
+        mismatches = 0
+
+        for size in options["sizes"]:
+            with transaction.atomic():
+                self.seed(size)
+                cases = [
+                    (
+                        "CourseDetailSerializer",
+                        lambda: CourseDetailSerializer(
+                            Course.objects.select_related("ship_type").prefetch_related(
+                                "positions", "modules__files", "modules__quiz__questions"
+                            ),
+                            many=True
+                        ).data,
+                        lambda: fast_course_details(Course.objects.all()),
+                    ),
+                    (
+                        "ModuleSerializer",
+                        lambda: ModuleSerializer(Module.objects.prefetch_related("files"), many=True).data,
+                        lambda: fast_modules(Module.objects.all()),
+                    ),
+                    (
+                        "QuestionSerializer",
+                        lambda: QuestionSerializer(Question.objects.all(), many=True).data,
+                        lambda: fast_questions(Question.objects.all()),
+                    ),
+                    (
+                        "AdminUserSerializer",
+                        lambda: AdminUserSerializer(
+                            User.objects.select_related("position", "ship_type"), many=True
+                        ).data,
+                        lambda: fast_admin_users(User.objects.all()),
+                    ),
+                ]
+
+                for name, drf, fast in cases:
+                    drf_time, drf_data = self.best_of(drf, options["repeat"])
+                    fast_time, fast_data = self.best_of(fast, options["repeat"])
+                    same = renderer.render(drf_data) == renderer.render(fast_data)
+                    mismatches += not same
+
+                    self.stdout.write(
+                        f"{name:<24} rows={size:<6} drf={drf_time * 1000:9.1f}ms "
+                        f"fast={fast_time * 1000:9.1f}ms "
+                        f"speedup={drf_time / fast_time:5.1f}x "
+                        f"{'identical' if same else 'MISMATCH'}"
+                    )
+
+                transaction.set_rollback(True)
+
+        if mismatches:
+            self.stderr.write(self.style.ERROR(f"{mismatches} serializer output(s) differ"))
+        else:
+            self.stdout.write(self.style.SUCCESS("All fast serializer outputs are identical"))
+
+    def best_of(self, func, repeat):
+        best, result = None, None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            result = func()
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best, result
+
+    def seed(self, size):
+        """One course/module/file/quiz/question and one user per row."""
+        ship_type = ShipType.objects.create(name=f"bench-ship-{size}")
+        positions = Position.objects.bulk_create(
+            [Position(name=f"bench-position-{size}-{i}") for i in range(3)]
+        )
+
+        courses = Course.objects.bulk_create(
+            [
+                Course(title=f"Course {i}", description="Benchmark course", ship_type=ship_type, modules_count=1)
+                for i in range(size)
+            ]
+        )
+        Course.positions.through.objects.bulk_create([
+            Course.positions.through(course_id=course.id, position_id=positions[i % 3].id)
+            for i, course in enumerate(courses)
+        ])
+        modules = Module.objects.bulk_create(
+            [Module(course=course, title=f"Module {course.id}", video_url="https://example.com/v.mp4") for course in courses]
+        )
+        ModuleFile.objects.bulk_create(
+            [ModuleFile(module=module, file=f"modules/files/bench-{module.id}.pdf") for module in modules]
+        )
+        quizzes = Quiz.objects.bulk_create([Quiz(module=module, questions_count=1) for module in modules])
+        Question.objects.bulk_create([
+            Question(
+                quiz=quiz, question_text=f"Question {quiz.id}",
+                option_a="A", option_b="B", option_c="C", option_d="D", correct_answer="A"
+            )
+            for quiz in quizzes
+        ])
+        User.objects.bulk_create([
+            User(
+                username=f"bench-{size}-{i}", email=f"bench-{size}-{i}@example.com",
+                role="employee", ship_type=ship_type, position=positions[i % 3]
+            )
+            for i in range(size)
+        ])
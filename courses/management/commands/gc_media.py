@@ -0,0 +1,106 @@
+import gzip
+import json
+import os
+import time
+from urllib.parse import unquote, urlparse
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db.models import Max
+from courses.models import CourseSnapshot, Module, ModuleFile
+
+
+class Command(BaseCommand):
+    help = (
+        "Find files under MEDIA_ROOT/modules/ that no Module.video, ModuleFile "
+        "or published course snapshot refers to, and delete those older than "
+        "the grace period. The tree is streamed with os.scandir and checked "
+        "against the database one batch of paths at a time."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Only report orphans, delete nothing.")
+        parser.add_argument("--grace-hours", type=float, default=24,
+                            help="Leave files modified more recently than this (uploads in flight).")
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        self.dry_run = options["dry_run"]
+        self.list_orphans = self.dry_run or options["verbosity"] > 1
+        cutoff = time.time() - options["grace_hours"] * 3600
+        root = os.path.join(settings.MEDIA_ROOT, "modules")
+
+        # Snapshots are served after their live rows change, so whatever the
+        # latest snapshot of each course links to stays referenced.
+        self.snapshot_names = self.snapshot_references()
+
+        stats = {"scanned": 0, "recent": 0, "orphaned": 0, "bytes": 0}
+        batch = []
+        for name, entry in self.walk(root):
+            stats["scanned"] += 1
+            stat = entry.stat(follow_symlinks=False)
+            if stat.st_mtime > cutoff:
+                stats["recent"] += 1
+                continue
+            batch.append((name, entry.path, stat.st_size))
+            if len(batch) >= options["batch_size"]:
+                self.collect(batch, stats)
+                batch = []
+        self.collect(batch, stats)
+
+        verb = "Would delete" if self.dry_run else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"Scanned {stats['scanned']} files ({stats['recent']} inside the grace period). "
+            f"{verb} {stats['orphaned']} orphans, {stats['bytes'] / 1024 / 1024:.1f} MiB."
+        ))
+
+    def walk(self, path):
+        """Yield (storage name, DirEntry) for every file below ``path``, depth first."""
+        try:
+            with os.scandir(path) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        yield from self.walk(entry.path)
+                    elif entry.is_file(follow_symlinks=False):
+                        name = os.path.relpath(entry.path, settings.MEDIA_ROOT)
+                        yield name.replace(os.sep, "/"), entry
+        except FileNotFoundError:
+            return
+
+    def collect(self, batch, stats):
+        if not batch:
+            return
+        names = [name for name, _, _ in batch]
+        referenced = set(ModuleFile.objects.filter(file__in=names).values_list("file", flat=True))
+        referenced.update(Module.objects.filter(video__in=names).values_list("video", flat=True))
+
+        for name, path, size in batch:
+            if name in referenced or name in self.snapshot_names:
+                continue
+            stats["orphaned"] += 1
+            stats["bytes"] += size
+            if self.list_orphans:
+                self.stdout.write(name)
+            if not self.dry_run:
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+    def snapshot_references(self):
+        latest = CourseSnapshot.objects.values("course_id").annotate(version=Max("version"))
+        names = set()
+        for course_id, version in latest.values_list("course_id", "version"):
+            data = (
+                CourseSnapshot.objects.filter(course_id=course_id, version=version)
+                .values_list("data", flat=True).first()
+            )
+            course = json.loads(gzip.decompress(bytes(data)))
+            for module in course.get("modules", []):
+                urls = [module.get("video")] + [item.get("file") for item in module.get("files", [])]
+                names.update(self.url_to_name(url) for url in urls if url)
+        return names
+
+    def url_to_name(self, url):
+        path = unquote(urlparse(url).path)
+        media_path = urlparse(settings.MEDIA_URL).path
+        return path[len(media_path):] if path.startswith(media_path) else path
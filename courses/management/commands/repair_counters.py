@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from courses.counters import drifted_courses, drifted_quizzes, recount_modules, recount_questions
+
+
+class Command(BaseCommand):
+    help = (
+        "Verify Course.modules_count and Quiz.questions_count against the module "
+        "and question tables, and repair any drift with --fix."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--fix", action="store_true", help="Rewrite drifted counters.")
+
+    def handle(self, *args, **options):
+        courses = list(drifted_courses())
+        quizzes = list(drifted_quizzes())
+
+        for course_id, stored, actual in courses:
+            self.stdout.write(f"course {course_id}: modules_count {stored}, actual {actual}")
+        for quiz_id, stored, actual in quizzes:
+            self.stdout.write(f"quiz {quiz_id}: questions_count {stored}, actual {actual}")
+
+        if not courses and not quizzes:
+            self.stdout.write(self.style.SUCCESS("All counters are exact."))
+            return
+
+        if not options["fix"]:
+            raise CommandError(
+                f"{len(courses)} courses and {len(quizzes)} quizzes have drifted; rerun with --fix."
+            )
+
+        recount_modules([course_id for course_id, _, _ in courses])
+        recount_questions([quiz_id for quiz_id, _, _ in quizzes])
+        self.stdout.write(self.style.SUCCESS(
+            f"Repaired {len(courses)} course and {len(quizzes)} quiz counters."
+        ))
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0003_remove_module_file_module_video_modulefile'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='quiz',
+            name='draw_size',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0007_course_deleted_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='modules_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='quiz',
+            name='questions_count',
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+    ]
@@ -0,0 +1,38 @@
+from django.db import migrations
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def child_count(model, parent_field):
+    return Coalesce(
+        Subquery(
+            model.objects.filter(**{parent_field: OuterRef("pk")})
+            .order_by()
+            .values(parent_field)
+            .annotate(n=Count("pk"))
+            .values("n"),
+            output_field=IntegerField()
+        ),
+        0
+    )
+
+
+def populate_counters(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Module = apps.get_model("courses", "Module")
+    Quiz = apps.get_model("courses", "Quiz")
+    Question = apps.get_model("courses", "Question")
+
+    Course._base_manager.update(modules_count=child_count(Module, "course"))
+    Quiz._base_manager.update(questions_count=child_count(Question, "quiz"))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0008_course_modules_count_quiz_questions_count"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
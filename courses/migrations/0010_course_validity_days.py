@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:43
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0009_populate_counters'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='course',
+            name='validity_days',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
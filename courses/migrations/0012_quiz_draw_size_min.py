@@ -0,0 +1,26 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:59
+
+import django.core.validators
+from django.db import migrations, models
+
+
+def clear_zero_draw_sizes(apps, schema_editor):
+    # A draw of 0 served no questions; treat it as "serve every question"
+    Quiz = apps.get_model("courses", "Quiz")
+    Quiz._base_manager.filter(draw_size=0).update(draw_size=None)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0011_catalogversion'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='quiz',
+            name='draw_size',
+            field=models.PositiveIntegerField(blank=True, null=True, validators=[django.core.validators.MinValueValidator(1)]),
+        ),
+        migrations.RunPython(clear_zero_draw_sizes, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:27
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0012_quiz_draw_size_min'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='coursesnapshot',
+            name='answer_key',
+            field=models.JSONField(default=dict),
+        ),
+    ]
@@ -0,0 +1,38 @@
+import gzip
+import hashlib
+import json
+from django.db import migrations
+from rest_framework.renderers import JSONRenderer
+
+
+def move_answer_keys(apps, schema_editor):
+    # Snapshots published before 0013 carried the answer keys in the learner
+    # JSON: move them to answer_key and re-render the JSON without them
+    CourseSnapshot = apps.get_model("courses", "CourseSnapshot")
+
+    for snapshot in CourseSnapshot.objects.iterator():
+        data = json.loads(gzip.decompress(bytes(snapshot.data)))
+        answer_key = {}
+        for module in data["modules"]:
+            for question in module["quiz"]["questions"] if module["quiz"] else []:
+                if "correct_answer" in question:
+                    answer_key[str(question["id"])] = question.pop("correct_answer")
+        if not answer_key:
+            continue
+
+        body = JSONRenderer().render(data)
+        snapshot.data = gzip.compress(body, mtime=0)
+        snapshot.content_hash = hashlib.sha256(body).hexdigest()
+        snapshot.answer_key = answer_key
+        snapshot.save(update_fields=["data", "content_hash", "answer_key"])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0013_coursesnapshot_answer_key"),
+    ]
+
+    operations = [
+        migrations.RunPython(move_answer_keys, migrations.RunPython.noop),
+    ]
@@ -1,4 +1,6 @@
+from django.core.validators import MinValueValidator
 from django.db import models
+from django.conf import settings
 from accounts.models import Position, ShipType
 from django.utils import timezone
 
@@ -10,15 +12,38 @@ class BaseModel(models.Model):
         abstract = True
 
 
+class ActiveCourseManager(models.Manager):
+    """Default manager: hides soft-deleted courses (see Course.soft_delete)."""
+
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Course(BaseModel):
     title = models.CharField(max_length=200)
     description = models.TextField(blank=True, null=True)
     ship_type = models.ForeignKey(ShipType, on_delete=models.CASCADE)
     positions = models.ManyToManyField(Position)  # assigned to multiple positions
+    deleted_at = models.DateTimeField(blank=True, null=True, db_index=True)
+    # Maintained by courses.signals / courses.counters
+    modules_count = models.PositiveIntegerField(default=0, editable=False)
+    # Days a completion stays valid before refresher training is due; empty never expires
+    validity_days = models.PositiveIntegerField(blank=True, null=True)
+
+    objects = ActiveCourseManager()
+    all_objects = models.Manager()
 
     def __str__(self):
         return self.title
 
+    def soft_delete(self):
+        """
+        Hide the course at once; ``manage.py purge_deleted`` removes its
+        modules, quizzes and progress later in small batches.
+        """
+        self.deleted_at = timezone.now()
+        self.save(update_fields=["deleted_at", "updated_at"])
+
 
 class Module(BaseModel):
     course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='modules')
@@ -37,6 +62,12 @@ class ModuleFile(BaseModel):
 
 class Quiz(BaseModel):
     module = models.OneToOneField(Module, on_delete=models.CASCADE, related_name='quiz')
+    # Questions drawn from the bank per attempt; empty serves every question
+    draw_size = models.PositiveIntegerField(blank=True, null=True, validators=[MinValueValidator(1)])
+    # Bumped on every quiz/question write, see courses.cache
+    version = models.PositiveIntegerField(default=0, editable=False)
+    # Maintained by courses.signals / courses.counters
+    questions_count = models.PositiveIntegerField(default=0, editable=False)
 
     def __str__(self):
         return f"Quiz for {self.module.title}"
@@ -58,3 +89,33 @@ class Question(BaseModel):
 
     def __str__(self):
         return self.question_text
+
+
+class CourseSnapshot(models.Model):
+    """Immutable, published learner payload of a course, see courses.snapshots."""
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='snapshots')
+    version = models.PositiveIntegerField()
+    data = models.BinaryField()  # gzip-compressed learner JSON
+    content_hash = models.CharField(max_length=64)  # sha256 of the uncompressed JSON
+    # {question id: correct answer} for grading; never part of the learner JSON
+    answer_key = models.JSONField(default=dict)
+    published_by = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, blank=True, null=True)
+    published_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        unique_together = ('course', 'version')
+
+    def __str__(self):
+        return f"{self.course.title} v{self.version}"
+
+
+
+class CatalogVersion(models.Model):
+    """
+    Single row whose ``version`` keys every cached learner catalog payload,
+    see courses.cache. Kept in the database so all workers agree on it.
+    """
+    version = models.PositiveBigIntegerField(default=0)
+
+    def __str__(self):
+        return f"Catalog v{self.version}"
@@ -0,0 +1,33 @@
+"""
+Random question draws from a quiz's question bank.
+
+The bank's question ids are cached per quiz version, so a draw is one
+cache read plus ``random.sample``; the database never sorts by RANDOM().
+"""
+import random
+from django.conf import settings
+from django.core.cache import cache
+from .models import Question
+
+
+def question_pool(quiz):
+    key = f"quiz-pool:{quiz.id}:{quiz.version}"
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(
+            Question.objects.filter(quiz_id=quiz.id)
+            .order_by("id").values_list("id", flat=True)
+        )
+        cache.set(key, ids, settings.CATALOG_CACHE_TIMEOUT)
+    return ids
+
+
+def draw_question_ids(quiz, pool=None):
+    """
+    Ids served for one attempt, in the order they are presented, from
+    ``pool`` (e.g. a published quiz's question ids) or the live bank.
+    """
+    ids = question_pool(quiz) if pool is None else pool
+    if quiz.draw_size is None or quiz.draw_size >= len(ids):
+        return random.sample(ids, len(ids))
+    return random.sample(ids, quiz.draw_size)
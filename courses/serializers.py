@@ -45,7 +45,6 @@ class QuestionDetailSerializer(serializers.ModelSerializer):
             "option_b",
             "option_c",
             "option_d",
-            "correct_answer",
         ]
 
 
@@ -83,4 +82,35 @@ class CourseDetailSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = Course
-        fields = ["id", "title", "description", "ship_type", "positions", "modules"]
\ No newline at end of file
+        fields = ["id", "title", "description", "ship_type", "positions", "modules"]
+
+
+
+# ----------------------------
+# Bulk write serializers
+# ----------------------------
+# Foreign keys are plain ids here; the bulk views check that they exist with
+# one query per relation instead of one per item.
+class QuestionBulkSerializer(serializers.ModelSerializer):
+    quiz = serializers.IntegerField(source="quiz_id")
+
+    class Meta:
+        model = Question
+        fields = "__all__"
+
+
+class QuizBulkSerializer(serializers.ModelSerializer):
+    module = serializers.IntegerField(source="module_id")
+
+    class Meta:
+        model = Quiz
+        fields = "__all__"
+
+
+class ModuleBulkSerializer(serializers.ModelSerializer):
+    course = serializers.IntegerField(source="course_id")
+
+    class Meta:
+        model = Module
+        fields = ["id", "created_at", "updated_at", "title", "description", "video_url", "course"]
+
@@ -0,0 +1,101 @@
+from django.db.models.signals import pre_save, post_save, post_delete, m2m_changed
+from django.dispatch import Signal, receiver
+from accounts.models import Position, ShipType
+from .cache import bump_catalog_version, bump_quiz_versions, invalidation_deferred
+from .counters import adjust
+from .models import Course, CourseSnapshot, Module, ModuleFile, Quiz, Question
+
+
+# Sent with ``course_ids`` after bulk module writes, which skip post_save /
+# post_delete (see ModuleBulkAPIView).
+modules_changed = Signal()
+
+
+# ----------------------------
+# Catalog cache invalidation
+# ----------------------------
+@receiver([post_save, post_delete], sender=Course)
+@receiver([post_save, post_delete], sender=Module)
+@receiver([post_save, post_delete], sender=ModuleFile)
+@receiver([post_save, post_delete], sender=Quiz)
+@receiver([post_save, post_delete], sender=Question)
+@receiver([post_save, post_delete], sender=Position)
+@receiver([post_save, post_delete], sender=ShipType)
+@receiver([post_save, post_delete], sender=CourseSnapshot)
+def invalidate_catalog(sender, **kwargs):
+    if invalidation_deferred():
+        return
+    bump_catalog_version()
+
+
+@receiver(m2m_changed, sender=Course.positions.through)
+def invalidate_catalog_on_positions(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear") and not invalidation_deferred():
+        bump_catalog_version()
+
+
+# ----------------------------
+# Quiz versions (learner quiz payloads and pools are keyed by them)
+# ----------------------------
+@receiver([post_save, post_delete], sender=Question)
+def bump_question_quiz_version(sender, instance, **kwargs):
+    if invalidation_deferred():
+        return
+    bump_quiz_versions([instance.quiz_id])
+
+
+@receiver(post_save, sender=Quiz)
+def bump_quiz_version(sender, instance, **kwargs):
+    if invalidation_deferred():
+        return
+    bump_quiz_versions([instance.id])
+
+
+# ----------------------------
+# Child counters
+# ----------------------------
+# (parent model, counter field, foreign key to the parent) per counted model
+COUNTERS = {
+    Module: (Course, "modules_count", "course"),
+    Question: (Quiz, "questions_count", "quiz"),
+}
+
+
+@receiver(pre_save, sender=Module)
+@receiver(pre_save, sender=Question)
+def remember_counter_parent(sender, instance, raw=False, update_fields=None, **kwargs):
+    _, _, foreign_key = COUNTERS[sender]
+    instance._counter_parent_id = None
+    if raw or instance._state.adding or instance.pk is None:
+        return
+    if update_fields is not None and foreign_key not in update_fields:
+        return
+    instance._counter_parent_id = (
+        sender.objects.filter(pk=instance.pk).values_list(f"{foreign_key}_id", flat=True).first()
+    )
+
+
+@receiver(post_save, sender=Module)
+@receiver(post_save, sender=Question)
+def count_saved_child(sender, instance, created, raw=False, **kwargs):
+    if raw or invalidation_deferred():
+        return
+    parent, field, foreign_key = COUNTERS[sender]
+    parent_id = getattr(instance, f"{foreign_key}_id")
+    if created:
+        adjust(parent, parent_id, field, 1)
+        return
+    previous_id = getattr(instance, "_counter_parent_id", None)
+    if previous_id is not None and previous_id != parent_id:
+        adjust(parent, previous_id, field, -1)
+        adjust(parent, parent_id, field, 1)
+
+
+@receiver(post_delete, sender=Module)
+@receiver(post_delete, sender=Question)
+def count_deleted_child(sender, instance, **kwargs):
+    if invalidation_deferred():
+        return
+    parent, field, foreign_key = COUNTERS[sender]
+    adjust(parent, getattr(instance, f"{foreign_key}_id"), field, -1)
+
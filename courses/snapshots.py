@@ -0,0 +1,211 @@
+"""
+Published course snapshots.
+
+Publishing renders the learner payload of a course once (the same JSON as
+the live LearnerCourseDetailAPIView path), gzips it and stores it with its
+sha256 in a new CourseSnapshot row. The answer keys are stored next to it,
+outside the JSON, for grading only. Learners are then served the newest
+snapshot as stored bytes while admins keep editing the live tables.
+
+Every other learner read of a published course (search, the course list,
+quiz payloads and draws) and quiz grading also go through the snapshot, via
+``published_courses``. Snapshots never change, so their decoded JSON is
+cached by (course, version).
+"""
+import gzip
+import hashlib
+import json
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Max, OuterRef, Q, Subquery
+from rest_framework.renderers import JSONRenderer
+from .fast_serializers import fast_course_details
+from .models import Course, CourseSnapshot, Question
+
+
+def render_course(course_id):
+    data = fast_course_details(Course.objects.filter(id=course_id))
+    return JSONRenderer().render(data[0])
+
+
+def publish_course(course, user=None):
+    """
+    Snapshot ``course``; returns ``(snapshot, created)``. Publishing an
+    unchanged course returns the latest snapshot instead of a duplicate.
+    """
+    body = render_course(course.id)
+    content_hash = hashlib.sha256(body).hexdigest()
+    answer_key = {
+        str(question_id): answer
+        for question_id, answer in Question.objects
+        .filter(quiz__module__course_id=course.id)
+        .values_list("id", "correct_answer")
+    }
+
+    with transaction.atomic():
+        # Lock the course row so concurrent publishes get distinct versions
+        Course.objects.select_for_update().filter(id=course.id).exists()
+        latest = CourseSnapshot.objects.filter(course=course).order_by("-version").first()
+        if latest and latest.content_hash == content_hash and latest.answer_key == answer_key:
+            return latest, False
+
+        snapshot = CourseSnapshot.objects.create(
+            course=course,
+            version=(latest.version + 1) if latest else 1,
+            data=gzip.compress(body, mtime=0),
+            content_hash=content_hash,
+            answer_key=answer_key,
+            published_by=user
+        )
+    return snapshot, True
+
+
+def latest_snapshot_for(user, course_id):
+    """Newest snapshot of ``course_id`` if the course is assigned to ``user``."""
+    return (
+        CourseSnapshot.objects
+        .filter(
+            course_id=course_id,
+            course__deleted_at__isnull=True,
+            course__assignments__user_id=user.id
+        )
+        .order_by("-version")
+        .values("data", "content_hash")
+        .first()
+    )
+
+
+# ----------------------------
+# Reading published courses
+# ----------------------------
+def _snapshot_key(course_id, version):
+    return f"course-snapshot:{course_id}:{version}"
+
+
+def latest_version(course_ref="course_id"):
+    """Subquery for the newest snapshot version of the course at ``course_ref``."""
+    return Subquery(
+        CourseSnapshot.objects.filter(course_id=OuterRef(course_ref))
+        .order_by("-version").values("version")[:1]
+    )
+
+
+def latest_versions(course_ids):
+    """``{course_id: newest snapshot version}`` for the published ones."""
+    return dict(
+        CourseSnapshot.objects.filter(course_id__in=course_ids)
+        .values("course_id").annotate(latest=Max("version"))
+        .values_list("course_id", "latest")
+    )
+
+
+def published_courses(versions):
+    """Decoded learner JSON for ``{course_id: snapshot version}``."""
+    keys = {course_id: _snapshot_key(course_id, version) for course_id, version in versions.items()}
+    cached = cache.get_many(keys.values())
+    data = {course_id: cached[key] for course_id, key in keys.items() if key in cached}
+
+    missing = Q(pk__in=[])
+    for course_id in versions.keys() - data.keys():
+        missing |= Q(course_id=course_id, version=versions[course_id])
+    loaded = {}
+    for row in CourseSnapshot.objects.filter(missing).values("course_id", "data"):
+        data[row["course_id"]] = json.loads(gzip.decompress(bytes(row["data"])))
+        loaded[keys[row["course_id"]]] = data[row["course_id"]]
+    if loaded:
+        cache.set_many(loaded, settings.CATALOG_CACHE_TIMEOUT)
+    return data
+
+
+def learner_course_details(courses):
+    """``fast_course_details(courses)`` with published courses read from their snapshot."""
+    ids = list(courses.values_list("id", flat=True))
+    published = published_courses(latest_versions(ids))
+    live = {
+        row["id"]: row
+        for row in fast_course_details(Course.objects.filter(id__in=set(ids) - published.keys()))
+    }
+    return [published.get(course_id) or live[course_id] for course_id in ids if course_id in published or course_id in live]
+
+
+def published_course_rows(rows):
+    """
+    Overlay CourseSerializer rows of published courses with the published
+    title, description, ship type, positions and module count.
+    """
+    published = published_courses(latest_versions([row["id"] for row in rows]))
+    for row in rows:
+        data = published.get(row["id"])
+        if data is None:
+            continue
+        row.update({
+            "title": data["title"],
+            "description": data["description"],
+            "ship_type": data["ship_type"]["id"],
+            "positions": [position["id"] for position in data["positions"]],
+            "modules_count": len(data["modules"]),
+        })
+    return rows
+
+
+def course_matches(course, query):
+    """The course search filter (title, description, ship type or position) on learner JSON."""
+    query = query.lower()
+    texts = [course["title"], course["description"] or "", course["ship_type"]["name"]]
+    texts += [position["name"] for position in course["positions"]]
+    return any(query in text.lower() for text in texts)
+
+
+def published_quiz(course_id, version, quiz_id):
+    """
+    ``{"id", "questions"}`` of ``quiz_id`` as published in snapshot
+    ``version`` of the course, or None.
+    """
+    data = published_courses({course_id: version}).get(course_id)
+    for module in data["modules"] if data else []:
+        if module["quiz"] and module["quiz"]["id"] == quiz_id:
+            return module["quiz"]
+    return None
+
+
+def published_answer_key(course_id, version):
+    """``{question id (str): correct answer}`` as published in snapshot ``version``."""
+    key = f"course-answers:{course_id}:{version}"
+    answers = cache.get(key)
+    if answers is None:
+        answers = (
+            CourseSnapshot.objects.filter(course_id=course_id, version=version)
+            .values_list("answer_key", flat=True).first()
+        ) or {}
+        cache.set(key, answers, settings.CATALOG_CACHE_TIMEOUT)
+    return answers
+
+
+# ----------------------------
+# Accept-Encoding
+# ----------------------------
+def accepts_gzip(header):
+    """
+    Whether an Accept-Encoding header allows gzip: listed (or matched by
+    ``*``) with a non-zero q-value; an explicit gzip entry wins over ``*``.
+    """
+    qualities = {}
+    for part in header.split(","):
+        coding, *params = [item.strip() for item in part.split(";")]
+        if not coding:
+            continue
+        quality = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        qualities[coding.lower()] = quality
+
+    for coding in ("gzip", "x-gzip", "*"):
+        if coding in qualities:
+            return qualities[coding] > 0
+    return False
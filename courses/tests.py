@@ -1,3 +1,692 @@
-from django.test import TestCase
+import gzip
+import importlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from io import StringIO
+from django.apps import apps
+from django.core.cache import cache
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import CommandError, call_command
+from django.db.models.functions import Lower
+from django.test import TestCase, override_settings
+from django.urls import reverse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIClient
+from accounts.models import Position, ShipType, User
+from marine_lms.nplusone import NPlusOneError, NPlusOneWarning, detect_n_plus_one, normalize_sql
+from marine_lms.streaming import stream_json_array
+from marine_lms.testing import AdminQueryBudgetTestCase
+from progress.models import CourseAssignment
+from .cache import bump_catalog_version, get_catalog_version
+from .models import CatalogVersion, Course, CourseSnapshot, Module, ModuleFile, Quiz, Question
+from .serializers import CourseSerializer, QuestionSerializer
+from .snapshots import accepts_gzip, publish_course, render_course
 
-# Create your tests here.
+
+def rows(response):
+    """List data of a buffered or streamed list response."""
+    if response.streaming:
+        return json.loads(b"".join(response.streaming_content))
+    return response.data
+
+
+class AdminQueryBudgetTests(AdminQueryBudgetTestCase):
+
+    def add_rows(self, count):
+        start = Course.objects.count()
+        courses = Course.objects.bulk_create([
+            Course(title=f"Course {start + i}", ship_type=self.ship_type) for i in range(count)
+        ])
+        modules = Module.objects.bulk_create([
+            Module(course=course, title=f"Module {course.id}") for course in courses
+        ])
+        quizzes = Quiz.objects.bulk_create([Quiz(module=module) for module in modules])
+        Question.objects.bulk_create([
+            Question(
+                quiz=quiz, question_text=f"Question {quiz.id}",
+                option_a="A", option_b="B", option_c="C", option_d="D", correct_answer="A"
+            )
+            for quiz in quizzes
+        ])
+
+    def test_course_changelist(self):
+        self.assert_bounded(reverse("admin:courses_course_changelist"))
+
+    def test_module_changelist(self):
+        self.assert_bounded(reverse("admin:courses_module_changelist"))
+
+    def test_quiz_changelist(self):
+        self.assert_bounded(reverse("admin:courses_quiz_changelist"))
+
+    def test_question_changelist(self):
+        self.assert_bounded(reverse("admin:courses_question_changelist"))
+
+
+class CourseContentTestCase(TestCase):
+    """A course with one module, quiz and question, an admin and an assigned learner."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ship_type = ShipType.objects.create(name="Tanker")
+        cls.position = Position.objects.create(name="Master")
+        cls.course = Course.objects.create(title="Fire fighting", ship_type=cls.ship_type)
+        cls.course.positions.set([cls.position])
+        cls.module = Module.objects.create(course=cls.course, title="Extinguishers")
+        cls.quiz = Quiz.objects.create(module=cls.module)
+        cls.question = cls.make_question(cls.quiz)
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="admin", is_staff=True)
+        cls.learner = User.objects.create_user(
+            "learner", "learner@example.com", "pw", ship_type=cls.ship_type, position=cls.position
+        )
+
+    @staticmethod
+    def make_question(quiz, text="Which class is a grease fire?"):
+        return Question.objects.create(
+            quiz=quiz, question_text=text,
+            option_a="A", option_b="B", option_c="C", option_d="K", correct_answer="D"
+        )
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.admin)
+
+
+# ----------------------------
+# Catalog cache
+# ----------------------------
+class CatalogCacheTests(CourseContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.learner)
+
+    def learner_titles(self):
+        response = self.client.get(reverse("course-list-create"))
+        self.assertEqual(response.status_code, 200)
+        return [row["title"] for row in response.data]
+
+    def test_version_is_seeded_then_bumped(self):
+        CatalogVersion.objects.all().delete()
+        version = get_catalog_version()
+        self.assertGreater(version, 0)
+        bump_catalog_version()
+        self.assertEqual(get_catalog_version(), version + 1)
+
+    def test_learner_list_is_cached_until_a_write(self):
+        self.assertEqual(self.learner_titles(), ["Fire fighting"])
+
+        # A write that sends no signal is not seen: the payload is cached
+        Course.objects.filter(id=self.course.id).update(title="Renamed quietly")
+        self.assertEqual(self.learner_titles(), ["Fire fighting"])
+
+        self.course.title = "Fire safety"
+        self.course.save()
+        self.assertEqual(self.learner_titles(), ["Fire safety"])
+
+    def test_content_writes_bump_the_version(self):
+        writes = [
+            lambda: Module.objects.create(course=self.course, title="Hoses"),
+            lambda: self.make_question(self.quiz, "Another"),
+            lambda: self.course.positions.clear(),
+            lambda: ShipType.objects.filter(id=self.ship_type.id).get().save(),
+        ]
+        for write in writes:
+            version = get_catalog_version()
+            write()
+            self.assertGreater(get_catalog_version(), version)
+
+    def test_detail_checks_assignment_per_request(self):
+        url = reverse("learner-course-detail", args=[self.course.id])
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+        # The payload is cached per group, access is checked per user
+        stranger = User.objects.create_user("stranger", "stranger@example.com", "pw")
+        self.client.force_authenticate(stranger)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+
+# ----------------------------
+# Learner payloads
+# ----------------------------
+class LearnerPayloadTests(CourseContentTestCase):
+    """Answer keys never reach learners; quiz payloads follow the quiz version."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.learner)
+
+    def course_questions(self, data):
+        return [question for module in data["modules"] for question in module["quiz"]["questions"]]
+
+    def test_course_payloads_have_no_answer_keys(self):
+        detail = self.client.get(reverse("learner-course-detail", args=[self.course.id])).data
+        search = self.client.get(reverse("course-search")).data
+        for data in (detail, search[0]):
+            questions = self.course_questions(data)
+            self.assertEqual(len(questions), 1)
+            self.assertNotIn("correct_answer", questions[0])
+
+    def test_snapshot_keeps_answer_keys_outside_the_json(self):
+        snapshot, _ = publish_course(self.course)
+        data = json.loads(gzip.decompress(bytes(snapshot.data)))
+        self.assertNotIn("correct_answer", self.course_questions(data)[0])
+        self.assertEqual(snapshot.answer_key, {str(self.question.id): "D"})
+
+        response = self.client.get(reverse("learner-course-detail", args=[self.course.id]))
+        self.assertNotIn(b"correct_answer", response.content)
+
+    def test_answer_change_publishes_a_new_version(self):
+        first, _ = publish_course(self.course)
+        Question.objects.filter(id=self.question.id).update(correct_answer="C")
+        second, created = publish_course(self.course)
+        self.assertTrue(created)
+        self.assertEqual((second.version, second.content_hash), (2, first.content_hash))
+        self.assertEqual(second.answer_key, {str(self.question.id): "C"})
+
+    def test_published_quiz_is_graded_with_the_answer_key(self):
+        publish_course(self.course)
+        response = self.client.post(
+            reverse("quizattempt-list-create"),
+            {"quiz": self.quiz.id, "answers": {str(self.question.id): "D"}},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(response.data["passed"])
+
+    def test_migration_moves_answer_keys_out_of_old_snapshots(self):
+        body = render_course(self.course.id).replace(b'"option_d":"K"', b'"option_d":"K","correct_answer":"D"')
+        snapshot = CourseSnapshot.objects.create(
+            course=self.course, version=1, data=gzip.compress(body, mtime=0), content_hash="old"
+        )
+        migration = importlib.import_module("courses.migrations.0014_move_answer_keys")
+        migration.move_answer_keys(apps, None)
+
+        snapshot.refresh_from_db()
+        self.assertEqual(gzip.decompress(bytes(snapshot.data)), render_course(self.course.id))
+        self.assertEqual(snapshot.answer_key, {str(self.question.id): "D"})
+
+    def test_quiz_payload_retires_on_a_version_bump(self):
+        url = reverse("learner-quiz", args=[self.quiz.id])
+        first = self.client.get(url)
+        self.assertNotIn("correct_answer", json.loads(first.content)["questions"][0])
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"]).status_code, 304)
+
+        self.question.question_text = "Which class is a cooking oil fire?"
+        self.question.save()
+        second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(second.status_code, 200)
+        self.assertNotEqual(second["ETag"], first["ETag"])
+        self.assertEqual(json.loads(second.content)["questions"][0]["question_text"], self.question.question_text)
+
+
+# ----------------------------
+# Published snapshots
+# ----------------------------
+class SnapshotTests(CourseContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.learner)
+        self.url = reverse("learner-course-detail", args=[self.course.id])
+
+    def test_accepts_gzip(self):
+        self.assertTrue(accepts_gzip("gzip, deflate"))
+        self.assertTrue(accepts_gzip("br;q=1.0, *;q=0.5"))
+        self.assertFalse(accepts_gzip("gzip;q=0, *"))
+        self.assertFalse(accepts_gzip("identity"))
+        self.assertFalse(accepts_gzip(""))
+
+    def test_each_encoding_has_its_own_etag(self):
+        snapshot, _ = publish_course(self.course)
+        plain = self.client.get(self.url)
+        zipped = self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip")
+        self.assertEqual(plain.content, render_course(self.course.id))
+        self.assertEqual(gzip.decompress(zipped.content), plain.content)
+        self.assertEqual(zipped["Content-Encoding"], "gzip")
+        self.assertEqual(plain["ETag"], f'"{snapshot.content_hash}"')
+        self.assertEqual(zipped["ETag"], f'"{snapshot.content_hash}-gzip"')
+        self.assertIn("Accept-Encoding", plain["Vary"])
+
+        # A validator only revalidates the representation it came from
+        self.assertEqual(self.client.get(self.url, HTTP_IF_NONE_MATCH=plain["ETag"]).status_code, 304)
+        self.assertEqual(
+            self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=zipped["ETag"]).status_code, 304
+        )
+        self.assertEqual(
+            self.client.get(self.url, HTTP_ACCEPT_ENCODING="gzip", HTTP_IF_NONE_MATCH=plain["ETag"]).status_code, 200
+        )
+
+    def test_learners_read_the_published_version(self):
+        publish_course(self.course)
+        self.make_question(self.quiz, "Added after publishing")
+        data = json.loads(self.client.get(self.url).content)
+        self.assertEqual(len(data["modules"][0]["quiz"]["questions"]), 1)
+
+        quiz = json.loads(self.client.get(reverse("learner-quiz", args=[self.quiz.id])).content)
+        self.assertEqual((quiz["snapshot"], len(quiz["questions"])), (1, 1))
+
+    def test_grading_ignores_a_client_supplied_snapshot(self):
+        publish_course(self.course)
+        Question.objects.filter(id=self.question.id).update(correct_answer="C")
+        publish_course(self.course)
+
+        response = self.client.post(
+            reverse("quizattempt-list-create"),
+            {"quiz": self.quiz.id, "snapshot": 1, "answers": {str(self.question.id): "D"}},
+            format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.data["results"][0]["correct_answer"], "C")
+        self.assertFalse(response.data["passed"])
+
+
+# ----------------------------
+# Streamed lists
+# ----------------------------
+class StreamingTests(CourseContentTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for index in range(7):
+            cls.make_question(cls.quiz, f"Question {index % 3}")
+            Course.objects.create(
+                title=f"Course {index % 2}", ship_type=cls.ship_type,
+                description=None if index % 3 == 0 else f"Description {index % 2}"
+            )
+
+    def assert_streams_like_buffered(self, queryset, serializer_class, expected_order):
+        def serialize(objs):
+            return serializer_class(objs, many=True).data
+
+        for chunk_size in (1, 2, 3, 100):
+            with self.subTest(chunk_size=chunk_size):
+                streamed = b"".join(stream_json_array(queryset, serialize, chunk_size))
+                self.assertEqual(streamed, JSONRenderer().render(serialize(queryset.order_by(*expected_order))))
+
+    def test_ties_are_broken_by_pk(self):
+        self.assert_streams_like_buffered(
+            Question.objects.order_by("question_text"), QuestionSerializer, ["question_text", "pk"]
+        )
+
+    def test_descending_ordering_with_nulls(self):
+        self.assert_streams_like_buffered(
+            Course.objects.order_by("-description", "title"), CourseSerializer, ["-description", "title", "pk"]
+        )
+
+    def test_expression_ordering_falls_back_to_offsets(self):
+        self.assert_streams_like_buffered(
+            Course.objects.order_by(Lower("title")), CourseSerializer, [Lower("title"), "pk"]
+        )
+
+    def test_empty_list(self):
+        self.assertEqual(b"".join(stream_json_array(Question.objects.none(), list, 2)), b"[]")
+
+    def test_list_endpoint_streams_json(self):
+        response = self.client.get(reverse("question-list-create"))
+        self.assertTrue(response.streaming)
+        self.assertEqual(
+            b"".join(response.streaming_content),
+            JSONRenderer().render(QuestionSerializer(Question.objects.order_by("pk"), many=True).data)
+        )
+
+
+# ----------------------------
+# N+1 detection
+# ----------------------------
+class NPlusOneDetectorTests(CourseContentTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        for i in range(3):
+            Course.objects.create(title=f"Course {i}", ship_type=cls.ship_type)
+
+    def test_normalize_sql_collapses_literals_and_lists(self):
+        self.assertEqual(
+            normalize_sql("SELECT * FROM t WHERE id IN (%s, %s, %s) AND name = 'O''Brien'  AND n = 3"),
+            "SELECT * FROM t WHERE id IN (...) AND name = ? AND n = ?"
+        )
+
+    def test_repeated_query_raises_with_origin(self):
+        with self.assertRaises(NPlusOneError) as raised:
+            with detect_n_plus_one(threshold=2):
+                [course.ship_type.name for course in Course.objects.all()]
+        self.assertIn("4x from courses/tests.py", str(raised.exception))
+
+    def test_prefetched_query_passes(self):
+        with detect_n_plus_one(threshold=2):
+            [course.ship_type.name for course in Course.objects.select_related("ship_type")]
+
+    def test_warn_action(self):
+        with self.assertWarns(NPlusOneWarning):
+            with detect_n_plus_one(threshold=2, action="warn"):
+                [course.ship_type.name for course in Course.objects.all()]
+
+    def test_middleware_checks_requests(self):
+        with override_settings(NPLUSONE_ACTION="raise", NPLUSONE_THRESHOLD=0):
+            client = APIClient()
+            client.force_authenticate(self.admin)
+            with self.assertRaises(NPlusOneError):
+                client.get(reverse("course-list-create"))
+
+    def test_content_lists_have_no_n_plus_one(self):
+        for name in ("course-list-create", "module-list-create", "quiz-list-create", "question-list-create"):
+            with self.subTest(name), detect_n_plus_one(threshold=2, label=name):
+                self.assertEqual(self.client.get(reverse(name)).status_code, 200)
+
+# ----------------------------
+# Cloning
+# ----------------------------
+class CloneTests(CourseContentTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.make_question(cls.quiz, "Which agent for class B?")
+        Module.objects.create(course=cls.course, title="Drills")
+        cls.targets = [ShipType.objects.create(name="Bulk"), ShipType.objects.create(name="Container")]
+        cls.bulk_learner = User.objects.create_user(
+            "bulk-learner", "bulk@example.com", "pw", ship_type=cls.targets[0], position=cls.position
+        )
+
+    def clone(self, **data):
+        return self.client.post(reverse("course-clone", args=[self.course.id]), data, format="json")
+
+    def test_clone_copies_content_and_counters(self):
+        response = self.clone(ship_types=[target.id for target in self.targets], title="Fire fighting (copy)")
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(response.data["courses"]), 2)
+
+        for row in response.data["courses"]:
+            clone = Course.objects.get(id=row["id"])
+            self.assertEqual(clone.title, "Fire fighting (copy)")
+            self.assertEqual(list(clone.positions.all()), [self.position])
+            self.assertEqual(clone.modules_count, 2)
+            self.assertEqual(clone.modules.count(), 2)
+
+            quiz = Quiz.objects.get(module__course=clone)
+            self.assertEqual(quiz.questions_count, 2)
+            self.assertEqual(
+                list(quiz.questions.order_by("id").values_list("question_text", "correct_answer")),
+                list(self.quiz.questions.order_by("id").values_list("question_text", "correct_answer"))
+            )
+
+    def test_clone_assigns_matching_learners(self):
+        response = self.clone(ship_types=[self.targets[0].id])
+        clone_id = response.data["courses"][0]["id"]
+        self.assertEqual(
+            list(CourseAssignment.objects.filter(course_id=clone_id).values_list("user__username", flat=True)),
+            ["bulk-learner"]
+        )
+        self.assertFalse(CourseAssignment.objects.filter(user=self.bulk_learner, course=self.course).exists())
+
+    def test_rejects_bad_ship_types(self):
+        self.assertEqual(self.clone(ship_types=[]).status_code, 400)
+        self.assertEqual(self.clone(ship_types=["Bulk"]).status_code, 400)
+        response = self.clone(ship_types=[self.targets[0].id, 999999])
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["ship_types"], [999999])
+        self.assertEqual(Course.objects.count(), 1)
+
+    def test_employees_cannot_clone(self):
+        self.client.force_authenticate(self.learner)
+        self.assertEqual(self.clone(ship_types=[self.targets[0].id]).status_code, 403)
+
+# ----------------------------
+# Media garbage collection
+# ----------------------------
+class GcMediaTests(CourseContentTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.media_root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.media_root)
+        media = self.settings(MEDIA_ROOT=self.media_root)
+        media.enable()
+        self.addCleanup(media.disable)
+
+    def make_file(self, name, age_hours=48):
+        path = os.path.join(self.media_root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            f.write(b"x" * 1024)
+        mtime = time.time() - age_hours * 3600
+        os.utime(path, (mtime, mtime))
+        return name
+
+    def remaining(self):
+        return sorted(
+            os.path.relpath(os.path.join(directory, name), self.media_root)
+            for directory, _, names in os.walk(self.media_root) for name in names
+        )
+
+    def gc(self, **options):
+        out = StringIO()
+        call_command("gc_media", stdout=out, **options)
+        return out.getvalue()
+
+    def test_deletes_only_old_unreferenced_files(self):
+        Module.objects.filter(id=self.module.id).update(video=self.make_file("modules/videos/live.mp4"))
+        ModuleFile.objects.create(module=self.module, file=self.make_file("modules/files/manual.pdf"))
+        self.make_file("modules/videos/orphan.mp4")
+        self.make_file("modules/videos/uploading.mp4", age_hours=1)
+
+        output = self.gc()
+        self.assertIn("Deleted 1 orphans", output)
+        self.assertEqual(self.remaining(), [
+            "modules/files/manual.pdf", "modules/videos/live.mp4", "modules/videos/uploading.mp4"
+        ])
+
+    def test_grace_period(self):
+        self.make_file("modules/videos/orphan.mp4", age_hours=3)
+        self.gc(grace_hours=4)
+        self.assertEqual(self.remaining(), ["modules/videos/orphan.mp4"])
+        self.gc(grace_hours=2)
+        self.assertEqual(self.remaining(), [])
+
+    def test_dry_run_lists_and_keeps(self):
+        self.make_file("modules/videos/orphan.mp4")
+        output = self.gc(dry_run=True)
+        self.assertIn("modules/videos/orphan.mp4", output)
+        self.assertIn("Would delete 1 orphans", output)
+        self.assertEqual(self.remaining(), ["modules/videos/orphan.mp4"])
+
+    def test_keeps_files_only_the_published_snapshot_refers_to(self):
+        Module.objects.filter(id=self.module.id).update(video=self.make_file("modules/videos/published.mp4"))
+        ModuleFile.objects.create(module=self.module, file=self.make_file("modules/files/published.pdf"))
+        publish_course(self.course)
+
+        # Replaced in the live rows after publishing
+        Module.objects.filter(id=self.module.id).update(video=self.make_file("modules/videos/draft.mp4"))
+        ModuleFile.objects.all().delete()
+
+        self.gc(batch_size=1)
+        self.assertEqual(self.remaining(), [
+            "modules/files/published.pdf", "modules/videos/draft.mp4", "modules/videos/published.mp4"
+        ])
+
+
+# ----------------------------
+# Bulk writes
+# ----------------------------
+class BulkEndpointTests(CourseContentTestCase):
+
+    def question_item(self, **fields):
+        return {
+            "quiz": self.quiz.id, "question_text": "Question",
+            "option_a": "A", "option_b": "B", "option_c": "C", "option_d": "D", "correct_answer": "A",
+            **fields
+        }
+
+    def test_create_questions(self):
+        version = self.quiz.version
+        response = self.client.post(
+            reverse("question-bulk"), [self.question_item(question_text=f"Q{i}") for i in range(3)], format="json"
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual([row["question_text"] for row in response.data], ["Q0", "Q1", "Q2"])
+
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.questions_count, 4)
+        self.assertGreater(self.quiz.version, version)
+
+    def test_invalid_item_writes_nothing(self):
+        response = self.client.post(reverse("question-bulk"), [
+            self.question_item(),
+            self.question_item(quiz=999999),
+            {"quiz": self.quiz.id},
+        ], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.data[0], {})
+        self.assertIn("quiz", response.data[1])
+        self.assertIn("question_text", response.data[2])
+        self.assertEqual(Question.objects.count(), 1)
+
+    def test_rejects_non_lists_and_large_batches(self):
+        self.assertEqual(self.client.post(reverse("question-bulk"), {}, format="json").status_code, 400)
+        with self.settings(BULK_MAX_ITEMS=2):
+            response = self.client.post(reverse("question-bulk"), [self.question_item()] * 3, format="json")
+        self.assertEqual(response.status_code, 400)
+
+    def test_update(self):
+        response = self.client.patch(reverse("question-bulk"), [
+            {"id": self.question.id, "question_text": "Renamed"},
+        ], format="json")
+        self.assertEqual(response.status_code, 200)
+        self.question.refresh_from_db()
+        self.assertEqual(self.question.question_text, "Renamed")
+
+        response = self.client.patch(reverse("question-bulk"), [
+            {"id": self.question.id, "question_text": "Again"},
+            {"id": self.question.id, "question_text": "Twice"},
+        ], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("id", response.data[1])
+
+    def test_delete(self):
+        other = self.make_question(self.quiz, "Other")
+        response = self.client.delete(reverse("question-bulk"), {"ids": [self.question.id, 999999]}, format="json")
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.data["ids"], [999999])
+        self.assertEqual(Question.objects.count(), 2)
+
+        response = self.client.delete(reverse("question-bulk"), {"ids": [self.question.id, other.id]}, format="json")
+        self.assertEqual(response.data, {"deleted": 2})
+        self.quiz.refresh_from_db()
+        self.assertEqual(self.quiz.questions_count, 0)
+
+    def test_import_csv(self):
+        upload = SimpleUploadedFile(
+            "bank.csv",
+            b"question_text,option_a,option_b,option_c,option_d,correct_answer\n"
+            b"First,A,B,C,D,A\nSecond,A,B,C,D,B\n"
+        )
+        response = self.client.post(reverse("question-import"), {"file": upload, "quiz": self.quiz.id})
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            list(self.quiz.questions.order_by("id").values_list("question_text", flat=True)),
+            ["Which class is a grease fire?", "First", "Second"]
+        )
+
+    def test_modules_and_quizzes(self):
+        response = self.client.post(reverse("module-bulk"), [
+            {"course": self.course.id, "title": "Hoses"}, {"course": self.course.id, "title": "Drills"},
+        ], format="json")
+        self.assertEqual(response.status_code, 201)
+        self.course.refresh_from_db()
+        self.assertEqual(self.course.modules_count, 3)
+
+        module_id = response.data[0]["id"]
+        response = self.client.post(reverse("quiz-bulk"), [{"module": module_id}, {"module": module_id}], format="json")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("module", response.data[1])
+
+    def test_employees_cannot_write(self):
+        self.client.force_authenticate(self.learner)
+        response = self.client.post(reverse("question-bulk"), [self.question_item()], format="json")
+        self.assertEqual(response.status_code, 403)
+
+
+# ----------------------------
+# Soft delete
+# ----------------------------
+class SoftDeleteTests(CourseContentTestCase):
+
+    def test_deleted_course_and_its_content_are_hidden(self):
+        response = self.client.delete(reverse("course-detail", args=[self.course.id]))
+        self.assertEqual(response.status_code, 204)
+        self.assertIsNotNone(Course.all_objects.get(id=self.course.id).deleted_at)
+
+        for name, pk in (
+            ("course-detail", self.course.id), ("module-detail", self.module.id),
+            ("quiz-detail", self.quiz.id), ("question-detail", self.question.id),
+        ):
+            with self.subTest(name):
+                self.assertEqual(self.client.get(reverse(name, args=[pk])).status_code, 404)
+        for name in ("course-list-create", "module-list-create", "quiz-list-create", "question-list-create"):
+            with self.subTest(name):
+                self.assertEqual(rows(self.client.get(reverse(name))), [])
+
+    def test_purge_removes_course_bottom_up(self):
+        self.course.soft_delete()
+        out = StringIO()
+        call_command("purge_deleted", chunk_size=1, stdout=out)
+        self.assertIn(f"Course {self.course.id}: ", out.getvalue())
+        self.assertFalse(Course.all_objects.filter(id=self.course.id).exists())
+        self.assertFalse(Module.objects.exists())
+        self.assertFalse(Quiz.objects.exists())
+        self.assertFalse(Question.objects.exists())
+
+    def test_purge_waits_for_older_than(self):
+        self.course.soft_delete()
+        call_command("purge_deleted", older_than_hours=1, stdout=StringIO())
+        self.assertTrue(Course.all_objects.filter(id=self.course.id).exists())
+
+
+# ----------------------------
+# Child counters
+# ----------------------------
+class CounterTests(CourseContentTestCase):
+
+    def counts(self):
+        self.course.refresh_from_db()
+        self.quiz.refresh_from_db()
+        return self.course.modules_count, self.quiz.questions_count
+
+    def test_single_writes_adjust_counters(self):
+        self.assertEqual(self.counts(), (1, 1))
+        module = Module.objects.create(course=self.course, title="Hoses")
+        self.make_question(self.quiz, "Second")
+        self.assertEqual(self.counts(), (2, 2))
+
+        self.question.delete()
+        module.delete()
+        self.assertEqual(self.counts(), (1, 1))
+
+    def test_moving_a_module_moves_its_count(self):
+        other = Course.objects.create(title="Ballast", ship_type=self.ship_type)
+        self.module.course = other
+        self.module.save()
+        other.refresh_from_db()
+        self.assertEqual(self.counts()[0], 0)
+        self.assertEqual(other.modules_count, 1)
+
+    def test_repair_counters(self):
+        Course.objects.update(modules_count=5)
+        Quiz.objects.update(questions_count=0)
+        with self.assertRaises(CommandError):
+            call_command("repair_counters", stdout=StringIO())
+
+        out = StringIO()
+        call_command("repair_counters", fix=True, stdout=out)
+        self.assertIn("Repaired 1 course and 1 quiz counters.", out.getvalue())
+        self.assertEqual(self.counts(), (1, 1))
+
+        out = StringIO()
+        call_command("repair_counters", stdout=out)
+        self.assertIn("All counters are exact.", out.getvalue())
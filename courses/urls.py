@@ -1,23 +1,31 @@
 from django.urls import path
-from .views import CourseAPIView, ModuleAPIView, QuizAPIView, QuestionAPIView, LearnerCourseDetailAPIView, CourseSearchAPIView
+from .views import CourseAPIView, ModuleAPIView, QuizAPIView, QuestionAPIView, LearnerCourseDetailAPIView, CourseSearchAPIView, LearnerQuizAPIView, CoursePublishAPIView, CourseCloneAPIView
+from .views import ModuleBulkAPIView, QuizBulkAPIView, QuestionBulkAPIView, QuestionImportAPIView
 
 urlpatterns = [
     # Courses
     path('', CourseAPIView.as_view(), name="course-list-create"),
     path('<int:pk>/', CourseAPIView.as_view(), name="course-detail"),
+    path('<int:pk>/publish/', CoursePublishAPIView.as_view(), name="course-publish"),
+    path('<int:pk>/clone/', CourseCloneAPIView.as_view(), name="course-clone"),
     path('learner/<int:course_id>/', LearnerCourseDetailAPIView.as_view(), name='learner-course-detail'),
 
     # Modules
     path('modules/', ModuleAPIView.as_view(), name="module-list-create"),
     path('modules/<int:pk>/', ModuleAPIView.as_view(), name="module-detail"),
+    path('modules/bulk/', ModuleBulkAPIView.as_view(), name="module-bulk"),
 
     # Quizzes
     path('quizzes/', QuizAPIView.as_view(), name="quiz-list-create"),
     path('quizzes/<int:pk>/', QuizAPIView.as_view(), name="quiz-detail"),
+    path('quizzes/<int:pk>/learner/', LearnerQuizAPIView.as_view(), name="learner-quiz"),
+    path('quizzes/bulk/', QuizBulkAPIView.as_view(), name="quiz-bulk"),
 
     # Questions
     path('questions/', QuestionAPIView.as_view(), name="question-list-create"),
     path('questions/<int:pk>/', QuestionAPIView.as_view(), name="question-detail"),
+    path('questions/bulk/', QuestionBulkAPIView.as_view(), name="question-bulk"),
+    path('questions/import/', QuestionImportAPIView.as_view(), name="question-import"),
 
     path("search/", CourseSearchAPIView.as_view(), name="course-search"),
 ]
@@ -1,10 +1,45 @@
+import csv
+import gzip
+import io
+import json
 from rest_framework.views import APIView
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
-from django.db.models import Q
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, F, OuterRef, Q
+from django.http import HttpResponse, HttpResponseNotModified
+from django.utils import timezone
+from django.utils.http import parse_etags
 from rest_framework import status, permissions
 from .models import Course, Module, Quiz, Question, ModuleFile
 from .serializers import CourseSerializer, ModuleSerializer, QuizSerializer, QuestionSerializer,CourseDetailSerializer
+from .serializers import QuestionBulkSerializer, QuizBulkSerializer, ModuleBulkSerializer
+from .cache import (
+    ALL_COURSES,
+    bump_catalog_version,
+    bump_quiz_versions,
+    cached_catalog_data,
+    defer_invalidation,
+    eligibility_group,
+    get_quiz_payload
+)
+from .fast_serializers import fast_course_details, fast_modules, fast_questions
+from .snapshots import (
+    accepts_gzip,
+    course_matches,
+    latest_snapshot_for,
+    latest_version,
+    learner_course_details,
+    publish_course,
+    published_course_rows
+)
+from .cloning import clone_course
+from .counters import recount_modules, recount_questions
+from .signals import modules_changed
+from accounts.models import ShipType
+from marine_lms.performance import SerializerTimingMixin
+from marine_lms.streaming import StreamingListMixin
 
 
 # ----------------------------
@@ -32,17 +67,24 @@ class CourseSearchAPIView(APIView):
         # Base queryset
         courses = Course.objects.all()
 
-        # Restrict for employee
+        # Employees search their eligible courses as published (shared per
+        # eligibility group), see courses.snapshots
         if user.role == "employee":
-            courses = courses.filter(
-                ship_type=user.ship_type,
-                positions=user.position
+            data = cached_catalog_data(
+                "course-search",
+                eligibility_group(user),
+                lambda: learner_course_details(courses.filter(assignments__user=user))
             )
+            if query:
+                data = [course for course in data if course_matches(course, query)]
+            return Response(data)
 
-        # If no search text, return eligible courses
+        # If no search text, return all courses
         if query == "":
-            serializer = CourseDetailSerializer(courses, many=True)
-            return Response(serializer.data)
+            data = cached_catalog_data(
+                "course-search", ALL_COURSES, lambda: fast_course_details(courses)
+            )
+            return Response(data)
 
         # Search keyword filter
         courses = courses.filter(
@@ -52,21 +94,28 @@ class CourseSearchAPIView(APIView):
             Q(positions__name__icontains=query)
         ).distinct()
 
-        serializer = CourseDetailSerializer(courses, many=True)
-        return Response(serializer.data)
+        return Response(fast_course_details(courses))
     
 
 # ----------------------------
 # Base class for CRUD
 # ----------------------------
-class BaseAPIView(APIView):
+class BaseAPIView(SerializerTimingMixin, StreamingListMixin, APIView):
     model = None
     serializer_class = None
     permission_classes = [IsAdminOrReadOnly]
+    # Lookup hiding rows of soft-deleted courses (Course.objects does it itself)
+    course_lookup = None
+
+    def get_queryset(self):
+        objs = self.model.objects.all()
+        if self.course_lookup:
+            objs = objs.filter(**{f"{self.course_lookup}__deleted_at__isnull": True})
+        return objs
 
     def get_object(self, pk):
         try:
-            return self.model.objects.get(pk=pk)
+            return self.get_queryset().get(pk=pk)
         except self.model.DoesNotExist:
             return None
 
@@ -76,20 +125,26 @@ class BaseAPIView(APIView):
             if not obj:
                 return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
             serializer = self.serializer_class(obj)
-            return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
 
-        objs = self.model.objects.all()
+        objs = self.get_queryset()
 
         # Filter courses/modules for employees
         if request.user.role == 'employee':
             if hasattr(objs.model, 'positions') and hasattr(objs.model, 'ship_type'):
-                objs = objs.filter(
-                    positions=request.user.position,
-                    ship_type=request.user.ship_type
+                objs = objs.filter(assignments__user=request.user)
+                data = cached_catalog_data(
+                    self.model._meta.label_lower,
+                    eligibility_group(request.user),
+                    lambda: self.learner_rows(list(self.serializer_class(objs, many=True).data))
                 )
+                return Response(data)
 
-        serializer = self.serializer_class(objs, many=True)
-        return Response(serializer.data)
+        return self.list_response(request, objs)
+
+    def learner_rows(self, rows):
+        """Hook for what employees see in place of the live rows."""
+        return rows
 
     def post(self, request):
         if not (request.user.is_staff or request.user.role == 'admin'):
@@ -100,7 +155,7 @@ class BaseAPIView(APIView):
         serializer = self.serializer_class(data=request.data, many=is_many)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(self.get_serializer_data(serializer), status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def put(self, request, pk):
@@ -114,7 +169,7 @@ class BaseAPIView(APIView):
         serializer = self.serializer_class(obj, data=request.data)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def patch(self, request, pk):
@@ -128,7 +183,7 @@ class BaseAPIView(APIView):
         serializer = self.serializer_class(obj, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
@@ -139,7 +194,11 @@ class BaseAPIView(APIView):
         obj = self.get_object(pk)
         if not obj:
             return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
-        obj.delete()
+        # Courses are hidden now and purged in batches by `purge_deleted`
+        if hasattr(obj, "soft_delete"):
+            obj.soft_delete()
+        else:
+            obj.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
 
@@ -150,10 +209,19 @@ class CourseAPIView(BaseAPIView):
     model = Course
     serializer_class = CourseSerializer
 
+    def get_queryset(self):
+        # Position ids are listed per course
+        return super().get_queryset().prefetch_related("positions")
+
+    def learner_rows(self, rows):
+        # Published courses are listed as published
+        return published_course_rows(rows)
+
 
 class ModuleAPIView(BaseAPIView):
     model = Module
     serializer_class = ModuleSerializer
+    course_lookup = "course"
 
     def get(self, request, pk=None):
        # If single module by ID
@@ -162,17 +230,15 @@ class ModuleAPIView(BaseAPIView):
            if not module:
                return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
            serializer = self.serializer_class(module)
-           return Response(serializer.data)
+           return Response(self.get_serializer_data(serializer))
 
        # If course id is passed as query param → filter
        course_id = request.query_params.get("course")
+       modules = self.get_queryset()
        if course_id:
-           modules = Module.objects.filter(course_id=course_id)
-       else:
-           modules = Module.objects.all()
+           modules = modules.filter(course_id=course_id)
 
-       serializer = self.serializer_class(modules, many=True)
-       return Response(serializer.data)
+       return self.list_response(request, modules, fast_modules)
 
     # FULL OVERRIDE of BaseAPIView.post (BaseAPIView.post is ignored now)
     def post(self, request, *args, **kwargs):
@@ -247,6 +313,7 @@ class ModuleAPIView(BaseAPIView):
 class QuizAPIView(BaseAPIView):
     model = Quiz
     serializer_class = QuizSerializer
+    course_lookup = "module__course"
 
     def get(self, request, pk=None):
         # If specific quiz requested
@@ -255,23 +322,23 @@ class QuizAPIView(BaseAPIView):
             if not quiz:
                 return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
             serializer = self.serializer_class(quiz)
-            return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
 
         # Filter quizzes by course ID
         course_id = request.query_params.get("course")
+        quizzes = self.get_queryset()
         if course_id:
-            quizzes = Quiz.objects.filter(module__course_id=course_id)
-        else:
-            quizzes = Quiz.objects.all()
+            quizzes = quizzes.filter(module__course_id=course_id)
 
-        serializer = self.serializer_class(quizzes, many=True)
-        return Response(serializer.data)
+        return self.list_response(request, quizzes)
 
 
 
 class QuestionAPIView(BaseAPIView):
     model = Question
     serializer_class = QuestionSerializer
+    course_lookup = "quiz__module__course"
+    stream_list = True
 
     def get(self, request, pk=None):
         # If single question requested
@@ -280,17 +347,15 @@ class QuestionAPIView(BaseAPIView):
             if not question:
                 return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
             serializer = self.serializer_class(question)
-            return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
 
         # Filter questions by course ID
         course_id = request.query_params.get("course")
+        questions = self.get_queryset()
         if course_id:
-            questions = Question.objects.filter(quiz__module__course_id=course_id)
-        else:
-            questions = Question.objects.all()
+            questions = questions.filter(quiz__module__course_id=course_id)
 
-        serializer = self.serializer_class(questions, many=True)
-        return Response(serializer.data)
+        return self.list_response(request, questions, fast_questions)
 
 
 class LearnerCourseDetailAPIView(APIView):
@@ -299,18 +364,421 @@ class LearnerCourseDetailAPIView(APIView):
     def get(self, request, course_id):
         user = request.user
 
-        # Ensure learner is eligible for this course (role=employee only)
-        try:
-            course = Course.objects.get(
-                id=course_id,
-                ship_type=user.ship_type,
-                positions=user.position
+        # Published courses are served as stored bytes; unpublished ones live
+        snapshot = latest_snapshot_for(user, course_id)
+        if snapshot is not None:
+            return self.snapshot_response(request, snapshot)
+
+        # Ensure learner is assigned this course; checked per request since
+        # the cached payload is shared by the whole eligibility group
+        if not Course.objects.filter(id=course_id, assignments__user=user).exists():
+            return Response(
+                {"detail": "You do not have access to this course."},
+                status=status.HTTP_403_FORBIDDEN
             )
+
+        data = cached_catalog_data(
+            "learner-course-detail",
+            eligibility_group(user),
+            lambda: fast_course_details(Course.objects.filter(id=course_id))[0],
+            course_id
+        )
+        return Response(data, status=status.HTTP_200_OK)
+
+    def snapshot_response(self, request, snapshot):
+        # Each encoding is its own representation with its own strong ETag
+        gzipped = accepts_gzip(request.headers.get("Accept-Encoding", ""))
+        etag = f'"{snapshot["content_hash"]}-gzip"' if gzipped else f'"{snapshot["content_hash"]}"'
+        if etag in parse_etags(request.headers.get("If-None-Match", "")):
+            response = HttpResponseNotModified()
+        else:
+            body = bytes(snapshot["data"])
+            if gzipped:
+                response = HttpResponse(body, content_type="application/json")
+                response["Content-Encoding"] = "gzip"
+            else:
+                response = HttpResponse(gzip.decompress(body), content_type="application/json")
+        response["ETag"] = etag
+        response["Vary"] = "Accept-Encoding"
+        return response
+
+
+
+class CoursePublishAPIView(APIView):
+    """Freeze the current state of a course into a new learner snapshot."""
+    permission_classes = [IsAdminOrReadOnly]
+
+    def post(self, request, pk):
+        try:
+            course = Course.objects.get(pk=pk)
         except Course.DoesNotExist:
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        snapshot, created = publish_course(course, request.user)
+        return Response(
+            {
+                "course": course.id,
+                "version": snapshot.version,
+                "content_hash": snapshot.content_hash,
+                "size": len(snapshot.data),
+                "published_at": snapshot.published_at,
+            },
+            status=status.HTTP_201_CREATED if created else status.HTTP_200_OK
+        )
+
+
+
+class LearnerQuizAPIView(APIView):
+    """
+    Quiz questions for learners, without answer keys.
+
+    Published courses serve the quiz as published, with its snapshot
+    version (submissions are graded against the latest one). The rendered
+    JSON is cached per quiz and snapshot version with a strong ETag, so a
+    request is one indexed query (versions and assignment) plus a cache
+    read, or a 304 for a matching If-None-Match.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, pk):
+        user = request.user
+        quiz = (
+            Quiz.objects
+            .filter(id=pk, module__course__deleted_at__isnull=True)
+            .annotate(
+                assigned=Exists(Course.objects.filter(
+                    id=OuterRef("module__course_id"), assignments__user_id=user.id
+                )),
+                course_id=F("module__course_id"),
+                snapshot=latest_version("module__course_id")
+            )
+            .values("id", "version", "draw_size", "module_id", "course_id", "snapshot", "assigned")
+            .first()
+        )
+        if quiz is None:
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        if not (user.is_staff or user.role == 'admin' or quiz["assigned"]):
             return Response(
-                {"detail": "You do not have access to this course."},
+                {"detail": "You do not have access to this quiz."},
                 status=status.HTTP_403_FORBIDDEN
             )
 
-        serializer = CourseDetailSerializer(course)
-        return Response(serializer.data, status=status.HTTP_200_OK)
\ No newline at end of file
+        payload = get_quiz_payload(quiz)
+        if payload is None:
+            # Added after the course was last published
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        etags = parse_etags(request.headers.get("If-None-Match", ""))
+        if payload["etag"] in etags or "*" in etags:
+            response = HttpResponseNotModified()
+        else:
+            response = HttpResponse(payload["body"], content_type="application/json")
+        response["ETag"] = payload["etag"]
+        response["Cache-Control"] = "private, no-cache"
+        return response
+
+
+
+class CourseCloneAPIView(APIView):
+    """
+    Copy a course with its positions, modules, files, quiz and questions to
+    one or more ship types: {"ship_types": [ids], "title": optional}.
+    """
+    permission_classes = [IsAdminOrReadOnly]
+
+    def post(self, request, pk):
+        try:
+            course = Course.objects.get(pk=pk)
+        except Course.DoesNotExist:
+            return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        ship_type_ids = request.data.get("ship_types")
+        if not isinstance(ship_type_ids, list) or not ship_type_ids or not all(
+            isinstance(ship_type_id, int) for ship_type_id in ship_type_ids
+        ):
+            return Response({"detail": "ship_types must be a non-empty list of ids."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        ship_type_ids = list(dict.fromkeys(ship_type_ids))
+        missing = set(ship_type_ids) - set(
+            ShipType.objects.filter(id__in=ship_type_ids).values_list("id", flat=True)
+        )
+        if missing:
+            return Response({"detail": "Ship type not found", "ship_types": sorted(missing)},
+                            status=status.HTTP_404_NOT_FOUND)
+
+        clones = clone_course(course, ship_type_ids, title=request.data.get("title"))
+        return Response(
+            {
+                "source": course.id,
+                "courses": [{"id": clone.id, "ship_type": clone.ship_type_id} for clone in clones],
+            },
+            status=status.HTTP_201_CREATED
+        )
+
+
+# ----------------------------
+# Bulk writes
+# ----------------------------
+class BulkAPIView(APIView):
+    """
+    Create (POST a list), update (PATCH a list of objects with "id") or
+    delete (DELETE {"ids": [...]}) many rows with bulk statements in one
+    transaction.
+
+    Every item is validated first; if any item fails, nothing is written and
+    the response is a list of per-item errors in request order ({} for
+    valid items), like a ``many=True`` serializer.
+    """
+    model = None
+    serializer_class = None
+    foreign_keys = {}  # serializer field -> related model
+    permission_classes = [IsAdminOrReadOnly]
+
+    def post(self, request):
+        if not (request.user.is_staff or request.user.role == 'admin'):
+            return Response({"detail": "You do not have permission to perform this action."},
+                            status=status.HTTP_403_FORBIDDEN)
+        return self.create(request.data)
+
+    def patch(self, request):
+        if not (request.user.is_staff or request.user.role == 'admin'):
+            return Response({"detail": "You do not have permission to perform this action."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        items = request.data
+        error = self.check_items(items)
+        if error:
+            return error
+
+        ids = [item.get("id") if isinstance(item, dict) else None for item in items]
+        instances = self.model.objects.in_bulk([pk for pk in ids if isinstance(pk, int)])
+
+        errors, serializers = [], []
+        for index, (pk, item) in enumerate(zip(ids, items)):
+            if not isinstance(pk, int) or pk not in instances or ids.index(pk) != index:
+                errors.append({"id": ["Not found or repeated."]})
+                serializers.append(None)
+                continue
+            serializer = self.serializer_class(instances[pk], data=item, partial=True)
+            serializer.is_valid()
+            errors.append(dict(serializer.errors))
+            serializers.append(serializer)
+
+        self.check_foreign_keys(serializers, errors)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        # Snapshot before the change so moved rows invalidate their old parent too
+        touched = self.cache_parents(instances.values())
+        fields = set()
+        objs = []
+        for serializer in serializers:
+            obj = serializer.instance
+            for attr, value in serializer.validated_data.items():
+                setattr(obj, attr, value)
+                fields.add(attr)
+            objs.append(obj)
+        if hasattr(self.model, "updated_at"):
+            now = timezone.now()
+            for obj in objs:
+                obj.updated_at = now
+            fields.add("updated_at")
+
+        with transaction.atomic():
+            if fields:
+                self.model.objects.bulk_update(objs, fields, batch_size=500)
+        self.invalidate(touched | self.cache_parents(objs))
+        return Response(self.serializer_class(objs, many=True).data)
+
+    def delete(self, request):
+        if not (request.user.is_staff or request.user.role == 'admin'):
+            return Response({"detail": "You do not have permission to perform this action."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        ids = request.data.get("ids") if isinstance(request.data, dict) else None
+        if not isinstance(ids, list) or not all(isinstance(pk, int) for pk in ids):
+            return Response({"detail": "Expected {\"ids\": [...]} with integer ids."},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        objs = self.model.objects.filter(id__in=ids)
+        found = list(objs)
+        missing = sorted(set(ids) - {obj.id for obj in found})
+        if missing:
+            return Response({"detail": "Not found", "ids": missing}, status=status.HTTP_404_NOT_FOUND)
+
+        touched = self.cache_parents(found)
+        with transaction.atomic(), defer_invalidation():
+            objs.delete()
+        self.invalidate(touched, deleted=True)
+        return Response({"deleted": len(found)})
+
+    # ----------------------------
+    # Helpers
+    # ----------------------------
+    def create(self, items):
+        error = self.check_items(items)
+        if error:
+            return error
+
+        errors, serializers = [], []
+        for item in items:
+            serializer = self.serializer_class(data=item)
+            serializer.is_valid()
+            errors.append(dict(serializer.errors))
+            serializers.append(serializer)
+
+        self.check_foreign_keys(serializers, errors)
+        self.check_batch(serializers, errors)
+        if any(errors):
+            return Response(errors, status=status.HTTP_400_BAD_REQUEST)
+
+        objs = [self.model(**serializer.validated_data) for serializer in serializers]
+        with transaction.atomic():
+            objs = self.model.objects.bulk_create(objs, batch_size=500)
+        self.invalidate(self.cache_parents(objs))
+        return Response(self.serializer_class(objs, many=True).data, status=status.HTTP_201_CREATED)
+
+    def check_items(self, items):
+        if not isinstance(items, list) or not items:
+            return Response({"detail": "Expected a non-empty list of items."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        if len(items) > settings.BULK_MAX_ITEMS:
+            return Response({"detail": f"At most {settings.BULK_MAX_ITEMS} items per request."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return None
+
+    def check_foreign_keys(self, serializers, errors):
+        """One existence query per relation for every id in the batch."""
+        for field, related_model in self.foreign_keys.items():
+            source = f"{field}_id"
+            wanted = {
+                serializer.validated_data[source]
+                for serializer in serializers
+                if serializer is not None and source in getattr(serializer, "validated_data", {})
+            }
+            existing = set(related_model.objects.filter(id__in=wanted).values_list("id", flat=True))
+            for serializer, item_errors in zip(serializers, errors):
+                if serializer is None or item_errors:
+                    continue
+                pk = serializer.validated_data.get(source)
+                if source in serializer.validated_data and pk not in existing:
+                    item_errors[field] = [f'Invalid pk "{pk}" - object does not exist.']
+
+    def check_batch(self, serializers, errors):
+        """Cross-item validation for new rows; override per model."""
+
+    def cache_parents(self, objs):
+        """Ids of the quizzes whose cached payloads these rows affect."""
+        return set()
+
+    def invalidate(self, quiz_ids, deleted=False):
+        bump_quiz_versions(quiz_ids)
+        bump_catalog_version()
+
+
+class QuestionBulkAPIView(BulkAPIView):
+    model = Question
+    serializer_class = QuestionBulkSerializer
+    foreign_keys = {"quiz": Quiz}
+
+    def cache_parents(self, objs):
+        return {obj.quiz_id for obj in objs}
+
+    def invalidate(self, quiz_ids, deleted=False):
+        recount_questions(quiz_ids)
+        super().invalidate(quiz_ids, deleted)
+
+
+class QuizBulkAPIView(BulkAPIView):
+    model = Quiz
+    serializer_class = QuizBulkSerializer
+    foreign_keys = {"module": Module}
+
+    def cache_parents(self, objs):
+        return {obj.id for obj in objs}
+
+    def check_batch(self, serializers, errors):
+        # Quiz.module is one-to-one: check the whole batch in one query
+        module_ids = [s.validated_data.get("module_id") for s in serializers]
+        taken = set(Quiz.objects.filter(module_id__in=module_ids).values_list("module_id", flat=True))
+        for index, (module_id, item_errors) in enumerate(zip(module_ids, errors)):
+            if item_errors:
+                continue
+            if module_id in taken or module_ids.index(module_id) != index:
+                item_errors["module"] = ["quiz with this module already exists."]
+
+    def patch(self, request):
+        # Moving quizzes between modules would need the one-to-one check above
+        if any(isinstance(item, dict) and "module" in item for item in request.data or []):
+            return Response({"detail": "module cannot be changed in a bulk update."},
+                            status=status.HTTP_400_BAD_REQUEST)
+        return super().patch(request)
+
+    def invalidate(self, quiz_ids, deleted=False):
+        if deleted:
+            bump_catalog_version()
+        else:
+            super().invalidate(quiz_ids)
+
+
+class ModuleBulkAPIView(BulkAPIView):
+    model = Module
+    serializer_class = ModuleBulkSerializer
+    foreign_keys = {"course": Course}
+
+    def cache_parents(self, objs):
+        # Quiz payloads do not depend on their module, only the catalog does
+        self.touched_courses = getattr(self, "touched_courses", set()) | {obj.course_id for obj in objs}
+        return set()
+
+    def invalidate(self, quiz_ids, deleted=False):
+        bump_catalog_version()
+        recount_modules(self.touched_courses)
+        modules_changed.send(sender=Module, course_ids=self.touched_courses)
+
+
+class QuestionImportAPIView(QuestionBulkAPIView):
+    """
+    Import a question bank in one bulk insert.
+
+    Accepts a JSON list (or {"quiz": id, "questions": [...]}) or an uploaded
+    ``file`` (.csv with a header row, or .json) plus a ``quiz`` form field.
+    CSV columns: question_text, option_a, option_b, option_c, option_d,
+    correct_answer and optionally quiz. Items without a quiz get the quiz
+    given for the whole import.
+    """
+    http_method_names = ["post", "options"]
+
+    def post(self, request):
+        if not (request.user.is_staff or request.user.role == 'admin'):
+            return Response({"detail": "You do not have permission to perform this action."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        upload = request.FILES.get("file")
+        try:
+            if upload is not None:
+                text = upload.read().decode("utf-8-sig")
+                if upload.name.lower().endswith(".json"):
+                    items = json.loads(text)
+                else:
+                    items = list(csv.DictReader(io.StringIO(text)))
+            else:
+                items = request.data
+        except (UnicodeDecodeError, ValueError, csv.Error) as exc:
+            return Response({"detail": f"Could not read the import: {exc}"},
+                            status=status.HTTP_400_BAD_REQUEST)
+
+        quiz_id = request.data.get("quiz") if isinstance(request.data, dict) else None
+        if isinstance(items, dict):
+            quiz_id = items.get("quiz", quiz_id)
+            items = items.get("questions")
+
+        if quiz_id is not None and isinstance(items, list):
+            items = [
+                {**item, "quiz": item.get("quiz") or quiz_id} if isinstance(item, dict) else item
+                for item in items
+            ]
+        return self.create(items)
+
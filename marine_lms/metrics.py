@@ -0,0 +1,277 @@
+"""
+In-process metrics exposed in Prometheus text format.
+
+Each process keeps its own counters and histograms in memory and
+periodically writes a snapshot to ``METRICS_DIR/<pid>-<start>.json``
+(atomically, via rename). The metrics endpoint merges every snapshot in the
+directory, so totals are correct across gunicorn workers, including workers
+that have since been recycled: on collection the snapshots of processes that
+are no longer running are folded into ``archive.json`` and removed, so the
+directory does not grow with every recycled worker.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.http import HttpResponse
+from rest_framework import permissions, status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+METRICS = {
+    "http_requests_total": ("counter", "Requests handled, by URL name, method and status."),
+    "http_request_errors_total": ("counter", "Requests that ended in a 5xx response, by URL name."),
+    "http_request_db_queries_total": ("counter", "Database queries executed, by URL name."),
+    "http_request_duration_seconds": ("histogram", "Request latency, by URL name."),
+    "quiz_submissions_total": ("counter", "Quiz attempts submitted."),
+    "quiz_passes_total": ("counter", "Quiz attempts that passed."),
+    "logins_total": ("counter", "Successful logins."),
+}
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.counters = {}
+        self.histograms = {}
+        self.process_key = None
+        self.last_flush = 0.0
+
+    def increment(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+        self.maybe_flush()
+
+    def observe(self, name, value, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            buckets, total, count = self.histograms.get(key, ([0] * len(LATENCY_BUCKETS), 0.0, 0))
+            buckets = [n + (value <= bound) for n, bound in zip(buckets, LATENCY_BUCKETS)]
+            self.histograms[key] = (buckets, total + value, count + 1)
+        self.maybe_flush()
+
+    # ----------------------------
+    # File backend
+    # ----------------------------
+    def snapshot(self):
+        with self.lock:
+            return snapshot_data(self.counters, self.histograms)
+
+    def maybe_flush(self):
+        if time.monotonic() - self.last_flush >= settings.METRICS_FLUSH_INTERVAL:
+            self.flush()
+
+    def flush(self):
+        directory = settings.METRICS_DIR
+        os.makedirs(directory, exist_ok=True)
+        if self.process_key is None:
+            self.process_key = f"{os.getpid()}-{time.time_ns()}"
+
+        path = os.path.join(directory, f"{self.process_key}.json")
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(self.snapshot(), fh)
+        os.replace(tmp_path, path)
+        self.last_flush = time.monotonic()
+
+    def collect(self):
+        """Merge every process snapshot (this one flushed first)."""
+        self.flush()
+        directory = settings.METRICS_DIR
+        fold_dead_snapshots(directory)
+
+        counters, histograms = {}, {}
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if entry.name.endswith(".json"):
+                    merge_snapshot(load_snapshot(entry.path), counters, histograms)
+        return counters, histograms
+
+
+# ----------------------------
+# Snapshot files
+# ----------------------------
+ARCHIVE_NAME = "archive.json"
+
+
+def snapshot_data(counters, histograms):
+    return {
+        "counters": [[name, list(labels), value] for (name, labels), value in counters.items()],
+        "histograms": [
+            [name, list(labels), buckets, total, count]
+            for (name, labels), (buckets, total, count) in histograms.items()
+        ],
+    }
+
+
+def load_snapshot(path):
+    try:
+        with open(path) as fh:
+            return json.load(fh)
+    except (OSError, ValueError):
+        return {"counters": [], "histograms": []}
+
+
+def merge_snapshot(data, counters, histograms):
+    for name, labels, value in data["counters"]:
+        key = (name, tuple(tuple(pair) for pair in labels))
+        counters[key] = counters.get(key, 0) + value
+    for name, labels, buckets, total, count in data["histograms"]:
+        key = (name, tuple(tuple(pair) for pair in labels))
+        old_buckets, old_total, old_count = histograms.get(key, ([0] * len(LATENCY_BUCKETS), 0.0, 0))
+        histograms[key] = (
+            [a + b for a, b in zip(old_buckets, buckets)],
+            old_total + total,
+            old_count + count,
+        )
+
+
+def process_running(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def fold_dead_snapshots(directory):
+    """
+    Add the snapshots of exited processes to the archive and delete them.
+    Runs under an exclusive lock so concurrent collectors fold a file once.
+    """
+    def dead_paths():
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                pid, _, rest = entry.name.partition("-")
+                if rest.endswith(".json") and pid.isdigit() and not process_running(int(pid)):
+                    yield entry.path
+
+    if not any(dead_paths()):
+        return
+
+    with open(os.path.join(directory, "archive.lock"), "a") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        dead = list(dead_paths())  # again: another collector may have folded them
+        if not dead:
+            return
+
+        archive_path = os.path.join(directory, ARCHIVE_NAME)
+        counters, histograms = {}, {}
+        for path in [archive_path] + dead:
+            if os.path.exists(path):
+                merge_snapshot(load_snapshot(path), counters, histograms)
+
+        tmp_path = f"{archive_path}.tmp"
+        with open(tmp_path, "w") as fh:
+            json.dump(snapshot_data(counters, histograms), fh)
+        os.replace(tmp_path, archive_path)
+        for path in dead:
+            os.remove(path)
+
+
+registry = MetricsRegistry()
+
+
+def increment(name, amount=1, **labels):
+    if settings.METRICS_ENABLED:
+        registry.increment(name, amount, **labels)
+
+
+# ----------------------------
+# Prometheus text format
+# ----------------------------
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels, extra=()):
+    pairs = list(labels) + list(extra)
+    if not pairs:
+        return ""
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in pairs) + "}"
+
+
+def render_prometheus(counters, histograms):
+    lines = []
+    for name, (kind, help_text) in METRICS.items():
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+
+        if kind == "counter":
+            for (metric, labels), value in sorted(counters.items()):
+                if metric == name:
+                    lines.append(f"{name}{_format_labels(labels)} {value}")
+            continue
+
+        for (metric, labels), (buckets, total, count) in sorted(histograms.items()):
+            if metric != name:
+                continue
+            for bound, cumulative in zip(LATENCY_BUCKETS, buckets):
+                lines.append(f"{name}_bucket{_format_labels(labels, [('le', bound)])} {cumulative}")
+            lines.append(f"{name}_bucket{_format_labels(labels, [('le', '+Inf')])} {count}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {total}")
+            lines.append(f"{name}_count{_format_labels(labels)} {count}")
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        if not settings.METRICS_ENABLED:
+            return Response({"detail": "Metrics are disabled."}, status=status.HTTP_404_NOT_FOUND)
+        counters, histograms = registry.collect()
+        return HttpResponse(
+            render_prometheus(counters, histograms),
+            content_type="text/plain; version=0.0.4; charset=utf-8"
+        )
+
+
+# ----------------------------
+# Middleware
+# ----------------------------
+class MetricsMiddleware:
+    """Request count, latency, DB query count and 5xx count per URL name."""
+
+    def __init__(self, get_response):
+        if not settings.METRICS_ENABLED:
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        queries = [0]
+
+        def count_queries(execute, sql, params, many, context):
+            queries[0] += 1
+            return execute(sql, params, many, context)
+
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(count_queries))
+            response = self.get_response(request)
+        elapsed = time.perf_counter() - start
+
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.view_name) if match else "unmatched"
+
+        registry.increment(
+            "http_requests_total", view=view, method=request.method, status=str(response.status_code)
+        )
+        registry.increment("http_request_db_queries_total", queries[0], view=view)
+        if response.status_code >= 500:
+            registry.increment("http_request_errors_total", view=view)
+        registry.observe("http_request_duration_seconds", elapsed, view=view)
+
+        return response
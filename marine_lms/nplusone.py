@@ -0,0 +1,148 @@
+"""
+N+1 query detection.
+
+SQL executed inside ``detect_n_plus_one()`` is grouped by normalized shape
+(literals and parameter lists collapsed). Any shape that runs more than
+``threshold`` times is reported together with the first project stack frame
+that issued it::
+
+    @detect_n_plus_one(threshold=3)
+    def test_dashboard_queries(self):
+        self.client.get("/api/accounts/dashboard/admin/")
+
+    with detect_n_plus_one(action="warn"):
+        serializer.data
+
+NPlusOneMiddleware applies the same check to every request when
+NPLUSONE_ACTION is "warn" or "raise" (development only).
+"""
+import logging
+import os
+import re
+import sys
+import warnings
+from contextlib import ContextDecorator, ExitStack
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+logger = logging.getLogger(__name__)
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PARAM_LIST = re.compile(r"\((?:\s*(?:%s|\?)\s*,)+\s*(?:%s|\?)\s*\)")
+_SPACE = re.compile(r"\s+")
+
+
+class NPlusOneWarning(UserWarning):
+    pass
+
+
+class NPlusOneError(AssertionError):
+    pass
+
+
+def normalize_sql(sql):
+    sql = _STRING.sub("?", sql)
+    sql = _NUMBER.sub("?", sql)
+    sql = sql.replace("%s", "?")
+    sql = _PARAM_LIST.sub("(...)", sql)
+    return _SPACE.sub(" ", sql).strip()
+
+
+# Middleware and instrumentation in the project package wrap every query,
+# so their frames never point at the code that issued it.
+_INFRASTRUCTURE_DIR = os.path.dirname(os.path.abspath(__file__)) + os.sep
+
+
+def _origin_frame():
+    """First frame in app code, skipping project infrastructure and third-party packages."""
+    base_dir = str(settings.BASE_DIR)
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if (
+            filename.startswith(base_dir)
+            and not filename.startswith(_INFRASTRUCTURE_DIR)
+            and "site-packages" not in filename
+            and os.sep + "venv" + os.sep not in filename
+        ):
+            return f"{os.path.relpath(filename, base_dir)}:{frame.f_lineno} in {frame.f_code.co_name}"
+        frame = frame.f_back
+    return "unknown"
+
+
+class detect_n_plus_one(ContextDecorator):
+    """
+    Context manager / decorator that reports repeated query shapes on exit.
+
+    ``action`` is "raise" (NPlusOneError, the default), "warn"
+    (NPlusOneWarning) or "log" (a warning on this module's logger).
+    """
+
+    def __init__(self, threshold=None, action=None, label=None):
+        self.threshold = threshold if threshold is not None else settings.NPLUSONE_THRESHOLD
+        self.action = action or "raise"
+        self.label = label
+
+    def __enter__(self):
+        self.counts = {}
+        self.origins = {}
+        self.stack = ExitStack()
+        for connection in connections.all():
+            self.stack.enter_context(connection.execute_wrapper(self.record))
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stack.close()
+        if exc_type is None:
+            self.check()
+        return False
+
+    def record(self, execute, sql, params, many, context):
+        shape = normalize_sql(sql)
+        count = self.counts.get(shape, 0) + 1
+        self.counts[shape] = count
+        if count == 2:
+            self.origins[shape] = _origin_frame()
+        return execute(sql, params, many, context)
+
+    @property
+    def offenders(self):
+        return [
+            (shape, count, self.origins.get(shape, "unknown"))
+            for shape, count in sorted(self.counts.items(), key=lambda item: -item[1])
+            if count > self.threshold
+        ]
+
+    def report(self):
+        header = f"Possible N+1 queries{f' in {self.label}' if self.label else ''}:"
+        lines = [header] + [
+            f"  {count}x from {origin}: {shape[:300]}"
+            for shape, count, origin in self.offenders
+        ]
+        return "\n".join(lines)
+
+    def check(self):
+        if not self.offenders:
+            return
+        if self.action == "raise":
+            raise NPlusOneError(self.report())
+        if self.action == "log":
+            logger.warning(self.report())
+        else:
+            warnings.warn(self.report(), NPlusOneWarning, stacklevel=3)
+
+
+class NPlusOneMiddleware:
+    def __init__(self, get_response):
+        if settings.NPLUSONE_ACTION not in ("warn", "raise"):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        # Middleware warnings go to the log; raising still fails the request.
+        action = "log" if settings.NPLUSONE_ACTION == "warn" else "raise"
+        with detect_n_plus_one(action=action, label=f"{request.method} {request.path}"):
+            response = self.get_response(request)
+        return response
@@ -0,0 +1,51 @@
+"""
+Admin paginator for large tables.
+
+``COUNT(*)`` over a whole table is a sequential scan on PostgreSQL, paid on
+every changelist page. For unfiltered changelists this paginator uses the
+planner's row estimate instead, once the table is past
+``estimate_threshold`` rows; filtered or small lists, and other databases,
+get the exact count. The default manager's own filter (e.g. hiding
+soft-deleted rows) counts as unfiltered, so the estimate also includes rows
+waiting for ``purge_deleted``. Pair it with ``show_full_result_count = False``
+so the admin does not issue a second, unfiltered count.
+"""
+from django.core.paginator import Paginator
+from django.db import connections
+from django.utils.functional import cached_property
+
+
+class EstimatedCountPaginator(Paginator):
+    estimate_threshold = 10000
+
+    @cached_property
+    def count(self):
+        estimate = self.estimated_count()
+        if estimate is not None and estimate > self.estimate_threshold:
+            return estimate
+        return super().count
+
+    def estimated_count(self):
+        query = getattr(self.object_list, "query", None)
+        if query is None or query.distinct or not self.unfiltered(self.object_list):
+            return None
+        return self.table_estimate(self.object_list.db, query.model)
+
+    @staticmethod
+    def unfiltered(queryset):
+        """No WHERE beyond the one the model's default manager always adds."""
+        where = queryset.query.where
+        return not where or where == queryset.model._default_manager.get_queryset().query.where
+
+    @staticmethod
+    def table_estimate(using, model):
+        connection = connections[using]
+        if connection.vendor != "postgresql":
+            return None
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT reltuples::bigint FROM pg_class WHERE oid = %s::regclass",
+                [model._meta.db_table]
+            )
+            row = cursor.fetchone()
+        return row[0] if row and row[0] > 0 else None
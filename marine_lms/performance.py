@@ -0,0 +1,163 @@
+import json
+import logging
+import random
+import time
+from contextlib import ExitStack, contextmanager
+from contextvars import ContextVar
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from rest_framework.renderers import JSONRenderer
+
+logger = logging.getLogger(__name__)
+
+_current_timings = ContextVar("request_timings", default=None)
+
+
+class RequestTimings:
+    """Accumulated per-request timings in milliseconds, plus SQL stats."""
+
+    def __init__(self):
+        self.durations = {}
+        self.query_count = 0
+        self.sql_ms = 0.0
+
+    def add(self, name, elapsed_ms):
+        self.durations[name] = self.durations.get(name, 0.0) + elapsed_ms
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.query_count += 1
+            self.sql_ms += (time.perf_counter() - start) * 1000
+
+
+@contextmanager
+def measure(name):
+    """
+    Add the time spent in the block to the current request's ``name`` timing.
+
+    A no-op (one context variable lookup) when no ServerTimingMiddleware is
+    collecting for this request.
+    """
+    timings = _current_timings.get()
+    if timings is None:
+        yield
+        return
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings.add(name, (time.perf_counter() - start) * 1000)
+
+
+# ----------------------------
+# DRF hooks
+# ----------------------------
+class TimedJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        with measure("render"):
+            return super().render(data, accepted_media_type, renderer_context)
+
+
+class SerializerTimingMixin:
+    """For APIViews that build serializers by hand (e.g. the BaseAPIView classes)."""
+
+    def get_serializer_data(self, serializer):
+        with measure("serialize"):
+            return serializer.data
+
+
+# ----------------------------
+# Middleware
+# ----------------------------
+class ServerTimingMiddleware:
+    """
+    Report where a request spent its time in a ``Server-Timing`` header:
+    SQL (with query count), view, serialization, rendering and total.
+    A sample of requests is also logged as one JSON line tagged with the
+    view name. Streamed responses only report the time to their headers;
+    their log line covers the whole stream. Removed from the stack entirely
+    unless SERVER_TIMING_ENABLED.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, "SERVER_TIMING_ENABLED", False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.sample_rate = getattr(settings, "SERVER_TIMING_LOG_SAMPLE_RATE", 0.0)
+
+    def __call__(self, request):
+        timings = RequestTimings()
+        start = time.perf_counter()
+        with self.collect(timings):
+            response = self.get_response(request)
+
+        if response.streaming:
+            # Headers go out before the body is built, so only the time to
+            # the first byte is known here; the sampled log line is written
+            # once the stream is exhausted, with the work done while streaming.
+            view_ms = (time.perf_counter() - start) * 1000
+            response["Server-Timing"] = f"view;dur={view_ms:.2f}"
+            response.streaming_content = self.timed_stream(
+                response.streaming_content, timings, request, response, start, view_ms
+            )
+            return response
+
+        total_ms = (time.perf_counter() - start) * 1000
+        render_ms = timings.durations.get("render", 0.0)
+        view_ms = max(total_ms - render_ms, 0.0)
+
+        response["Server-Timing"] = ", ".join([
+            f'db;dur={timings.sql_ms:.2f};desc="{timings.query_count} queries"',
+            f"view;dur={view_ms:.2f}",
+            f"serialize;dur={timings.durations.get('serialize', 0.0):.2f}",
+            f"render;dur={render_ms:.2f}",
+            f"total;dur={total_ms:.2f}",
+        ])
+        self.log(request, response, timings, view_ms, total_ms)
+        return response
+
+    @contextmanager
+    def collect(self, timings):
+        token = _current_timings.set(timings)
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(timings.sql_wrapper))
+                yield
+        finally:
+            _current_timings.reset(token)
+
+    def timed_stream(self, content, timings, request, response, start, view_ms):
+        chunks = iter(content)
+        try:
+            while True:
+                with self.collect(timings):
+                    chunk = next(chunks, None)
+                if chunk is None:
+                    break
+                yield chunk
+        finally:
+            total_ms = (time.perf_counter() - start) * 1000
+            self.log(request, response, timings, view_ms, total_ms)
+
+    def log(self, request, response, timings, view_ms, total_ms):
+        if not (self.sample_rate and random.random() < self.sample_rate):
+            return
+        match = getattr(request, "resolver_match", None)
+        logger.info(json.dumps({
+            "view": match.view_name if match else None,
+            "method": request.method,
+            "path": request.path,
+            "status": response.status_code,
+            "streamed": response.streaming,
+            "queries": timings.query_count,
+            "db_ms": round(timings.sql_ms, 2),
+            "view_ms": round(view_ms, 2),
+            "serialize_ms": round(timings.durations.get("serialize", 0.0), 2),
+            "render_ms": round(timings.durations.get("render", 0.0), 2),
+            "total_ms": round(total_ms, 2),
+        }))
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.2/ref/settings/
 """
 
+import os
 from pathlib import Path
 from datetime import timedelta
 
@@ -48,9 +49,13 @@ INSTALLED_APPS = [
     'accounts',
     'courses',
     'progress',
+    'certificates',
 ]
 
 MIDDLEWARE = [
+    'marine_lms.performance.ServerTimingMiddleware',
+    'marine_lms.metrics.MetricsMiddleware',
+    'marine_lms.nplusone.NPlusOneMiddleware',
     'corsheaders.middleware.CorsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
@@ -98,6 +103,18 @@ REST_FRAMEWORK = {
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.IsAuthenticated',
     ),
+    'DEFAULT_RENDERER_CLASSES': (
+        'marine_lms.performance.TimedJSONRenderer',
+        'rest_framework.renderers.BrowsableAPIRenderer',
+    ),
+    # Sliding-window limits for views with a throttle_scope, see
+    # marine_lms.throttling; "<scope>" is per user, "<scope>_ip" per client IP.
+    'DEFAULT_THROTTLE_RATES': {
+        'login': '10/min',
+        'login_ip': '60/min',
+        'quiz_submit': '20/min',
+        'quiz_submit_ip': '120/min',
+    },
 }
 
 
@@ -124,6 +141,42 @@ DATABASES = {
 }
 
 
+# Cache
+# Rate limits, watch heartbeats and the cached catalog must be shared by all
+# workers, and throttle counters need an atomic incr: run production on
+# "redis" (CACHE_LOCATION=redis://host:6379/0). "file" shares one cache
+# between workers on ships without a cache server, but its incr is a
+# read-then-write, so bursts across workers can slip past a rate limit.
+# "locmem" is per process (each worker counts on its own): development and
+# tests only.
+
+CACHE_BACKEND = os.environ.get('CACHE_BACKEND', 'locmem')
+
+if CACHE_BACKEND == 'redis':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', 'redis://127.0.0.1:6379/0'),
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': os.environ.get('CACHE_LOCATION', str(BASE_DIR / 'cache')),
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'marine-lms',
+        }
+    }
+
+CATALOG_CACHE_TIMEOUT = 60 * 60
+
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -167,3 +220,93 @@ MEDIA_ROOT = BASE_DIR/'media'
 # https://docs.djangoproject.com/en/5.2/ref/settings/#default-auto-field
 
 DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
+
+
+
+# Performance instrumentation
+# Server-Timing headers (and sampled JSON log lines) per request; opt in with
+# SERVER_TIMING_ENABLED=True, the middleware removes itself otherwise.
+
+SERVER_TIMING_ENABLED = os.environ.get('SERVER_TIMING_ENABLED', 'False') == 'True'
+SERVER_TIMING_LOG_SAMPLE_RATE = float(os.environ.get('SERVER_TIMING_LOG_SAMPLE_RATE', '0.01'))
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'marine_lms.performance': {'handlers': ['console'], 'level': 'INFO', 'propagate': False},
+        'marine_lms.nplusone': {'handlers': ['console'], 'level': 'WARNING', 'propagate': False},
+    },
+}
+
+
+# N+1 query detection
+# "warn" logs, "raise" fails the request; anything else disables the middleware.
+
+NPLUSONE_ACTION = os.environ.get('NPLUSONE_ACTION', 'warn' if DEBUG else '')
+NPLUSONE_THRESHOLD = 5
+
+
+# Metrics
+# Opt in with METRICS_ENABLED=True; otherwise the middleware removes itself
+# and nothing is written. Per-process snapshots are merged from METRICS_DIR,
+# which all workers of one server must share; clear it when the server starts.
+
+METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'False') == 'True'
+METRICS_DIR = os.environ.get('METRICS_DIR', '/tmp/marine_lms_metrics')
+METRICS_FLUSH_INTERVAL = 5
+
+
+# Reporting
+COMPLIANCE_MATRIX_CACHE_TIMEOUT = 60 * 15
+
+# Days a learner has to complete a newly assigned course
+ASSIGNMENT_DUE_DAYS = 30
+
+# Courses with more progress rows than this are recomputed off-thread
+PROGRESS_RECOMPUTE_SYNC_LIMIT = 2000
+
+
+# Bulk course editing
+BULK_MAX_ITEMS = 1000
+
+
+# Quiz attempts
+# Drawn attempts must be submitted with their signed token within this time.
+
+QUIZ_ATTEMPT_TOKEN_MAX_AGE = 60 * 60 * 3
+
+
+# Video watch heartbeats
+# Heartbeats are coalesced in the cache and written at most once per
+# WATCH_FLUSH_INTERVAL (or by `manage.py flush_watch_progress`). This needs a
+# cache shared by all workers and the command (CACHE_BACKEND other than locmem).
+
+WATCH_COMPLETION_THRESHOLD = 0.9
+# Players offer up to 2x speed: the watched position may not advance faster
+# than this times the wall time since the previous heartbeat.
+WATCH_MAX_PLAYBACK_RATE = 2.0
+WATCH_FLUSH_INTERVAL = 30
+WATCH_CACHE_TIMEOUT = 60 * 60
+
+
+# Certificates
+# PDFs render in a process pool of this size; downloads of a certificate
+# still being generated get a 202 with this Retry-After (seconds).
+
+CERTIFICATE_RENDER_WORKERS = 2
+CERTIFICATE_RETRY_AFTER = 10
+
+
+# Training status
+# Completions expiring within this many days are reported as expiring soon.
+# `manage.py send_training_digest` mails the summary with EMAIL_BACKEND (the
+# console in development; configure SMTP with the EMAIL_* settings).
+
+TRAINING_EXPIRY_WARNING_DAYS = 30
+
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'training@marine-lms.local')
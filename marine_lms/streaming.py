@@ -0,0 +1,142 @@
+from django.db import connections
+from django.db.models import Q
+from django.http import StreamingHttpResponse
+from rest_framework.renderers import JSONRenderer
+from rest_framework.response import Response
+from .performance import measure
+
+
+def ordering_with_tiebreaker(queryset):
+    """
+    The queryset's ordering (explicit, else the model's Meta.ordering) with
+    the primary key appended as a tiebreaker unless it is already there.
+    """
+    if queryset.query.order_by:
+        ordering = list(queryset.query.order_by)
+    elif queryset.query.default_ordering:
+        ordering = list(queryset.model._meta.ordering)
+    else:
+        ordering = []
+
+    pk_names = {"pk", queryset.model._meta.pk.name, queryset.model._meta.pk.attname}
+    if not any(isinstance(field, str) and field.lstrip("-") in pk_names for field in ordering):
+        ordering.append("pk")
+    return ordering
+
+
+def keyset_after(ordering, row, nulls_largest):
+    """
+    Filter for the rows that come after ``row`` (its values for ``ordering``,
+    in order) under that ordering. NULLs sort where the database puts them.
+    """
+    after = Q(pk__in=[])
+    equal = Q()
+    for field, value in zip(ordering, row):
+        name = field.lstrip("-")
+        ascending = not field.startswith("-")
+        nulls_after = nulls_largest == ascending
+
+        if value is None:
+            # Nothing sorts strictly after a NULL when NULLs come last
+            later = None if nulls_after else Q(**{f"{name}__isnull": False})
+            same = Q(**{f"{name}__isnull": True})
+        else:
+            later = Q(**{f"{name}__{'gt' if ascending else 'lt'}": value})
+            if nulls_after:
+                later |= Q(**{f"{name}__isnull": True})
+            same = Q(**{name: value})
+
+        if later is not None:
+            after |= equal & later
+        equal &= same
+    return after
+
+
+def stream_json_array(queryset, serialize, chunk_size):
+    """
+    Yield a JSON array of ``serialize(chunk)`` results, one chunk of
+    ``queryset`` at a time, in the queryset's own order.
+
+    Chunks are walked with keyset pagination on the ordering fields plus the
+    primary key, so only one chunk of rows and its rendered bytes are held in
+    memory at once. Orderings by expressions fall back to offset paging.
+    Every chunk is rendered with DRF's JSONRenderer, so the concatenated
+    output is byte-identical to rendering the whole list in one go.
+    """
+    renderer = JSONRenderer()
+    ordering = ordering_with_tiebreaker(queryset)
+    ordered = queryset.order_by(*ordering)
+    keyset = all(isinstance(field, str) and field != "?" for field in ordering)
+    if keyset:
+        fields = [field.lstrip("-") for field in ordering]
+        pk_index = next(
+            index for index, field in enumerate(fields)
+            if field in {"pk", queryset.model._meta.pk.name, queryset.model._meta.pk.attname}
+        )
+    nulls_largest = connections[queryset.db].features.nulls_order_largest
+    last_row = None
+    offset = 0
+    first = True
+
+    yield b"["
+    while True:
+        if not keyset:
+            ids = list(ordered.values_list("pk", flat=True)[offset:offset + chunk_size])
+            offset += len(ids)
+        else:
+            page = ordered if last_row is None else ordered.filter(
+                keyset_after(ordering, last_row, nulls_largest)
+            )
+            rows = list(page.values_list(*fields)[:chunk_size])
+            ids = [row[pk_index] for row in rows]
+            if rows:
+                last_row = rows[-1]
+        if not ids:
+            break
+
+        with measure("serialize"):
+            data = serialize(ordered.filter(pk__in=ids))
+        with measure("render"):
+            body = renderer.render(data)[1:-1]
+        if body:
+            yield body if first else b"," + body
+            first = False
+    yield b"]"
+
+
+class StreamingListMixin:
+    """
+    Opt-in streaming for ``many=True`` responses.
+
+    Views set ``stream_list = True`` and build list responses with
+    ``self.list_response(request, queryset, serialize)``, where ``serialize``
+    turns a queryset into a list of dicts. JSON requests are then streamed
+    chunk by chunk; other renderers (e.g. the browsable API) and views that
+    did not opt in get the usual buffered Response with the same content.
+    """
+    stream_list = False
+    stream_chunk_size = 500
+
+    def list_response(self, request, queryset, serialize=None):
+        if serialize is None:
+            serialize = self.serialize_many
+
+        queryset = queryset.order_by(*ordering_with_tiebreaker(queryset))
+
+        renderer = getattr(request, "accepted_renderer", None)
+        if (
+            self.stream_list
+            and isinstance(renderer, JSONRenderer)
+            and "indent" not in (request.accepted_media_type or "")
+        ):
+            return StreamingHttpResponse(
+                stream_json_array(queryset, serialize, self.stream_chunk_size),
+                content_type=renderer.media_type
+            )
+
+        with measure("serialize"):
+            data = serialize(queryset)
+        return Response(data)
+
+    def serialize_many(self, queryset):
+        return self.serializer_class(queryset, many=True).data
@@ -0,0 +1,46 @@
+"""
+Shared test fixtures.
+
+AdminQueryBudgetTestCase checks that admin pages run a fixed number of
+queries however many rows they show. Subclasses add their rows in
+``add_rows(count)`` and call ``assert_bounded(url)``::
+
+    class AdminQueryBudgetTests(AdminQueryBudgetTestCase):
+        def add_rows(self, count):
+            Course.objects.bulk_create(...)
+
+        def test_course_changelist(self):
+            self.assert_bounded(reverse("admin:courses_course_changelist"))
+"""
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from accounts.models import ShipType, User
+
+
+class AdminQueryBudgetTestCase(TestCase):
+    """Changelist query counts must not grow with the number of rows."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create_superuser("root", "root@example.com", "pw")
+        cls.ship_type = ShipType.objects.create(name="Tanker")
+
+    def setUp(self):
+        self.client.force_login(self.admin)
+
+    def add_rows(self, count):
+        raise NotImplementedError
+
+    def page_queries(self, url):
+        self.client.get(url)  # warm per-process caches (content types, etc.)
+        with CaptureQueriesContext(connection) as captured:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(captured)
+
+    def assert_bounded(self, url):
+        self.add_rows(2)
+        few = self.page_queries(url)
+        self.add_rows(40)
+        self.assertEqual(self.page_queries(url), few)
@@ -0,0 +1,133 @@
+"""
+Sliding-window rate limits kept in the default cache.
+
+DRF's SimpleRateThrottle stores a timestamp list per client and rewrites it
+with get/set, which races between gunicorn workers. Here each client has
+one counter per fixed window, bumped with ``cache.add`` + ``cache.incr``,
+and the sliding window is estimated from the current and previous counters:
+
+    requests = previous * (1 - elapsed fraction of current window) + current
+
+The limits only hold across workers when the cache is shared and its incr
+is atomic, i.e. CACHE_BACKEND=redis. FileBasedCache (and DatabaseCache)
+implement incr as get + set, so concurrent requests can lose updates, and
+LocMemCache keeps one set of counters per process.
+
+Views opt in with ``throttle_scope`` and ``throttle_classes``; rates come
+from REST_FRAMEWORK["DEFAULT_THROTTLE_RATES"] under ``<scope>`` (per user)
+and ``<scope>_ip`` (per client IP). A scope without a rate is not limited.
+Rejected requests get a 429 with Retry-After (DRF sets it from ``wait``).
+"""
+import math
+from django.core.cache import cache as default_cache
+from rest_framework.settings import api_settings
+from rest_framework.throttling import SimpleRateThrottle
+
+
+class SlidingWindowThrottle(SimpleRateThrottle):
+    cache = default_cache
+    cache_format = "throttle:%(scope)s:%(ident)s"
+    scope_suffix = ""
+
+    def __init__(self):
+        # The scope (and so the rate) is only known once we see the view
+        self.wait_seconds = None
+
+    def get_rate(self):
+        # Read per call so rate changes (and override_settings) apply at once
+        return api_settings.DEFAULT_THROTTLE_RATES.get(self.scope)
+
+    def get_ident_for(self, request):
+        """The client this limit counts against, or None to skip it."""
+        raise NotImplementedError
+
+    def get_cache_key(self, request, view):
+        ident = self.get_ident_for(request)
+        if ident is None:
+            return None
+        return self.cache_format % {"scope": self.scope, "ident": ident}
+
+    def allow_request(self, request, view):
+        scope = getattr(view, "throttle_scope", None)
+        if not scope:
+            return True
+        self.scope = scope + self.scope_suffix
+        self.rate = self.get_rate()
+        if self.rate is None:
+            return True
+        self.num_requests, self.duration = self.parse_rate(self.rate)
+
+        self.key = self.get_cache_key(request, view)
+        if self.key is None:
+            return True
+
+        now = self.timer()
+        window, position = divmod(now, self.duration)
+        elapsed = position / self.duration
+        current_key = f"{self.key}:{int(window)}"
+        previous = self.cache.get(f"{self.key}:{int(window) - 1}", 0)
+
+        # Counters outlive their window by one more, for the next estimate
+        self.cache.add(current_key, 0, self.duration * 2)
+        try:
+            current = self.cache.incr(current_key)
+        except ValueError:
+            # Evicted between add and incr
+            self.cache.set(current_key, 1, self.duration * 2)
+            current = 1
+
+        if previous * (1 - elapsed) + current <= self.num_requests:
+            return True
+
+        # Rejected requests do not use up the allowance
+        try:
+            self.cache.decr(current_key)
+        except ValueError:
+            pass
+        self.wait_seconds = self.estimate_wait(previous, current - 1, elapsed)
+        return False
+
+    def estimate_wait(self, previous, current, elapsed):
+        """Seconds until one more request fits in the window."""
+        room = self.num_requests - 1 - current
+        if current < self.num_requests and previous > 0:
+            # Wait for the previous window's weight to decay enough
+            fraction = max(0.0, 1 - room / previous - elapsed)
+            return math.ceil(fraction * self.duration) or 1
+        # The current window alone is full: wait for it to roll over, then
+        # for its own weight to decay in the next window
+        next_window = max(0.0, 1 - (self.num_requests - 1) / max(current, 1))
+        return math.ceil((1 - elapsed + next_window) * self.duration) or 1
+
+    def wait(self):
+        return self.wait_seconds
+
+
+class UserThrottle(SlidingWindowThrottle):
+    """Rate ``<scope>``, per authenticated user (per IP for anonymous requests)."""
+
+    def get_ident_for(self, request):
+        if request.user and request.user.is_authenticated:
+            return f"user-{request.user.pk}"
+        return f"ip-{self.get_ident(request)}"
+
+
+class IPThrottle(SlidingWindowThrottle):
+    """Rate ``<scope>_ip``, per client IP; kept looser since ship terminals share one address."""
+    scope_suffix = "_ip"
+
+    def get_ident_for(self, request):
+        return self.get_ident(request)
+
+
+class UsernameThrottle(SlidingWindowThrottle):
+    """Rate ``<scope>``, per username submitted to a login endpoint."""
+
+    def get_ident_for(self, request):
+        try:
+            username = request.data.get("username")
+        except AttributeError:
+            return None
+        if not isinstance(username, str) or not username.strip():
+            return None
+        return "username-" + username.strip().lower().encode().hex()
@@ -2,6 +2,7 @@ from django.contrib import admin
 from django.urls import path, include
 from django.conf import settings
 from django.conf.urls.static import static
+from .metrics import MetricsAPIView
 
 
 urlpatterns = [
@@ -9,6 +10,8 @@ urlpatterns = [
     path('api/accounts/', include('accounts.urls')),
     path('api/courses/', include('courses.urls')),
     path('api/progress/', include('progress.urls')),
+    path('api/certificates/', include('certificates.urls')),
+    path('api/metrics/', MetricsAPIView.as_view(), name='metrics'),
 ]
 if settings.DEBUG:
     urlpatterns += static(settings.MEDIA_URL, document_root=settings.MEDIA_ROOT)
\ No newline at end of file
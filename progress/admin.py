@@ -1,16 +1,37 @@
 from django.contrib import admin
-from .models import UserCourseProgress, QuizAttempt
+from marine_lms.paginators import EstimatedCountPaginator
+from .models import UserCourseProgress, QuizAttempt, TrainingStatus
 
 
 @admin.register(UserCourseProgress)
 class UserCourseProgressAdmin(admin.ModelAdmin):
     list_display = ("user", "course", "status", "started_at", "completed_at")
-    list_filter = ("status", "course")
+    list_filter = ("status",)
+    list_select_related = ("user__position", "user__ship_type", "course")
+    raw_id_fields = ("user", "course")
     search_fields = ("user__username", "course__title")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
 
 
 @admin.register(QuizAttempt)
 class QuizAttemptAdmin(admin.ModelAdmin):
     list_display = ("user", "quiz", "score", "passed", "attempted_at")
-    list_filter = ("passed", "quiz")
+    list_filter = ("passed",)
+    list_select_related = ("user__position", "user__ship_type", "quiz__module")
+    raw_id_fields = ("user", "quiz")
     search_fields = ("user__username", "quiz__module__title")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
+
+@admin.register(TrainingStatus)
+class TrainingStatusAdmin(admin.ModelAdmin):
+    list_display = ("user", "course", "status", "due_date", "computed_at")
+    list_filter = ("status",)
+    list_select_related = ("user__position", "user__ship_type", "course")
+    raw_id_fields = ("user", "course")
+    search_fields = ("user__username", "course__title")
+    paginator = EstimatedCountPaginator
+    show_full_result_count = False
+
@@ -0,0 +1,130 @@
+import numpy as np
+from .answers import OPTIONS
+from .models import QuizAttempt
+
+NOT_SERVED = -2
+UNANSWERED = -1
+
+# Share of attempts in each of the upper/lower groups for the
+# discrimination index (Kelley's 27% rule).
+DISCRIMINATION_GROUP = 0.27
+
+
+def _answer_matrix(attempts, column_ids):
+    """
+    Build an (attempts x questions) int8 matrix of option codes.
+
+    Cells hold 0-3 for A-D, UNANSWERED when the question was served but
+    left blank, and NOT_SERVED when the attempt never saw the question.
+    """
+    matrix = np.full((len(attempts), len(column_ids)), NOT_SERVED, dtype=np.int8)
+    if not attempts:
+        return matrix
+
+    counts = np.array([len(ids) for ids, _, _ in attempts], dtype=np.int64)
+    total = int(counts.sum())
+    if total == 0:
+        return matrix
+
+    # Every attempt's packed bytes are laid end to end and unpacked in one go.
+    code_bytes = np.frombuffer(b"".join(bytes(codes) for _, codes, _ in attempts), dtype=np.uint8)
+    mask_bytes = np.frombuffer(b"".join(bytes(mask) for _, _, mask in attempts), dtype=np.uint8)
+    codes = ((code_bytes[:, None] >> np.array([6, 4, 2, 0], dtype=np.uint8)) & 0b11).ravel()
+    answered = np.unpackbits(mask_bytes)
+
+    # Position of each question inside its attempt, and where that attempt's
+    # codes/mask start in the unpacked streams (each attempt is byte aligned).
+    first = np.repeat(np.cumsum(counts) - counts, counts)
+    position = np.arange(total) - first
+    code_start = np.repeat(np.cumsum((counts + 3) // 4 * 4) - (counts + 3) // 4 * 4, counts)
+    mask_start = np.repeat(np.cumsum((counts + 7) // 8 * 8) - (counts + 7) // 8 * 8, counts)
+
+    values = np.where(
+        answered[mask_start + position].astype(bool),
+        codes[code_start + position].astype(np.int8),
+        np.int8(UNANSWERED)
+    )
+
+    # Map question ids onto matrix columns, dropping questions since deleted.
+    question_ids = np.fromiter((qid for ids, _, _ in attempts for qid in ids), dtype=np.int64, count=total)
+    rows = np.repeat(np.arange(len(attempts)), counts)
+    column_ids = np.asarray(column_ids, dtype=np.int64)
+    columns = np.searchsorted(column_ids, question_ids)
+    columns = np.minimum(columns, len(column_ids) - 1)
+    known = column_ids[columns] == question_ids
+
+    matrix[rows[known], columns[known]] = values[known]
+    return matrix
+
+
+def question_statistics(quiz):
+    """
+    Per-question difficulty and option analysis over every stored attempt.
+
+    Returns the attempt count and, for each current question, the percent of
+    attempts answering correctly, how often each wrong option was picked and
+    the upper/lower 27% discrimination index.
+    """
+    questions = list(
+        quiz.questions.order_by("id").values("id", "question_text", "correct_answer")
+    )
+    attempts = [
+        (ids, codes, mask)
+        for ids, codes, mask in QuizAttempt.objects
+        .filter(quiz=quiz)
+        .exclude(question_ids=[])
+        .values_list("question_ids", "answers", "answered")
+        .iterator()
+    ]
+    if not questions:
+        return {"attempts": len(attempts), "questions": []}
+
+    column_ids = [q["id"] for q in questions]
+    key = np.array([OPTIONS.index(q["correct_answer"]) for q in questions], dtype=np.int8)
+
+    matrix = _answer_matrix(attempts, column_ids)
+    served = matrix != NOT_SERVED
+    correct = matrix == key
+    served_count = served.sum(axis=0)
+
+    # Rank attempts by the share of their served questions answered correctly.
+    attempt_served = np.maximum(served.sum(axis=1), 1)
+    attempt_score = correct.sum(axis=1) / attempt_served
+    order = np.argsort(attempt_score, kind="stable")
+    group_size = int(np.ceil(len(attempts) * DISCRIMINATION_GROUP))
+    lower, upper = order[:group_size], order[len(order) - group_size:]
+
+    def proportion_correct(rows):
+        seen = served[rows].sum(axis=0)
+        right = correct[rows].sum(axis=0)
+        return np.divide(right, seen, out=np.zeros(len(column_ids)), where=seen > 0)
+
+    discrimination = proportion_correct(upper) - proportion_correct(lower)
+    percent_correct = np.divide(
+        correct.sum(axis=0) * 100, served_count,
+        out=np.zeros(len(column_ids)), where=served_count > 0
+    )
+    option_counts = np.stack([(matrix == code).sum(axis=0) for code in range(len(OPTIONS))])
+    unanswered = (matrix == UNANSWERED).sum(axis=0)
+
+    results = []
+    for index, question in enumerate(questions):
+        total = int(served_count[index])
+        distractors = {}
+        for code, option in enumerate(OPTIONS):
+            if option == question["correct_answer"]:
+                continue
+            distractors[option] = round(option_counts[code, index] * 100 / total, 2) if total else 0
+
+        results.append({
+            "question_id": question["id"],
+            "question_text": question["question_text"],
+            "correct_answer": question["correct_answer"],
+            "times_served": total,
+            "times_unanswered": int(unanswered[index]),
+            "percent_correct": round(float(percent_correct[index]), 2),
+            "distractor_frequency": distractors,
+            "discrimination_index": round(float(discrimination[index]), 3),
+        })
+
+    return {"attempts": len(attempts), "questions": results}
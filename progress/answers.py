@@ -0,0 +1,29 @@
+"""
+Compact storage for quiz answers.
+
+Each attempt keeps the ids of the questions it was graded against (the
+quiz's answer key order) plus two packed byte strings aligned with them:
+
+* ``answers``: 2 bits per question (A=0, B=1, C=2, D=3), four per byte,
+  first question in the most significant bits.
+* ``answered``: 1 bit per question, eight per byte, most significant bit
+  first, set when the learner picked an option at all.
+"""
+
+OPTIONS = ("A", "B", "C", "D")
+
+
+def pack_answers(question_ids, user_answers):
+    """Pack a ``{question_id: "A".."D"}`` mapping for the given question order."""
+    codes = bytearray((len(question_ids) + 3) // 4)
+    answered = bytearray((len(question_ids) + 7) // 8)
+
+    for index, question_id in enumerate(question_ids):
+        option = user_answers.get(str(question_id))
+        if option not in OPTIONS:
+            continue
+        codes[index // 4] |= OPTIONS.index(option) << (6 - 2 * (index % 4))
+        answered[index // 8] |= 0x80 >> (index % 8)
+
+    return bytes(codes), bytes(answered)
+
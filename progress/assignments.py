@@ -0,0 +1,98 @@
+"""
+Maintenance of the materialized CourseAssignment table.
+
+``sync_assignments`` brings the rows for a set of users and/or courses in
+line with the eligibility rule (course ship type == user ship type and the
+user's position among the course positions, neither soft-deleted) using
+two set-based statements: one DELETE of stale rows and one
+INSERT ... SELECT of missing ones. Existing rows, and their due dates, are
+left alone.
+"""
+from datetime import timedelta
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q
+from django.db.models.constants import OnConflict
+from django.utils import timezone
+from courses.models import Course
+from .models import CourseAssignment
+
+User = get_user_model()
+
+
+def sync_assignments(user_ids=None, course_ids=None):
+    """
+    Recompute assignments for ``user_ids`` and/or ``course_ids`` (both None
+    rebuilds the whole table). Returns ``(removed, added)``.
+    """
+    user_ids = None if user_ids is None else list(user_ids)
+    course_ids = None if course_ids is None else list(course_ids)
+    if user_ids == [] or course_ids == []:
+        return 0, 0
+
+    with transaction.atomic():
+        removed = remove_stale(user_ids, course_ids)
+        added = insert_missing(user_ids, course_ids)
+    return removed, added
+
+
+def _scope(user_ids, course_ids, user_field, course_field):
+    scope = Q()
+    if user_ids is not None:
+        scope &= Q(**{f"{user_field}__in": user_ids})
+    if course_ids is not None:
+        scope &= Q(**{f"{course_field}__in": course_ids})
+    return scope
+
+
+def remove_stale(user_ids, course_ids):
+    eligible = Course.positions.through.objects.filter(
+        course_id=OuterRef("course_id"),
+        course__ship_type_id=OuterRef("user__ship_type_id"),
+        course__deleted_at__isnull=True,
+        position_id=OuterRef("user__position_id")
+    )
+    removed, _ = (
+        CourseAssignment.objects
+        .filter(_scope(user_ids, course_ids, "user_id", "course_id"))
+        .filter(Q(user__deleted_at__isnull=False) | ~Exists(eligible))
+        .delete()
+    )
+    return removed
+
+
+def insert_missing(user_ids, course_ids):
+    assignment = CourseAssignment._meta
+    through = Course.positions.through._meta
+    quote = connection.ops.quote_name
+
+    conditions, params = ["u.deleted_at IS NULL", "c.deleted_at IS NULL"], []
+    for column, ids in (("u.id", user_ids), ("c.id", course_ids)):
+        if ids is not None:
+            conditions.append(f"{column} IN ({', '.join(['%s'] * len(ids))})")
+            params += ids
+
+    now = timezone.now()
+    due_date = (now + timedelta(days=settings.ASSIGNMENT_DUE_DAYS)).date()
+    fields = [assignment.get_field(name) for name in ("user", "course")]
+
+    sql = (
+        f"{connection.ops.insert_statement(on_conflict=OnConflict.IGNORE)} {quote(assignment.db_table)} "
+        f"({quote('user_id')}, {quote('course_id')}, {quote('assigned_at')}, {quote('due_date')}) "
+        f"SELECT u.id, c.id, %s, %s "
+        f"FROM {quote(User._meta.db_table)} u "
+        f"JOIN {quote(through.db_table)} cp ON cp.{quote('position_id')} = u.{quote('position_id')} "
+        f"JOIN {quote(Course._meta.db_table)} c ON c.id = cp.{quote('course_id')} "
+        f"AND c.{quote('ship_type_id')} = u.{quote('ship_type_id')} "
+        f"WHERE {' AND '.join(conditions)} "
+        f"{connection.ops.on_conflict_suffix_sql(fields, OnConflict.IGNORE, None, None) or ''}"
+    )
+    params = [
+        connection.ops.adapt_datetimefield_value(now),
+        connection.ops.adapt_datefield_value(due_date),
+    ] + params
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return max(cursor.rowcount, 0)
@@ -0,0 +1,38 @@
+"""
+Signed attempt tokens for drawn quizzes.
+
+The token carries the user, the quiz, the question ids that were served and
+the course snapshot they were drawn from (None for an unpublished course),
+so grading can use exactly those questions and answer keys without storing
+a session row.
+"""
+from django.conf import settings
+from django.core import signing
+
+ATTEMPT_TOKEN_SALT = "progress.quiz-attempt"
+
+
+def make_attempt_token(user_id, quiz_id, question_ids, snapshot=None):
+    return signing.dumps(
+        {"u": user_id, "q": quiz_id, "ids": question_ids, "s": snapshot},
+        salt=ATTEMPT_TOKEN_SALT,
+        compress=True
+    )
+
+
+def read_attempt_token(token, user_id, quiz_id):
+    """
+    ``(served question ids, snapshot version)``, or None if the token is
+    invalid, expired or not for this user/quiz.
+    """
+    try:
+        data = signing.loads(
+            token,
+            salt=ATTEMPT_TOKEN_SALT,
+            max_age=settings.QUIZ_ATTEMPT_TOKEN_MAX_AGE
+        )
+    except signing.BadSignature:
+        return None
+    if data.get("u") != user_id or data.get("q") != quiz_id:
+        return None
+    return data.get("ids"), data.get("s")
@@ -0,0 +1,13 @@
+"""
+Cached compliance matrix (see ComplianceMatrixAPIView).
+
+Row-level changes drop it through progress.signals; bulk writers, which
+send no signals, call ``invalidate_compliance_matrix`` themselves.
+"""
+from django.core.cache import cache
+
+COMPLIANCE_MATRIX_CACHE_KEY = "progress:compliance-matrix"
+
+
+def invalidate_compliance_matrix():
+    cache.delete(COMPLIANCE_MATRIX_CACHE_KEY)
@@ -0,0 +1,257 @@
+"""
+Coalesced video-watch heartbeats.
+
+Heartbeats only touch the cache: one entry per (user, module) holding the
+furthest position watched, plus a pointer under an incrementing sequence
+number the first time the entry appears. ``flush_heartbeats`` drains the
+pointers written since the last flush and applies all of them to
+UserModuleProgress / UserCourseProgress with a handful of bulk statements.
+
+Entries are never deleted by a flush (they expire after WATCH_CACHE_TIMEOUT),
+so a heartbeat that lands while a flush is running is not lost: its entry
+keeps the furthest position, and the flush re-registers entries that changed
+after they were read. If a pointer is lost (eviction, a non-atomic ``incr``
+on the file cache), the entry's sequence number falls behind the flushed
+mark and the next heartbeat for it registers a new pointer.
+
+Positions and durations come from the client, so neither is trusted as
+sent: the video's duration is fixed by the first heartbeat (and kept on
+UserModuleProgress once flushed), the first heartbeat of a session only
+credits what was already recorded, and each later one may advance the
+position by at most WATCH_MAX_PLAYBACK_RATE times the wall time since the
+previous heartbeat.
+
+The cache must be shared by every worker and by ``manage.py
+flush_watch_progress`` (see CACHE_BACKEND); with the per-process locmem
+cache each worker only ever flushes its own heartbeats.
+"""
+import time
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Q
+from django.utils import timezone
+from certificates.generation import queue_certificates
+from courses.models import Course, Module, Quiz
+from .compliance import invalidate_compliance_matrix
+from .models import CourseAssignment, UserCourseProgress, UserModuleProgress
+
+SEQUENCE_KEY = "watch:seq"
+FLUSHED_KEY = "watch:flushed"
+FLUSH_LOCK_KEY = "watch:flush-lock"
+FLUSH_DUE_KEY = "watch:flush-due"
+
+
+def _entry_key(user_id, module_id):
+    return f"watch:{user_id}:{module_id}"
+
+
+def _pointer_key(sequence):
+    return f"watch:pending:{sequence}"
+
+
+def _register(user_id, module_id):
+    cache.add(SEQUENCE_KEY, 0, None)
+    sequence = cache.incr(SEQUENCE_KEY)
+    cache.set(_pointer_key(sequence), (user_id, module_id), settings.WATCH_CACHE_TIMEOUT)
+    return sequence
+
+
+def record_heartbeat(user_id, module_id, position, duration, watched=0, stored_duration=0):
+    """
+    Coalesce one heartbeat; ``watched`` and ``stored_duration`` are the
+    UserModuleProgress values already in the database. Returns the credited
+    position and the duration in use.
+    """
+    key = _entry_key(user_id, module_id)
+    current = cache.get_many([key, FLUSHED_KEY])
+    entry = current.get(key)
+    flushed = current.get(FLUSHED_KEY, 0)
+    now = time.time()
+
+    if entry is None:
+        duration = stored_duration or duration
+        # Nothing to measure the jump against yet
+        position = min(position, watched)
+    else:
+        duration = entry["duration"]
+        limit = entry["position"] + (now - entry["at"]) * settings.WATCH_MAX_PLAYBACK_RATE
+        position = max(entry["position"], min(position, int(limit)))
+    position = min(position, duration)
+
+    if entry is None or entry["seq"] <= flushed:
+        sequence = _register(user_id, module_id)
+    else:
+        sequence = entry["seq"]
+
+    cache.set(
+        key,
+        {"position": position, "duration": duration, "seq": sequence, "at": now},
+        settings.WATCH_CACHE_TIMEOUT
+    )
+    return position, duration
+
+
+def maybe_flush():
+    """Flush at most once per WATCH_FLUSH_INTERVAL across all workers."""
+    if cache.add(FLUSH_DUE_KEY, 1, settings.WATCH_FLUSH_INTERVAL):
+        return flush_heartbeats()
+    return 0
+
+
+def flush_heartbeats():
+    if not cache.add(FLUSH_LOCK_KEY, 1, 60):
+        return 0
+
+    try:
+        start = cache.get(FLUSHED_KEY, 0)
+        end = cache.get(SEQUENCE_KEY, 0)
+        if end <= start:
+            return 0
+
+        pointer_keys = [_pointer_key(sequence) for sequence in range(start + 1, end + 1)]
+        pairs = set(cache.get_many(pointer_keys).values())
+        entry_keys = {_entry_key(user_id, module_id): (user_id, module_id) for user_id, module_id in pairs}
+        entries = {
+            entry_keys[key]: entry
+            for key, entry in cache.get_many(list(entry_keys)).items()
+        }
+
+        with transaction.atomic():
+            apply_heartbeats(entries)
+
+        cache.set(FLUSHED_KEY, end, None)
+        cache.delete_many(pointer_keys)
+
+        # Heartbeats recorded since the entries were read kept their old
+        # sequence number, which is now flushed: register them again.
+        for key, entry in cache.get_many(list(entry_keys)).items():
+            pair = entry_keys[key]
+            if entry != entries.get(pair) and entry["seq"] <= end:
+                entry["seq"] = _register(*pair)
+                cache.set(key, entry, settings.WATCH_CACHE_TIMEOUT)
+        return len(entries)
+    finally:
+        cache.delete(FLUSH_LOCK_KEY)
+
+
+def apply_heartbeats(entries):
+    """Write ``{(user_id, module_id): entry}`` to the progress tables in bulk."""
+    if not entries:
+        return
+
+    user_ids = {user_id for user_id, _ in entries}
+    module_ids = {module_id for _, module_id in entries}
+
+    modules = {
+        row["id"]: row
+        for row in Module.objects
+        .filter(id__in=module_ids, course__deleted_at__isnull=True)
+        .exclude(Q(video="") | Q(video__isnull=True), Q(video_url="") | Q(video_url__isnull=True))
+        .annotate(has_quiz=Exists(Quiz.objects.filter(module=OuterRef("pk"))))
+        .values("id", "course_id", "has_quiz")
+    }
+    assigned = set(
+        CourseAssignment.objects
+        .filter(user_id__in=user_ids, course_id__in={module["course_id"] for module in modules.values()})
+        .values_list("user_id", "course_id")
+    )
+    existing = {
+        (progress.user_id, progress.module_id): progress
+        for progress in UserModuleProgress.objects.filter(user_id__in=user_ids, module_id__in=modules)
+    }
+
+    now = timezone.now()
+    threshold = settings.WATCH_COMPLETION_THRESHOLD
+    to_create, to_update, touched_courses = [], [], set()
+
+    for (user_id, module_id), entry in entries.items():
+        module = modules.get(module_id)
+        if module is None or (user_id, module["course_id"]) not in assigned:
+            continue
+        touched_courses.add((user_id, module["course_id"]))
+
+        progress = existing.get((user_id, module_id))
+        duration = (progress and progress.video_duration) or entry["duration"]
+        # Modules with a quiz are still completed by passing the quiz.
+        watched_enough = (
+            not module["has_quiz"]
+            and duration > 0
+            and entry["position"] >= duration * threshold
+        )
+
+        if progress is None:
+            to_create.append(UserModuleProgress(
+                user_id=user_id, module_id=module_id,
+                watched_seconds=entry["position"],
+                video_duration=duration,
+                completed=watched_enough,
+                completed_at=now if watched_enough else None
+            ))
+            continue
+
+        progress.watched_seconds = max(progress.watched_seconds, entry["position"])
+        progress.video_duration = duration
+        if watched_enough and not progress.completed:
+            progress.completed = True
+            progress.completed_at = now
+        to_update.append(progress)
+
+    UserModuleProgress.objects.bulk_create(to_create, ignore_conflicts=True)
+    UserModuleProgress.objects.bulk_update(
+        to_update, ["watched_seconds", "video_duration", "completed", "completed_at"]
+    )
+
+    update_course_progress(touched_courses, now)
+
+
+def update_course_progress(pairs, now):
+    """Start (or complete) course progress for the touched (user, course) pairs."""
+    if not pairs:
+        return
+
+    user_ids = {user_id for user_id, _ in pairs}
+    course_ids = {course_id for _, course_id in pairs}
+
+    totals = dict(Course.all_objects.filter(id__in=course_ids).values_list("id", "modules_count"))
+    completed = {
+        (row["user_id"], row["module__course_id"]): row["n"]
+        for row in UserModuleProgress.objects
+        .filter(user_id__in=user_ids, module__course_id__in=course_ids, completed=True)
+        .values("user_id", "module__course_id").annotate(n=Count("id"))
+    }
+    existing = {
+        (progress.user_id, progress.course_id): progress
+        for progress in UserCourseProgress.objects.filter(user_id__in=user_ids, course_id__in=course_ids)
+    }
+
+    to_create, to_update, completions = [], [], []
+    for pair in pairs:
+        done = totals.get(pair[1], 0) > 0 and completed.get(pair, 0) == totals[pair[1]]
+        progress = existing.get(pair)
+        if progress is None:
+            to_create.append(UserCourseProgress(
+                user_id=pair[0], course_id=pair[1],
+                status="completed" if done else "in_progress",
+                completed_at=now if done else None
+            ))
+            if done:
+                completions.append((*pair, now))
+        elif done and progress.status != "completed":
+            progress.status = "completed"
+            progress.completed_at = now
+            to_update.append(progress)
+            completions.append((*pair, now))
+        elif progress.status == "not_started":
+            progress.status = "in_progress"
+            to_update.append(progress)
+
+    UserCourseProgress.objects.bulk_create(to_create)
+    UserCourseProgress.objects.bulk_update(to_update, ["status", "completed_at"])
+
+    # Bulk writes send no post_save: do what progress.signals and
+    # certificates.signals would have done
+    if completions:
+        queue_certificates(completions)
+    if to_create or to_update:
+        invalidate_compliance_matrix()
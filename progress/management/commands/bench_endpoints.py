@@ -0,0 +1,213 @@
+import json
+import statistics
+import subprocess
+import time
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import get_resolver, reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+from courses.models import Course, Module, Quiz, Question
+from accounts.models import Position, ShipType
+from progress.models import UserCourseProgress
+
+User = get_user_model()
+
+BENCHMARKED_URLCONFS = ("api/accounts/", "api/courses/", "api/progress/", "api/certificates/")
+# Routes the POST-only attempt view under a pk it does not take; submitting
+# is benchmarked through quizattempt-list-create
+NOT_BENCHMARKED = {"quizattempt-detail"}
+
+
+class Command(BaseCommand):
+    help = (
+        "Exercise every accounts, courses, progress and certificates URL against the current "
+        "database and report p50/p95 latency, query count and response size. "
+        "Writes are rolled back. Seed data first with `seed_fleet`."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--iterations", type=int, default=20)
+        parser.add_argument("--password", default="fleet-password", help="Crew password used for the login endpoint.")
+        parser.add_argument("--prefix", default="fleet", help="The seed_fleet --prefix whose users to benchmark as.")
+        parser.add_argument("--output", help="Write the results as JSON to this file.")
+        parser.add_argument("--compare", help="Earlier JSON results to print deltas against.")
+
+    def handle(self, *args, **options):
+        # The seeded users, whose password is known, so logins measure success
+        prefix = options["prefix"]
+        admin = User.objects.filter(username=f"{prefix}-admin", is_staff=True).first()
+        learner = (
+            User.objects.filter(
+                username__startswith=f"{prefix}-crew-", role="employee", usercourseprogress__isnull=False
+            )
+            .order_by("id").first()
+        )
+        if not admin or not learner:
+            raise CommandError(f"No seeded {prefix}-admin or {prefix}-crew-* user with progress; run seed_fleet first.")
+        if not learner.check_password(options["password"]):
+            raise CommandError(f"{learner.username} does not have the given --password.")
+
+        cases = self.cases(admin, learner, options["password"])
+        self.check_coverage(cases)
+
+        results = {}
+        # Unthrottled, so repeated iterations measure the endpoints rather than 429s
+        unthrottled = {**settings.REST_FRAMEWORK, "DEFAULT_THROTTLE_RATES": {}}
+        with transaction.atomic(), override_settings(REST_FRAMEWORK=unthrottled):
+            for name, method, url, user, payload in cases:
+                results[name] = self.measure(method, url, user, payload, options["iterations"])
+                self.report(name, results[name])
+            transaction.set_rollback(True)
+
+        output = {
+            "commit": self.current_commit(),
+            "database": connection.vendor,
+            "iterations": options["iterations"],
+            "created_at": timezone.now().isoformat(),
+            "results": results,
+        }
+        if options["output"]:
+            with open(options["output"], "w") as fh:
+                json.dump(output, fh, indent=2)
+            self.stdout.write(f"Wrote {options['output']}")
+
+        if options["compare"]:
+            with open(options["compare"]) as fh:
+                self.compare(json.load(fh)["results"], results)
+
+    def cases(self, admin, learner, password):
+        """(url name, method, url, user, payload) for every benchmarked URL."""
+        progress = UserCourseProgress.objects.filter(user=learner).order_by("id").first()
+        course = Course.objects.get(id=progress.course_id)
+        module = Module.objects.filter(course=course).order_by("id").first()
+        quiz = Quiz.objects.filter(module__course=course).order_by("id").first()
+        question = Question.objects.filter(quiz=quiz).order_by("id").first()
+        answers = {str(q.id): q.correct_answer for q in quiz.questions.all()} if quiz else {}
+        refresh = str(RefreshToken.for_user(learner))
+        new_question = {
+            "quiz": quiz.id, "question_text": "Benchmark question",
+            "option_a": "A", "option_b": "B", "option_c": "C", "option_d": "D", "correct_answer": "A",
+        }
+
+        return [
+            # accounts
+            ("token_obtain_pair", "post", reverse("token_obtain_pair"), None,
+             {"username": learner.username, "password": password}),
+            ("token_refresh", "post", reverse("token_refresh"), None, {"refresh": refresh}),
+            ("admin-dashboard", "get", reverse("admin-dashboard"), admin, None),
+            ("learner-dashboard", "get", reverse("learner-dashboard"), learner, None),
+            ("position-list-create", "get", reverse("position-list-create"), admin, None),
+            ("position-detail", "get", reverse("position-detail", args=[learner.position_id or Position.objects.first().id]), admin, None),
+            ("shiptype-list-create", "get", reverse("shiptype-list-create"), admin, None),
+            ("shiptype-detail", "get", reverse("shiptype-detail", args=[learner.ship_type_id or ShipType.objects.first().id]), admin, None),
+            ("user-list-create", "get", reverse("user-list-create"), admin, None),
+            ("user-detail", "get", reverse("user-detail", args=[learner.id]), admin, None),
+            ("user-profile", "get", reverse("user-profile"), learner, None),
+            # courses
+            ("course-list-create", "get", reverse("course-list-create"), learner, None),
+            ("course-detail", "get", reverse("course-detail", args=[course.id]), learner, None),
+            ("course-publish", "post", reverse("course-publish", args=[course.id]), admin, None),
+            ("course-clone", "post", reverse("course-clone", args=[course.id]), admin,
+             {"ship_types": list(ShipType.objects.values_list("id", flat=True)[:3])}),
+            ("learner-course-detail", "get", reverse("learner-course-detail", args=[course.id]), learner, None),
+            ("module-list-create", "get", reverse("module-list-create") + f"?course={course.id}", admin, None),
+            ("module-detail", "get", reverse("module-detail", args=[module.id]), admin, None),
+            ("quiz-list-create", "get", reverse("quiz-list-create") + f"?course={course.id}", admin, None),
+            ("quiz-detail", "get", reverse("quiz-detail", args=[quiz.id]), admin, None),
+            ("module-bulk", "patch", reverse("module-bulk"), admin, [{"id": module.id, "title": module.title}]),
+            ("quiz-bulk", "patch", reverse("quiz-bulk"), admin, [{"id": quiz.id, "draw_size": quiz.draw_size}]),
+            ("learner-quiz", "get", reverse("learner-quiz", args=[quiz.id]), learner, None),
+            ("question-list-create", "get", reverse("question-list-create"), admin, None),
+            ("question-detail", "get", reverse("question-detail", args=[question.id]), admin, None),
+            ("question-bulk", "post", reverse("question-bulk"), admin, [new_question] * 50),
+            ("question-import", "post", reverse("question-import"), admin, {"quiz": quiz.id, "questions": [new_question] * 50}),
+            ("course-search", "get", reverse("course-search") + "?q=course", learner, None),
+            # progress
+            ("usercourseprogress-list-create", "get", reverse("usercourseprogress-list-create"), admin, None),
+            ("usercourseprogress-detail", "get", reverse("usercourseprogress-detail", args=[progress.id]), admin, None),
+            ("quizattempt-list-create", "post", reverse("quizattempt-list-create"), learner,
+             {"quiz": quiz.id, "answers": answers}),
+            ("quizattempt-draw", "get", reverse("quizattempt-draw", args=[quiz.id]), learner, None),
+            ("quizattempt-analytics", "get", reverse("quizattempt-analytics", args=[quiz.id]), admin, None),
+            ("course-progress", "get", reverse("course-progress", args=[course.id]), learner, None),
+            ("course-progress-batch", "get", reverse("course-progress-batch"), learner, None),
+            ("watch-heartbeat", "post", reverse("watch-heartbeat"), learner,
+             {"module": module.id, "position": 30, "duration": 600}),
+            ("compliance-matrix", "get", reverse("compliance-matrix"), admin, None),
+            ("training-status", "get", reverse("training-status") + "?status=overdue", admin, None),
+            # certificates
+            ("certificate-download", "get", reverse("certificate-download", args=[course.id]), learner, None),
+        ]
+
+    def check_coverage(self, cases):
+        covered = {name for name, *_ in cases} | NOT_BENCHMARKED
+        missing = []
+        for pattern in get_resolver().url_patterns:
+            if str(pattern.pattern) not in BENCHMARKED_URLCONFS:
+                continue
+            missing += [p.name for p in pattern.url_patterns if p.name not in covered]
+        if missing:
+            self.stderr.write(self.style.WARNING(f"Not benchmarked: {', '.join(sorted(set(missing)))}"))
+
+    def measure(self, method, url, user, payload, iterations):
+        client = APIClient()
+        if user is not None:
+            client.credentials(HTTP_AUTHORIZATION=f"Bearer {RefreshToken.for_user(user).access_token}")
+
+        timings, queries, size, status_code = [], 0, 0, None
+        for _ in range(iterations):
+            with CaptureQueriesContext(connection) as captured:
+                start = time.perf_counter()
+                response = getattr(client, method)(url, payload, format="json")
+                content = (
+                    b"".join(response.streaming_content)
+                    if response.streaming else response.content
+                )
+                timings.append((time.perf_counter() - start) * 1000)
+            queries, size, status_code = len(captured), len(content), response.status_code
+
+        timings.sort()
+        return {
+            "method": method.upper(),
+            "url": url,
+            "status": status_code,
+            "p50_ms": round(statistics.median(timings), 2),
+            "p95_ms": round(timings[min(len(timings) - 1, int(len(timings) * 0.95))], 2),
+            "queries": queries,
+            "bytes": size,
+        }
+
+    def report(self, name, result):
+        self.stdout.write(
+            f"{name:<32} {result['method']:<5} {result['status']:<4} "
+            f"p50={result['p50_ms']:8.2f}ms p95={result['p95_ms']:8.2f}ms "
+            f"queries={result['queries']:<5} bytes={result['bytes']}"
+        )
+
+    def compare(self, baseline, results):
+        self.stdout.write("\nChange against baseline (p50 / queries / bytes):")
+        for name, result in results.items():
+            before = baseline.get(name)
+            if not before:
+                self.stdout.write(f"{name:<32} new")
+                continue
+            change = (result["p50_ms"] - before["p50_ms"]) / before["p50_ms"] * 100 if before["p50_ms"] else 0
+            self.stdout.write(
+                f"{name:<32} {change:+7.1f}% "
+                f"{result['queries'] - before['queries']:+5d} "
+                f"{result['bytes'] - before['bytes']:+9d}"
+            )
+
+    def current_commit(self):
+        try:
+            return subprocess.run(
+                ["git", "rev-parse", "--short", "HEAD"],
+                capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
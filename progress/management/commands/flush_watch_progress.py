@@ -0,0 +1,21 @@
+from django.core.cache import caches
+from django.core.cache.backends.locmem import LocMemCache
+from django.core.management.base import BaseCommand, CommandError
+from progress.heartbeats import flush_heartbeats
+
+
+class Command(BaseCommand):
+    help = (
+        "Write coalesced video-watch heartbeats from the cache to module and "
+        "course progress. Heartbeat requests also flush on their own every "
+        "WATCH_FLUSH_INTERVAL seconds; run this from cron to cover idle periods."
+    )
+
+    def handle(self, *args, **options):
+        if isinstance(caches["default"], LocMemCache):
+            raise CommandError(
+                "The cache is local to each process, so this command cannot see the "
+                "workers' heartbeats. Configure a shared CACHE_BACKEND."
+            )
+        flushed = flush_heartbeats()
+        self.stdout.write(self.style.SUCCESS(f"Flushed {flushed} watch progress entries."))
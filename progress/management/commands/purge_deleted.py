@@ -0,0 +1,91 @@
+import time
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from certificates.models import Certificate
+from courses.cache import defer_invalidation
+from courses.models import Course, CourseSnapshot, Module, ModuleFile, Quiz, Question
+from progress.models import (
+    CourseAssignment, QuizAttempt, TrainingStatus, UserCourseProgress, UserModuleProgress
+)
+
+User = get_user_model()
+
+
+class Command(BaseCommand):
+    help = (
+        "Permanently remove soft-deleted courses and users. Dependent rows are "
+        "deleted bottom-up in small, separately committed chunks so no single "
+        "transaction loads or locks a whole course or user history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--chunk-size", type=int, default=1000)
+        parser.add_argument("--older-than-hours", type=int, default=0,
+                            help="Only purge rows soft-deleted at least this long ago.")
+        parser.add_argument("--sleep", type=float, default=0.0,
+                            help="Seconds to pause between chunks to spread the load.")
+
+    def handle(self, *args, **options):
+        self.chunk_size = options["chunk_size"]
+        self.sleep = options["sleep"]
+        cutoff = timezone.now() - timedelta(hours=options["older_than_hours"])
+
+        course_ids = list(
+            Course.all_objects.filter(deleted_at__lte=cutoff).values_list("id", flat=True)
+        )
+        for course_id in course_ids:
+            removed = self.purge(
+                Question.objects.filter(quiz__module__course_id=course_id),
+                QuizAttempt.objects.filter(quiz__module__course_id=course_id),
+                UserModuleProgress.objects.filter(module__course_id=course_id),
+                Quiz.objects.filter(module__course_id=course_id),
+                ModuleFile.objects.filter(module__course_id=course_id),
+                Module.objects.filter(course_id=course_id),
+                UserCourseProgress.objects.filter(course_id=course_id),
+                CourseAssignment.objects.filter(course_id=course_id),
+                Certificate.objects.filter(course_id=course_id),
+                TrainingStatus.objects.filter(course_id=course_id),
+                CourseSnapshot.objects.filter(course_id=course_id),
+                Course.positions.through.objects.filter(course_id=course_id),
+                Course.all_objects.filter(id=course_id),
+            )
+            self.stdout.write(f"Course {course_id}: {removed} rows removed")
+
+        user_ids = list(
+            User.all_objects.filter(deleted_at__lte=cutoff).values_list("id", flat=True)
+        )
+        for user_id in user_ids:
+            removed = self.purge(
+                QuizAttempt.objects.filter(user_id=user_id),
+                UserModuleProgress.objects.filter(user_id=user_id),
+                UserCourseProgress.objects.filter(user_id=user_id),
+                CourseAssignment.objects.filter(user_id=user_id),
+                Certificate.objects.filter(user_id=user_id),
+                TrainingStatus.objects.filter(user_id=user_id),
+                User.all_objects.filter(id=user_id),
+            )
+            self.stdout.write(f"User {user_id}: {removed} rows removed")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Purged {len(course_ids)} courses and {len(user_ids)} users."
+        ))
+
+    def purge(self, *querysets):
+        """Delete each queryset in pk chunks, in order (children first)."""
+        removed = 0
+        for queryset in querysets:
+            model = queryset.model
+            while True:
+                ids = list(queryset.order_by("pk").values_list("pk", flat=True)[:self.chunk_size])
+                if not ids:
+                    break
+                # Per-row cache signals are pointless for content nobody can see
+                with transaction.atomic(), defer_invalidation():
+                    model._base_manager.filter(pk__in=ids).delete()
+                removed += len(ids)
+                if self.sleep:
+                    time.sleep(self.sleep)
+        return removed
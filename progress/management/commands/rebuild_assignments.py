@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from progress.assignments import sync_assignments
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the CourseAssignment table from ship types and positions. "
+        "Signals keep it current; run this after bulk imports or raw SQL edits "
+        "that bypass them."
+    )
+
+    def handle(self, *args, **options):
+        removed, added = sync_assignments()
+        self.stdout.write(self.style.SUCCESS(f"Removed {removed} stale and added {added} assignments."))
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+from courses.models import Course
+from progress.recompute import recompute_course_progress
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute UserCourseProgress.status from module completion with grouped "
+        "UPDATEs, for the given courses or every course."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("course_ids", nargs="*", type=int)
+
+    def handle(self, *args, **options):
+        course_ids = options["course_ids"] or Course.objects.values_list("id", flat=True)
+        reopened, completed = recompute_course_progress(course_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f"{reopened} progress rows reopened, {completed} completed."
+        ))
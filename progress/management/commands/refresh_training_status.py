@@ -0,0 +1,15 @@
+from django.core.management.base import BaseCommand
+from progress.training import refresh_training_status
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the TrainingStatus summary (overdue, expiring soon and never "
+        "started training across the fleet). Meant to run nightly."
+    )
+
+    def handle(self, *args, **options):
+        counts = refresh_training_status()
+        for status, rows in counts.items():
+            self.stdout.write(f"{status}: {rows}")
+        self.stdout.write(self.style.SUCCESS(f"Recorded {sum(counts.values())} training statuses."))
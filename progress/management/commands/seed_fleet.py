@@ -0,0 +1,207 @@
+import random
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.contrib.auth.hashers import make_password
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+from accounts.models import Position, ShipType
+from courses.models import Course, Module, ModuleFile, Quiz, Question
+from progress.answers import OPTIONS, pack_answers
+from progress.assignments import sync_assignments
+from progress.models import QuizAttempt, UserCourseProgress, UserModuleProgress
+
+User = get_user_model()
+
+BATCH_SIZE = 1000
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic fleet: ship types, positions, courses with modules, "
+        "files, quizzes and questions, crew members and their attempt history."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--ship-types", type=int, default=5)
+        parser.add_argument("--positions", type=int, default=8)
+        parser.add_argument("--courses", type=int, default=40, help="Courses per ship type.")
+        parser.add_argument("--modules", type=int, default=6, help="Modules per course.")
+        parser.add_argument("--files", type=int, default=2, help="Files per module.")
+        parser.add_argument("--questions", type=int, default=10, help="Questions per quiz.")
+        parser.add_argument("--users", type=int, default=2000)
+        parser.add_argument("--attempts", type=int, default=3, help="Maximum attempts per started module.")
+        parser.add_argument("--password", default="fleet-password")
+        parser.add_argument("--prefix", default="fleet", help="Prefix for generated names, so runs can coexist.")
+        parser.add_argument("--seed", type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options["seed"])
+        prefix = options["prefix"]
+
+        with transaction.atomic():
+            ship_types = ShipType.objects.bulk_create([
+                ShipType(name=f"{prefix} ship type {i}") for i in range(options["ship_types"])
+            ])
+            positions = Position.objects.bulk_create([
+                Position(name=f"{prefix} position {i}") for i in range(options["positions"])
+            ])
+
+            courses = self.seed_courses(rng, prefix, ship_types, positions, options)
+            users = self.seed_users(rng, prefix, ship_types, positions, options)
+            # bulk_create skips the signals that maintain CourseAssignment
+            sync_assignments(course_ids=[course.id for course in courses])
+            attempts = self.seed_history(rng, users, courses, options)
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Seeded {len(ship_types)} ship types, {len(positions)} positions, "
+            f"{len(courses)} courses, {len(users)} users and {attempts} quiz attempts "
+            f"(admin login: {prefix}-admin / {options['password']})"
+        ))
+
+    def seed_courses(self, rng, prefix, ship_types, positions, options):
+        courses = Course.objects.bulk_create([
+            Course(
+                title=f"{prefix} {ship_type.name} course {i}",
+                description=f"Synthetic training course {i} for {ship_type.name}",
+                ship_type=ship_type,
+                modules_count=options["modules"]
+            )
+            for ship_type in ship_types
+            for i in range(options["courses"])
+        ], batch_size=BATCH_SIZE)
+
+        Course.positions.through.objects.bulk_create([
+            Course.positions.through(course_id=course.id, position_id=position.id)
+            for course in courses
+            for position in rng.sample(positions, rng.randint(1, max(1, len(positions) // 2)))
+        ], batch_size=BATCH_SIZE)
+
+        modules = Module.objects.bulk_create([
+            Module(
+                course=course,
+                title=f"Module {i + 1}",
+                description="Synthetic module",
+                video_url=f"https://videos.example.com/{course.id}/{i + 1}.mp4"
+            )
+            for course in courses
+            for i in range(options["modules"])
+        ], batch_size=BATCH_SIZE)
+
+        ModuleFile.objects.bulk_create([
+            ModuleFile(module=module, file=f"modules/files/{prefix}-{module.id}-{i}.pdf")
+            for module in modules
+            for i in range(options["files"])
+        ], batch_size=BATCH_SIZE)
+
+        quizzes = Quiz.objects.bulk_create(
+            [Quiz(module=module, questions_count=options["questions"]) for module in modules],
+            batch_size=BATCH_SIZE
+        )
+        Question.objects.bulk_create([
+            Question(
+                quiz=quiz,
+                question_text=f"Question {i + 1} of quiz {quiz.id}",
+                option_a="Option A", option_b="Option B", option_c="Option C", option_d="Option D",
+                correct_answer=rng.choice(OPTIONS)
+            )
+            for quiz in quizzes
+            for i in range(options["questions"])
+        ], batch_size=BATCH_SIZE)
+
+        return courses
+
+    def seed_users(self, rng, prefix, ship_types, positions, options):
+        password = make_password(options["password"])
+        User.objects.create(
+            username=f"{prefix}-admin", email=f"{prefix}-admin@example.com",
+            password=password, role="admin", is_staff=True, is_superuser=True
+        )
+        return User.objects.bulk_create([
+            User(
+                username=f"{prefix}-crew-{i}",
+                email=f"{prefix}-crew-{i}@example.com",
+                password=password,
+                role="employee",
+                ship_type=rng.choice(ship_types),
+                position=rng.choice(positions),
+                phone_number=f"+1555{i:07d}"
+            )
+            for i in range(options["users"])
+        ], batch_size=BATCH_SIZE)
+
+    def seed_history(self, rng, users, courses, options):
+        """Give each crew member a mix of untouched, started and finished courses."""
+        eligible = {}
+        for course_id, ship_type_id, position_id in (
+            Course.objects.filter(id__in=[course.id for course in courses])
+            .values_list("id", "ship_type_id", "positions")
+        ):
+            eligible.setdefault((ship_type_id, position_id), []).append(course_id)
+
+        quizzes = {}
+        for quiz_id, module_id, course_id in Quiz.objects.filter(
+            module__course__in=courses
+        ).values_list("id", "module_id", "module__course_id"):
+            quizzes.setdefault(course_id, []).append((quiz_id, module_id))
+
+        answer_keys = {}
+        for quiz_id, question_id, correct in Question.objects.filter(
+            quiz__module__course__in=courses
+        ).order_by("id").values_list("quiz_id", "id", "correct_answer"):
+            answer_keys.setdefault(quiz_id, []).append((question_id, correct))
+
+        now = timezone.now()
+        course_progress, module_progress, attempts = [], [], []
+
+        for user in users:
+            for course_id in eligible.get((user.ship_type_id, user.position_id), []):
+                state = rng.random()
+                if state < 0.3:
+                    continue
+
+                course_modules = quizzes.get(course_id, [])
+                done = len(course_modules) if state > 0.7 else rng.randint(0, len(course_modules))
+
+                for index, (quiz_id, module_id) in enumerate(course_modules[:max(done, 1)]):
+                    passed_module = index < done
+                    tries = rng.randint(1, options["attempts"])
+                    for attempt in range(tries):
+                        last = attempt == tries - 1
+                        passed = passed_module and (last or rng.random() < 0.6)
+                        attempts.append(self.attempt(rng, user, quiz_id, answer_keys.get(quiz_id, []), passed))
+                        if passed:
+                            break
+                    module_progress.append(UserModuleProgress(
+                        user=user, module_id=module_id, completed=passed_module,
+                        completed_at=now if passed_module else None
+                    ))
+
+                completed = bool(course_modules) and done == len(course_modules)
+                course_progress.append(UserCourseProgress(
+                    user=user, course_id=course_id,
+                    status="completed" if completed else "in_progress",
+                    completed_at=now - timedelta(days=rng.randint(0, 720)) if completed else None
+                ))
+
+        UserCourseProgress.objects.bulk_create(course_progress, batch_size=BATCH_SIZE)
+        UserModuleProgress.objects.bulk_create(module_progress, batch_size=BATCH_SIZE)
+        QuizAttempt.objects.bulk_create(attempts, batch_size=BATCH_SIZE)
+        return len(attempts)
+
+    def attempt(self, rng, user, quiz_id, answer_key, passed):
+        answers = {}
+        for question_id, correct in answer_key:
+            if passed or rng.random() < 0.7:
+                answers[str(question_id)] = correct
+            elif rng.random() < 0.9:
+                answers[str(question_id)] = rng.choice(OPTIONS)
+
+        question_ids = [question_id for question_id, _ in answer_key]
+        packed, answered = pack_answers(question_ids, answers)
+        score = sum(answers.get(str(question_id)) == correct for question_id, correct in answer_key)
+        return QuizAttempt(
+            user=user, quiz_id=quiz_id,
+            score=score, passed=score == len(answer_key),
+            question_ids=question_ids, answers=packed, answered=answered
+        )
@@ -0,0 +1,48 @@
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.core.management.base import BaseCommand
+from progress.models import TrainingStatus
+from progress.training import training_digests
+
+BATCH_SIZE = 100
+
+
+class Command(BaseCommand):
+    help = (
+        "Email every crew member their overdue, expiring and never-started "
+        "training, as recorded by the last refresh_training_status run."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--dry-run", action="store_true", help="Count the digests, send nothing.")
+
+    def handle(self, *args, **options):
+        labels = dict(TrainingStatus.STATUS_CHOICES)
+        connection = None if options["dry_run"] else get_connection()
+        sent, batch = 0, []
+        for user, rows in training_digests():
+            sent += 1
+            if connection is None:
+                continue
+            batch.append(EmailMessage(
+                subject="Training that needs your attention",
+                body=self.render(user, rows, labels),
+                from_email=settings.DEFAULT_FROM_EMAIL,
+                to=[user["email"]],
+                connection=connection
+            ))
+            if len(batch) >= BATCH_SIZE:
+                connection.send_messages(batch)
+                batch = []
+        if batch:
+            connection.send_messages(batch)
+
+        verb = "Would send" if options["dry_run"] else "Sent"
+        self.stdout.write(self.style.SUCCESS(f"{verb} {sent} training digests."))
+
+    def render(self, user, rows, labels):
+        lines = [f"Hello {user['username']},", "", "The following training needs your attention:", ""]
+        for status, title, due_date in rows:
+            due = f" (due {due_date.isoformat()})" if due_date else ""
+            lines.append(f"- {labels[status]}: {title}{due}")
+        return "\n".join(lines) + "\n"
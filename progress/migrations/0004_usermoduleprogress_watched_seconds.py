@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:22
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0003_quizattempt_packed_answers'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usermoduleprogress',
+            name='watched_seconds',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
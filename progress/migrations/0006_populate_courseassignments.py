@@ -0,0 +1,51 @@
+from collections import defaultdict
+from datetime import timedelta
+from django.conf import settings
+from django.db import migrations
+from django.utils import timezone
+
+
+def populate_assignments(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    User = apps.get_model("accounts", "User")
+    CourseAssignment = apps.get_model("progress", "CourseAssignment")
+
+    courses = defaultdict(list)
+    for course_id, ship_type_id, position_id in (
+        Course.positions.through.objects
+        .filter(course__deleted_at__isnull=True)
+        .values_list("course_id", "course__ship_type_id", "position_id")
+    ):
+        courses[(ship_type_id, position_id)].append(course_id)
+
+    now = timezone.now()
+    due_date = (now + timedelta(days=getattr(settings, "ASSIGNMENT_DUE_DAYS", 30))).date()
+    batch = []
+    users = (
+        User._base_manager
+        .filter(deleted_at__isnull=True)
+        .values_list("id", "ship_type_id", "position_id")
+        .iterator(chunk_size=2000)
+    )
+    for user_id, ship_type_id, position_id in users:
+        for course_id in courses.get((ship_type_id, position_id), ()):
+            batch.append(CourseAssignment(
+                user_id=user_id, course_id=course_id, assigned_at=now, due_date=due_date
+            ))
+        if len(batch) >= 1000:
+            CourseAssignment.objects.bulk_create(batch, ignore_conflicts=True)
+            batch = []
+    CourseAssignment.objects.bulk_create(batch, ignore_conflicts=True)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("accounts", "0003_user_deleted_at"),
+        ("courses", "0007_course_deleted_at"),
+        ("progress", "0005_courseassignment"),
+    ]
+
+    operations = [
+        migrations.RunPython(populate_assignments, migrations.RunPython.noop),
+    ]
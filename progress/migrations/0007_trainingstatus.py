@@ -0,0 +1,32 @@
+# Generated by Django 5.2.6 on 2026-10-19 16:43
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('courses', '0010_course_validity_days'),
+        ('progress', '0006_populate_courseassignments'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TrainingStatus',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('status', models.CharField(choices=[('overdue', 'Overdue'), ('expiring', 'Expiring Soon'), ('never_started', 'Never Started')], max_length=20)),
+                ('due_date', models.DateField(blank=True, null=True)),
+                ('computed_at', models.DateTimeField()),
+                ('course', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='training_statuses', to='courses.course')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='training_statuses', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'indexes': [models.Index(fields=['status', 'due_date'], name='progress_tr_status_b51c2d_idx'), models.Index(fields=['course', 'status'], name='progress_tr_course__31c637_idx')],
+                'unique_together': {('user', 'course')},
+            },
+        ),
+    ]
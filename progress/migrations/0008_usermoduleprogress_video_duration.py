@@ -0,0 +1,18 @@
+# Generated by Django 5.2.6 on 2026-10-19 17:24
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('progress', '0007_trainingstatus'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='usermoduleprogress',
+            name='video_duration',
+            field=models.PositiveIntegerField(default=0),
+        ),
+    ]
@@ -1,5 +1,6 @@
 from django.db import models
 from django.conf import settings
+from django.utils import timezone
 from courses.models import Course, Quiz, Module
 
 
@@ -26,6 +27,11 @@ class QuizAttempt(models.Model):
     passed = models.BooleanField(default=False)
     attempted_at = models.DateTimeField(auto_now_add=True)
 
+    # Packed per-question answers, see progress.answers
+    question_ids = models.JSONField(default=list, blank=True)
+    answers = models.BinaryField(default=b"", blank=True)
+    answered = models.BinaryField(default=b"", blank=True)
+
     def __str__(self):
         return f"{self.user.username} - {self.quiz.module.title} ({self.score})"
 
@@ -35,10 +41,62 @@ class UserModuleProgress(models.Model):
     module = models.ForeignKey(Module, on_delete=models.CASCADE)
     completed = models.BooleanField(default=False)
     completed_at = models.DateTimeField(null=True, blank=True)
+    # Furthest video position reached, written by progress.heartbeats
+    watched_seconds = models.PositiveIntegerField(default=0)
+    # Video length from the first heartbeat; later heartbeats cannot change it
+    video_duration = models.PositiveIntegerField(default=0)
 
     class Meta:
         unique_together = ('user', 'module')
 
     def __str__(self):
         status = "Completed" if self.completed else "Pending"
-        return f"{self.user.username} - {self.module.title} ({status})"
\ No newline at end of file
+        return f"{self.user.username} - {self.module.title} ({status})"
+
+
+class CourseAssignment(models.Model):
+    """
+    Materialized eligibility: one row per (user, course) where the course's
+    ship type and positions match the user's. Maintained by
+    progress.assignments; read it instead of joining Course.positions.
+    """
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='assignments')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='assignments')
+    assigned_at = models.DateTimeField(default=timezone.now)
+    due_date = models.DateField(blank=True, null=True)
+
+    class Meta:
+        unique_together = ('user', 'course')
+
+    def __str__(self):
+        return f"{self.user.username} - {self.course.title} (due {self.due_date})"
+
+
+class TrainingStatus(models.Model):
+    """
+    Nightly summary of assignments needing attention, rebuilt by
+    ``manage.py refresh_training_status`` (see progress.training). Reports
+    read this table instead of scanning users and courses.
+    """
+    STATUS_CHOICES = (
+        ('overdue', 'Overdue'),
+        ('expiring', 'Expiring Soon'),
+        ('never_started', 'Never Started'),
+    )
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='training_statuses')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, related_name='training_statuses')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES)
+    # Assignment due date, or the date the last completion expires/expired
+    due_date = models.DateField(blank=True, null=True)
+    computed_at = models.DateTimeField()
+
+    class Meta:
+        unique_together = ('user', 'course')
+        indexes = [
+            models.Index(fields=['status', 'due_date']),
+            models.Index(fields=['course', 'status']),
+        ]
+
+    def __str__(self):
+        return f"{self.user.username} - {self.course.title} ({self.status})"
+
@@ -0,0 +1,104 @@
+"""
+Set-based recomputation of UserCourseProgress.status after a course's
+module list changes.
+
+A user has finished a course when none of its modules lacks a completed
+UserModuleProgress row. ``recompute_course_progress`` applies that rule to
+every progress row of the given courses with grouped UPDATEs: one
+reopening rows that are no longer complete, then batches completing rows
+that now are (selected first so their certificates can be queued).
+``schedule_course_recompute`` runs it after commit, on a background thread
+for courses with many progress rows.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from django.conf import settings
+from django.db import close_old_connections, connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+from certificates.generation import queue_certificates
+from courses.models import Module
+from .compliance import invalidate_compliance_matrix
+from .models import UserCourseProgress, UserModuleProgress
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="progress-recompute")
+
+UPDATE_BATCH_SIZE = 500
+
+
+def recompute_course_progress(course_ids):
+    """Returns ``(reopened, completed)`` row counts."""
+    course_ids = list(course_ids)
+    if not course_ids:
+        return 0, 0
+
+    unfinished_module = Module.objects.filter(course_id=OuterRef("course_id")).exclude(
+        Exists(UserModuleProgress.objects.filter(
+            module=OuterRef("pk"),
+            user=OuterRef(OuterRef("user_id")),
+            completed=True
+        ))
+    )
+    has_modules = Module.objects.filter(course_id=OuterRef("course_id"))
+
+    with transaction.atomic():
+        reopened = (
+            UserCourseProgress.objects
+            .filter(course_id__in=course_ids, status="completed")
+            .filter(Exists(unfinished_module))
+            .update(status="in_progress", completed_at=None)
+        )
+        # A course without modules is never completed by recomputation
+        newly_completed = list(
+            UserCourseProgress.objects
+            .select_for_update()
+            .filter(course_id__in=course_ids)
+            .exclude(status="completed")
+            .filter(Exists(has_modules), ~Exists(unfinished_module))
+            .values_list("id", "user_id", "course_id")
+        )
+        now = timezone.now()
+        for start in range(0, len(newly_completed), UPDATE_BATCH_SIZE):
+            batch = newly_completed[start:start + UPDATE_BATCH_SIZE]
+            UserCourseProgress.objects.filter(id__in=[row[0] for row in batch]).update(
+                status="completed", completed_at=now
+            )
+
+        # Grouped updates send no post_save: do what progress.signals and
+        # certificates.signals would have done
+        queue_certificates((user_id, course_id, now) for _, user_id, course_id in newly_completed)
+        if reopened or newly_completed:
+            invalidate_compliance_matrix()
+    return reopened, len(newly_completed)
+
+
+def schedule_course_recompute(course_ids):
+    """Recompute once the current transaction commits; large courses off-thread."""
+    course_ids = set(course_ids)
+    if not course_ids:
+        return
+
+    def run():
+        rows = UserCourseProgress.objects.filter(course_id__in=course_ids).count()
+        if rows > settings.PROGRESS_RECOMPUTE_SYNC_LIMIT:
+            _executor.submit(_run_in_background, course_ids)
+        else:
+            recompute_course_progress(course_ids)
+
+    transaction.on_commit(run)
+
+
+def _run_in_background(course_ids):
+    close_old_connections()
+    try:
+        reopened, completed = recompute_course_progress(course_ids)
+        logger.info(
+            "Recomputed progress for courses %s: %d reopened, %d completed",
+            sorted(course_ids), reopened, completed
+        )
+    except Exception:
+        logger.exception("Progress recomputation failed for courses %s", sorted(course_ids))
+    finally:
+        connections.close_all()
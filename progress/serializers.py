@@ -27,7 +27,7 @@ class QuizAttemptSerializer(serializers.ModelSerializer):
 
     class Meta:
         model = QuizAttempt
-        fields = '__all__'
+        exclude = ['question_ids', 'answers', 'answered']
 
     def to_representation(self, instance):
         rep = super().to_representation(instance)
@@ -0,0 +1,115 @@
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import pre_delete, post_save, post_delete, m2m_changed
+from django.dispatch import receiver
+from accounts.models import Position, ShipType
+from courses.cache import invalidation_deferred
+from courses.models import Course, Module
+from courses.signals import modules_changed
+from .assignments import sync_assignments
+from .compliance import COMPLIANCE_MATRIX_CACHE_KEY
+from .models import UserCourseProgress
+from .recompute import schedule_course_recompute
+
+User = get_user_model()
+
+
+# ----------------------------
+# Compliance matrix invalidation
+# ----------------------------
+# User saves that touch none of these (e.g. update_last_login) keep the matrix.
+USER_MATRIX_FIELDS = {"role", "position", "ship_type", "deleted_at"}
+
+
+@receiver([post_save, post_delete], sender=UserCourseProgress)
+@receiver([post_save, post_delete], sender=Course)
+@receiver(post_delete, sender=User)
+def invalidate_compliance_matrix(sender, **kwargs):
+    cache.delete(COMPLIANCE_MATRIX_CACHE_KEY)
+
+
+@receiver(post_save, sender=User)
+def invalidate_compliance_matrix_on_user(sender, update_fields=None, **kwargs):
+    if update_fields is not None and not USER_MATRIX_FIELDS & set(update_fields):
+        return
+    cache.delete(COMPLIANCE_MATRIX_CACHE_KEY)
+
+
+@receiver(m2m_changed, sender=Course.positions.through)
+def invalidate_compliance_matrix_on_assignment(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        cache.delete(COMPLIANCE_MATRIX_CACHE_KEY)
+
+
+# ----------------------------
+# Course assignments
+# ----------------------------
+# Saves that cannot change eligibility (e.g. update_last_login) are skipped.
+USER_ELIGIBILITY_FIELDS = {"position", "ship_type", "deleted_at"}
+COURSE_ELIGIBILITY_FIELDS = {"ship_type", "deleted_at"}
+
+
+@receiver(post_save, sender=User)
+def sync_user_assignments(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not USER_ELIGIBILITY_FIELDS & set(update_fields):
+        return
+    sync_assignments(user_ids=[instance.pk])
+
+
+@receiver(post_save, sender=Course)
+def sync_course_assignments(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields is not None and not COURSE_ELIGIBILITY_FIELDS & set(update_fields):
+        return
+    sync_assignments(course_ids=[instance.pk])
+
+
+@receiver(m2m_changed, sender=Course.positions.through)
+def sync_assignments_on_positions(sender, instance, action, reverse, pk_set, **kwargs):
+    if action not in ("post_add", "post_remove", "post_clear"):
+        return
+    if not reverse:
+        sync_assignments(course_ids=[instance.pk])
+    elif pk_set is not None:
+        sync_assignments(course_ids=pk_set)
+    else:
+        # position.course_set.clear(): only holders of that position lose courses
+        sync_assignments(user_ids=User.objects.filter(position=instance).values_list("id", flat=True))
+
+
+@receiver(pre_delete, sender=Position)
+@receiver(pre_delete, sender=ShipType)
+def remember_lookup_holders(sender, instance, **kwargs):
+    # Only the users holding the position / ship type can lose courses; they
+    # are detached with SET_NULL, which sends no signals
+    field = "position" if sender is Position else "ship_type"
+    instance._holder_ids = list(User.objects.filter(**{field: instance}).values_list("id", flat=True))
+
+
+@receiver(post_delete, sender=Position)
+@receiver(post_delete, sender=ShipType)
+def sync_assignments_on_lookup_delete(sender, instance, **kwargs):
+    holder_ids = getattr(instance, "_holder_ids", [])
+    if holder_ids:
+        transaction.on_commit(lambda: sync_assignments(user_ids=holder_ids))
+
+
+# ----------------------------
+# Course progress recomputation
+# ----------------------------
+@receiver(post_save, sender=Module)
+def recompute_on_module_created(sender, instance, created, **kwargs):
+    if created and not invalidation_deferred():
+        schedule_course_recompute([instance.course_id])
+
+
+@receiver(post_delete, sender=Module)
+def recompute_on_module_deleted(sender, instance, **kwargs):
+    if not invalidation_deferred():
+        schedule_course_recompute([instance.course_id])
+
+
+@receiver(modules_changed)
+def recompute_on_bulk_module_change(sender, course_ids, **kwargs):
+    schedule_course_recompute(course_ids)
+
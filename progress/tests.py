@@ -1,3 +1,797 @@
-from django.test import TestCase
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+from django.conf import settings
+from django.core import mail
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+from accounts.models import Position, ShipType, User
+from certificates.models import Certificate
+from courses.models import Course, Module, Quiz, Question
+from courses.snapshots import publish_course
+from marine_lms import metrics
+from marine_lms.nplusone import detect_n_plus_one
+from marine_lms.testing import AdminQueryBudgetTestCase
+from marine_lms.throttling import SlidingWindowThrottle
+from . import heartbeats, recompute
+from .analytics import NOT_SERVED, UNANSWERED, _answer_matrix
+from .answers import pack_answers
+from .assignments import sync_assignments
+from .attempts import make_attempt_token, read_attempt_token
+from .compliance import COMPLIANCE_MATRIX_CACHE_KEY
+from .training import refresh_training_status
+from .models import CourseAssignment, QuizAttempt, TrainingStatus, UserCourseProgress, UserModuleProgress
 
-# Create your tests here.
+
+class AdminQueryBudgetTests(AdminQueryBudgetTestCase):
+
+    def add_rows(self, count):
+        start = User.objects.count()
+        users = User.objects.bulk_create([
+            User(username=f"crew-{start + i}", email=f"crew-{start + i}@example.com", ship_type=self.ship_type)
+            for i in range(count)
+        ])
+        courses = Course.objects.bulk_create([
+            Course(title=f"Course {start + i}", ship_type=self.ship_type) for i in range(count)
+        ])
+        modules = Module.objects.bulk_create([Module(course=course, title="Module") for course in courses])
+        quizzes = Quiz.objects.bulk_create([Quiz(module=module) for module in modules])
+
+        UserCourseProgress.objects.bulk_create([
+            UserCourseProgress(user=user, course=course, status="in_progress")
+            for user, course in zip(users, courses)
+        ])
+        QuizAttempt.objects.bulk_create([
+            QuizAttempt(user=user, quiz=quiz, score=1) for user, quiz in zip(users, quizzes)
+        ])
+        TrainingStatus.objects.bulk_create([
+            TrainingStatus(user=user, course=course, status="never_started", computed_at=timezone.now())
+            for user, course in zip(users, courses)
+        ])
+
+    def test_usercourseprogress_changelist(self):
+        self.assert_bounded(reverse("admin:progress_usercourseprogress_changelist"))
+
+    def test_quizattempt_changelist(self):
+        self.assert_bounded(reverse("admin:progress_quizattempt_changelist"))
+
+    def test_trainingstatus_changelist(self):
+        self.assert_bounded(reverse("admin:progress_trainingstatus_changelist"))
+
+
+class LearnerProgressTestCase(TestCase):
+    """Two assigned courses of two modules each, every module with a one-question quiz."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ship_type = ShipType.objects.create(name="Tanker")
+        cls.position = Position.objects.create(name="Master")
+        cls.admin = User.objects.create_user("admin", "admin@example.com", "pw", role="admin", is_staff=True)
+        cls.learner = User.objects.create_user(
+            "learner", "learner@example.com", "pw", ship_type=cls.ship_type, position=cls.position
+        )
+        cls.courses = []
+        cls.quizzes = []
+        for title in ("Fire fighting", "Ballast"):
+            course = Course.objects.create(title=title, ship_type=cls.ship_type)
+            course.positions.set([cls.position])
+            cls.courses.append(course)
+            for index in range(2):
+                module = Module.objects.create(course=course, title=f"{title} {index}")
+                quiz = Quiz.objects.create(module=module)
+                Question.objects.create(
+                    quiz=quiz, question_text="Question",
+                    option_a="A", option_b="B", option_c="C", option_d="D", correct_answer="B"
+                )
+                cls.quizzes.append(quiz)
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(self.learner)
+
+    def submit(self, quiz, answer="B"):
+        question_id = quiz.questions.get().id
+        return self.client.post(
+            reverse("quizattempt-list-create"), {"quiz": quiz.id, "answers": {str(question_id): answer}},
+            format="json"
+        )
+
+    def batch_progress(self, **params):
+        response = self.client.get(reverse("course-progress-batch"), params)
+        self.assertEqual(response.status_code, 200)
+        return {row["course_id"]: row for row in response.data["courses"]}
+
+
+class ComplianceMatrixTests(LearnerProgressTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(self.admin)
+        self.url = reverse("compliance-matrix")
+
+    def cells(self):
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        return {cell["course_id"]: cell for cell in response.data["cells"]}
+
+    def test_counts_assigned_and_completed_per_cell(self):
+        UserCourseProgress.objects.create(
+            user=self.learner, course=self.courses[0], status="completed", completed_at=timezone.now()
+        )
+        cells = self.cells()
+        self.assertEqual(set(cells), {course.id for course in self.courses})
+        cell = cells[self.courses[0].id]
+        self.assertEqual((cell["ship_type"], cell["position"]), ("Tanker", "Master"))
+        self.assertEqual((cell["assigned_users"], cell["completed_users"]), (1, 1))
+        self.assertEqual(cell["completion_percentage"], 100)
+        self.assertEqual(cells[self.courses[1].id]["completed_users"], 0)
+
+    def test_admin_only(self):
+        self.client.force_authenticate(self.learner)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+    def test_cached_until_a_relevant_write(self):
+        self.cells()
+        with self.assertNumQueries(0):
+            self.cells()
+
+        # Logins save the user but cannot change the matrix
+        self.learner.save(update_fields=["last_login"])
+        self.assertIsNotNone(cache.get(COMPLIANCE_MATRIX_CACHE_KEY))
+
+        UserCourseProgress.objects.create(user=self.learner, course=self.courses[1], status="in_progress")
+        self.assertIsNone(cache.get(COMPLIANCE_MATRIX_CACHE_KEY))
+
+        self.cells()
+        self.learner.position = None
+        self.learner.save(update_fields=["position"])
+        self.assertIsNone(cache.get(COMPLIANCE_MATRIX_CACHE_KEY))
+        self.assertEqual(self.cells(), {})
+
+
+class AnswerPackingTests(SimpleTestCase):
+
+    def test_pack_answers(self):
+        codes, answered = pack_answers([1, 2, 3, 4, 5], {"1": "B", "2": "D", "4": "A", "5": "C", "3": "E"})
+        # B=01 D=11 -=00 A=00 | C=10, and the answered bits for 1, 2, 4 and 5
+        self.assertEqual(codes, bytes([0b01110000, 0b10000000]))
+        self.assertEqual(answered, bytes([0b11011000]))
+
+    def test_answer_matrix_unpacks_attempts_of_any_length(self):
+        first_ids = list(range(1, 10))
+        first = {str(qid): "ABCD"[qid % 4] for qid in first_ids if qid != 7}
+        second_ids = [3, 42, 1]  # 42 has since been deleted
+        attempts = [
+            (first_ids, *pack_answers(first_ids, first)),
+            (second_ids, *pack_answers(second_ids, {"3": "D", "42": "A"})),
+        ]
+        matrix = _answer_matrix(attempts, first_ids)
+
+        self.assertEqual(matrix[0].tolist(), [UNANSWERED if qid == 7 else qid % 4 for qid in first_ids])
+        expected_second = [NOT_SERVED] * 9
+        expected_second[0], expected_second[2] = UNANSWERED, 3
+        self.assertEqual(matrix[1].tolist(), expected_second)
+
+
+class QuizAnalyticsTests(LearnerProgressTestCase):
+
+    def test_question_statistics(self):
+        quiz = self.quizzes[0]
+        q1 = quiz.questions.get()  # correct B
+        q2 = Question.objects.create(quiz=quiz, question_text="Second", option_a="A", option_b="B",
+                                     option_c="C", option_d="D", correct_answer="A")
+        q3 = Question.objects.create(quiz=quiz, question_text="Third", option_a="A", option_b="B",
+                                     option_c="C", option_d="D", correct_answer="C")
+        served = [
+            ([q1.id, q2.id, q3.id], {str(q1.id): "B", str(q2.id): "A", str(q3.id): "C"}),
+            ([q1.id, q2.id], {str(q1.id): "D"}),
+            ([q1.id, q3.id, 999999], {str(q1.id): "B", str(q3.id): "A", "999999": "A"}),
+            ([q2.id], {str(q2.id): "C"}),
+        ]
+        QuizAttempt.objects.bulk_create([
+            QuizAttempt(user=self.learner, quiz=quiz, question_ids=ids, answers=codes, answered=mask)
+            for ids, answers in served
+            for codes, mask in [pack_answers(ids, answers)]
+        ])
+
+        self.client.force_authenticate(self.admin)
+        response = self.client.get(reverse("quizattempt-analytics", args=[quiz.id]))
+        self.assertEqual(response.data["attempts"], 4)
+        stats = {row["question_id"]: row for row in response.data["questions"]}
+
+        self.assertEqual(stats[q1.id]["times_served"], 3)
+        self.assertEqual(stats[q1.id]["percent_correct"], 66.67)
+        self.assertEqual(stats[q1.id]["distractor_frequency"], {"A": 0, "C": 0, "D": 33.33})
+        self.assertEqual(stats[q1.id]["discrimination_index"], 1.0)
+        self.assertEqual(stats[q2.id]["times_unanswered"], 1)
+        self.assertEqual(stats[q2.id]["distractor_frequency"]["C"], 33.33)
+        self.assertEqual((stats[q3.id]["times_served"], stats[q3.id]["percent_correct"]), (2, 50))
+
+
+class QuizDrawTests(LearnerProgressTestCase):
+    """A five-question bank served two at a time."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.quiz = cls.quizzes[0]
+        for index in range(4):
+            Question.objects.create(
+                quiz=cls.quiz, question_text=f"Extra {index}",
+                option_a="A", option_b="B", option_c="C", option_d="D", correct_answer="B"
+            )
+        Quiz.objects.filter(id=cls.quiz.id).update(draw_size=2)
+
+    def draw(self):
+        response = self.client.get(reverse("quizattempt-draw", args=[self.quiz.id]))
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def submit_drawn(self, token, answers):
+        return self.client.post(
+            reverse("quizattempt-list-create"),
+            {"quiz": self.quiz.id, "attempt_token": token, "answers": answers},
+            format="json"
+        )
+
+    def test_token_round_trip(self):
+        token = make_attempt_token(self.learner.id, self.quiz.id, [3, 1], 2)
+        self.assertEqual(read_attempt_token(token, self.learner.id, self.quiz.id), ([3, 1], 2))
+        self.assertIsNone(read_attempt_token(token, self.admin.id, self.quiz.id))
+        self.assertIsNone(read_attempt_token(token, self.learner.id, self.quizzes[1].id))
+        self.assertIsNone(read_attempt_token(token + "x", self.learner.id, self.quiz.id))
+        with self.settings(QUIZ_ATTEMPT_TOKEN_MAX_AGE=-1):
+            self.assertIsNone(read_attempt_token(token, self.learner.id, self.quiz.id))
+
+    def test_draw_serves_questions_without_answers(self):
+        data = self.draw()
+        self.assertEqual(len(data["questions"]), 2)
+        self.assertNotIn("correct_answer", data["questions"][0])
+        served = [question["id"] for question in data["questions"]]
+        self.assertEqual(read_attempt_token(data["attempt_token"], self.learner.id, self.quiz.id), (served, None))
+
+    def test_grades_only_the_served_questions(self):
+        data = self.draw()
+        served = {question["id"] for question in data["questions"]}
+        answers = {str(question_id): "B" for question_id in self.quiz.questions.values_list("id", flat=True)}
+        for question_id in self.quiz.questions.exclude(id__in=served).values_list("id", flat=True):
+            answers[str(question_id)] = "A"
+
+        response = self.submit_drawn(data["attempt_token"], answers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual((response.data["total_questions"], response.data["passed"]), (2, True))
+        attempt = QuizAttempt.objects.get()
+        self.assertEqual(set(attempt.question_ids), served)
+
+    def test_drawn_quiz_requires_a_valid_token(self):
+        answers = {str(question.id): "B" for question in self.quiz.questions.all()}
+        self.assertEqual(self.submit_drawn(None, answers).status_code, 400)
+        self.assertEqual(self.submit_drawn("forged", answers).status_code, 400)
+
+        other = User.objects.create_user(
+            "other", "other@example.com", "pw", ship_type=self.ship_type, position=self.position
+        )
+        token = make_attempt_token(other.id, self.quiz.id, list(self.quiz.questions.values_list("id", flat=True)))
+        self.assertEqual(self.submit_drawn(token, answers).status_code, 400)
+        self.assertFalse(QuizAttempt.objects.exists())
+
+    def test_published_draw_is_graded_against_its_snapshot(self):
+        publish_course(self.courses[0])
+        data = self.draw()
+        self.assertEqual(read_attempt_token(data["attempt_token"], self.learner.id, self.quiz.id)[1], 1)
+
+        # Later edits to the live answer key do not change the published grading
+        self.quiz.questions.update(correct_answer="C")
+        answers = {str(question["id"]): "B" for question in data["questions"]}
+        response = self.submit_drawn(data["attempt_token"], answers)
+        self.assertEqual((response.data["total_questions"], response.data["passed"]), (2, True))
+
+    def test_unassigned_learner_cannot_draw(self):
+        self.client.force_authenticate(User.objects.create_user("deckhand", "deckhand@example.com", "pw"))
+        response = self.client.get(reverse("quizattempt-draw", args=[self.quiz.id]))
+        self.assertEqual(response.status_code, 403)
+
+
+class MetricsTests(LearnerProgressTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory, ignore_errors=True)
+        registry = mock.patch.object(metrics, "registry", metrics.MetricsRegistry())
+        registry.start()
+        self.addCleanup(registry.stop)
+
+    def write_snapshot(self, pid, submissions):
+        path = os.path.join(self.directory, f"{pid}-1.json")
+        with open(path, "w") as fh:
+            json.dump(metrics.snapshot_data({("quiz_submissions_total", ()): submissions}, {}), fh)
+        return path
+
+    def dead_pid(self):
+        process = subprocess.Popen(["true"])
+        process.wait()
+        return process.pid
+
+    def archived_submissions(self):
+        counters = {}
+        metrics.merge_snapshot(
+            metrics.load_snapshot(os.path.join(self.directory, metrics.ARCHIVE_NAME)), counters, {}
+        )
+        return counters.get(("quiz_submissions_total", ()), 0)
+
+    def test_fold_dead_snapshots_into_archive(self):
+        dead = self.write_snapshot(self.dead_pid(), 3)
+        live = self.write_snapshot(os.getpid(), 5)
+        metrics.fold_dead_snapshots(self.directory)
+        self.assertFalse(os.path.exists(dead))
+        self.assertTrue(os.path.exists(live))
+        self.assertEqual(self.archived_submissions(), 3)
+
+        self.write_snapshot(self.dead_pid(), 4)
+        metrics.fold_dead_snapshots(self.directory)
+        self.assertEqual(self.archived_submissions(), 7)
+
+    def test_endpoint_totals_live_and_archived_processes(self):
+        self.write_snapshot(self.dead_pid(), 2)
+        with self.settings(METRICS_ENABLED=True, METRICS_DIR=self.directory):
+            self.submit(self.quizzes[0])
+            self.client.force_authenticate(self.admin)
+            body = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn("quiz_submissions_total 3\n", body)
+        self.assertIn('http_requests_total{method="POST",status="201",view="quizattempt-list-create"} 1', body)
+
+    def test_disabled_by_default(self):
+        with self.settings(METRICS_DIR=self.directory):
+            self.submit(self.quizzes[0])
+            self.client.force_authenticate(self.admin)
+            self.assertEqual(self.client.get(reverse("metrics")).status_code, 404)
+        self.assertEqual(os.listdir(self.directory), [])
+
+
+class CourseProgressTests(LearnerProgressTestCase):
+    """Progress is measured against the modules_count counters."""
+
+    def test_passing_every_module_completes_the_course(self):
+        course = self.courses[0]
+        self.assertEqual(self.submit(self.quizzes[0]).data["passed"], True)
+        progress = self.batch_progress()[course.id]
+        self.assertEqual((progress["completed_modules"], progress["total_modules"]), (1, 2))
+        self.assertEqual(UserCourseProgress.objects.get(user=self.learner, course=course).status, "in_progress")
+
+        self.submit(self.quizzes[1])
+        self.assertEqual(self.batch_progress()[course.id]["progress_percentage"], 100)
+        self.assertEqual(UserCourseProgress.objects.get(user=self.learner, course=course).status, "completed")
+
+    def test_failed_attempt_does_not_complete_the_module(self):
+        self.assertEqual(self.submit(self.quizzes[0], "A").data["passed"], False)
+        self.assertFalse(UserModuleProgress.objects.get(user=self.learner).completed)
+        self.assertEqual(self.batch_progress()[self.courses[0].id]["completed_modules"], 0)
+
+    def test_ids_only_narrow_assigned_courses(self):
+        other = Course.objects.create(title="Unassigned", ship_type=ShipType.objects.create(name="Bulk"))
+        ids = f"{self.courses[1].id},{other.id}"
+        self.assertEqual(list(self.batch_progress(ids=ids)), [self.courses[1].id])
+        self.assertEqual(self.client.get(reverse("course-progress-batch"), {"ids": "x"}).status_code, 400)
+
+    def test_new_module_counts_against_progress(self):
+        self.submit(self.quizzes[0])
+        self.submit(self.quizzes[1])
+        Module.objects.create(course=self.courses[0], title="Added later")
+        self.assertEqual(self.batch_progress()[self.courses[0].id]["total_modules"], 3)
+
+    def test_deleted_course_is_hidden_from_progress(self):
+        self.submit(self.quizzes[0])
+        self.courses[0].soft_delete()
+        self.assertEqual(list(self.batch_progress()), [self.courses[1].id])
+        self.assertEqual(self.submit(self.quizzes[1]).status_code, 404)
+
+        response = self.client.get(reverse("course-progress", args=[self.courses[0].id]))
+        self.assertEqual(response.data["completed_modules"], 0)
+
+    def test_only_admins_read_other_users(self):
+        self.assertEqual(self.client.get(reverse("course-progress-batch"), {"user": self.admin.id}).status_code, 403)
+        self.submit(self.quizzes[2])
+        self.client.force_authenticate(self.admin)
+        progress = self.batch_progress(user=self.learner.id)
+        self.assertEqual(progress[self.courses[1].id]["completed_modules"], 1)
+
+    def test_reports_have_no_n_plus_one(self):
+        for course in self.courses:
+            UserCourseProgress.objects.create(
+                user=self.learner, course=course, status="completed", completed_at=timezone.now()
+            )
+        admin = APIClient()
+        admin.force_authenticate(self.admin)
+        with detect_n_plus_one(threshold=1):
+            self.batch_progress()
+            self.assertEqual(len(admin.get(reverse("compliance-matrix")).data["cells"]), 2)
+
+
+class WatchHeartbeatTests(LearnerProgressTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.video = Module.objects.create(
+            course=cls.courses[0], title="Video", video_url="https://example.com/fire.mp4"
+        )
+
+    def setUp(self):
+        super().setUp()
+        self.start = time.time()
+
+    def beat(self, position, at, duration=600, module=None):
+        with mock.patch("progress.heartbeats.time.time", return_value=self.start + at):
+            return heartbeats.record_heartbeat(self.learner.id, (module or self.video).id, position, duration)
+
+    def progress(self, module=None):
+        return UserModuleProgress.objects.get(user=self.learner, module=module or self.video)
+
+    def post(self, **data):
+        return self.client.post(reverse("watch-heartbeat"), data, format="json")
+
+    # ----------------------------
+    # Trusting the client
+    # ----------------------------
+    def test_forged_heartbeat_does_not_complete(self):
+        response = self.post(module=self.video.id, position=1, duration=1)
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.data["watched_seconds"], 0)
+        heartbeats.flush_heartbeats()
+        self.assertFalse(self.progress().completed)
+
+    def test_position_advance_is_capped_by_wall_time(self):
+        self.assertEqual(self.beat(0, at=0), (0, 600))
+        self.assertEqual(self.beat(500, at=10), (20, 600))
+        self.assertEqual(self.beat(500, at=300), (500, 600))
+        self.assertEqual(self.beat(590, at=301), (502, 600))
+        self.assertEqual(self.beat(100, at=302), (502, 600))
+
+    def test_duration_is_fixed_by_the_first_heartbeat(self):
+        self.beat(0, at=0)
+        self.assertEqual(self.beat(10, at=10, duration=12), (10, 600))
+
+        heartbeats.flush_heartbeats()
+        cache.clear()  # a new session, long after the first
+        response = self.post(module=self.video.id, position=30, duration=12)
+        self.assertEqual((response.data["watched_seconds"], response.data["duration"]), (10, 600))
+
+    # ----------------------------
+    # Coalescing and flushing
+    # ----------------------------
+    def test_heartbeats_coalesce_into_one_write(self):
+        for second in range(0, 50, 10):
+            self.beat(second, at=second)
+        self.assertEqual(cache.get(heartbeats.SEQUENCE_KEY), 1)
+
+        self.assertEqual(heartbeats.flush_heartbeats(), 1)
+        progress = self.progress()
+        self.assertEqual((progress.watched_seconds, progress.video_duration), (40, 600))
+        self.assertFalse(progress.completed)
+        self.assertEqual(heartbeats.flush_heartbeats(), 0)
+
+    def test_watching_enough_completes_the_module(self):
+        self.beat(0, at=0)
+        self.beat(540, at=270)
+        heartbeats.flush_heartbeats()
+        self.assertTrue(self.progress().completed)
+        self.assertEqual(
+            UserCourseProgress.objects.get(user=self.learner, course=self.courses[0]).status, "in_progress"
+        )
+
+    def test_modules_with_a_quiz_need_the_quiz(self):
+        module = self.quizzes[0].module
+        Module.objects.filter(id=module.id).update(video_url="https://example.com/quiz.mp4")
+        self.beat(0, at=0, module=module)
+        self.beat(600, at=300, module=module)
+        heartbeats.flush_heartbeats()
+        self.assertEqual(self.progress(module).watched_seconds, 600)
+        self.assertFalse(self.progress(module).completed)
+
+    def test_heartbeat_after_a_flush_registers_again(self):
+        self.beat(0, at=0)
+        heartbeats.flush_heartbeats()
+        self.beat(20, at=10)
+        self.assertEqual(heartbeats.flush_heartbeats(), 1)
+        self.assertEqual(self.progress().watched_seconds, 20)
+
+    def test_heartbeat_during_a_flush_is_kept(self):
+        self.beat(0, at=0)
+        self.beat(20, at=10)
+        apply = heartbeats.apply_heartbeats
+
+        def apply_while_watching(entries):
+            self.beat(40, at=20)
+            apply(entries)
+
+        with mock.patch.object(heartbeats, "apply_heartbeats", apply_while_watching):
+            heartbeats.flush_heartbeats()
+        self.assertEqual(self.progress().watched_seconds, 20)
+
+        # Re-registered by the flush that missed it
+        self.assertEqual(heartbeats.flush_heartbeats(), 1)
+        self.assertEqual(self.progress().watched_seconds, 40)
+
+    # ----------------------------
+    # Endpoint
+    # ----------------------------
+    def test_rejects_bad_input_and_unknown_or_unassigned_modules(self):
+        self.assertEqual(self.post(module=self.video.id, position=-1, duration=10).status_code, 400)
+        self.assertEqual(self.post(module=self.video.id).status_code, 400)
+        self.assertEqual(self.post(module=999999, position=1, duration=10).status_code, 404)
+
+        other = Course.objects.create(title="Unassigned", ship_type=ShipType.objects.create(name="Bulk"))
+        module = Module.objects.create(course=other, title="Video", video_url="https://example.com/v.mp4")
+        self.assertEqual(self.post(module=module.id, position=1, duration=10).status_code, 403)
+
+        self.courses[0].soft_delete()
+        self.assertEqual(self.post(module=self.video.id, position=1, duration=10).status_code, 404)
+
+
+class AssignmentSyncTests(LearnerProgressTestCase):
+    """CourseAssignment follows ship type, position and course position changes."""
+
+    def assigned(self, user=None):
+        return set(CourseAssignment.objects.filter(user=user or self.learner).values_list("course_id", flat=True))
+
+    def all_courses(self):
+        return {course.id for course in self.courses}
+
+    def test_new_user_is_assigned_with_a_due_date(self):
+        user = User.objects.create_user(
+            "cadet", "cadet@example.com", "pw", ship_type=self.ship_type, position=self.position
+        )
+        self.assertEqual(self.assigned(user), self.all_courses())
+        due = timezone.now().date() + timedelta(days=30)
+        self.assertEqual(set(user.assignments.values_list("due_date", flat=True)), {due})
+        self.assertEqual(self.assigned(User.objects.create_user("shore", "shore@example.com", "pw")), set())
+
+    def test_position_change(self):
+        self.learner.position = Position.objects.create(name="Cook")
+        self.learner.save()
+        self.assertEqual(self.assigned(), set())
+
+        self.learner.position = self.position
+        self.learner.save()
+        self.assertEqual(self.assigned(), self.all_courses())
+
+        # Rows that stay eligible keep their due date
+        CourseAssignment.objects.filter(user=self.learner).update(due_date=None)
+        self.learner.save()
+        self.assertFalse(CourseAssignment.objects.filter(user=self.learner, due_date__isnull=False).exists())
+
+    def test_unrelated_saves_skip_the_sync(self):
+        with mock.patch("progress.signals.sync_assignments") as sync:
+            self.learner.save(update_fields=["last_login"])
+            self.courses[0].save(update_fields=["title"])
+        sync.assert_not_called()
+
+    def test_course_positions_add_and_remove(self):
+        course = self.courses[0]
+        course.positions.remove(self.position)
+        self.assertEqual(self.assigned(), {self.courses[1].id})
+        course.positions.add(self.position)
+        self.assertEqual(self.assigned(), self.all_courses())
+
+        # From the position side
+        self.position.course_set.remove(course)
+        self.assertEqual(self.assigned(), {self.courses[1].id})
+        self.position.course_set.clear()
+        self.assertEqual(self.assigned(), set())
+
+    def test_position_delete_resyncs_holders_on_commit(self):
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.position.delete()
+        self.assertEqual(len(callbacks), 1)
+        for callback in callbacks:
+            callback()
+        self.assertEqual(self.assigned(), set())
+
+    def test_ship_type_delete_resyncs_holders_on_commit(self):
+        other = ShipType.objects.create(name="Bulk")
+        course = Course.objects.create(title="Hatch covers", ship_type=other)
+        course.positions.set([self.position])
+        self.learner.ship_type = other
+        self.learner.save()
+        self.assertEqual(self.assigned(), {course.id})
+
+        with mock.patch("progress.signals.sync_assignments", wraps=sync_assignments) as sync:
+            with self.captureOnCommitCallbacks(execute=True):
+                other.delete()
+        sync.assert_called_once_with(user_ids=[self.learner.id])
+        self.learner.refresh_from_db()
+        self.assertIsNone(self.learner.ship_type)
+        self.assertEqual(self.assigned(), set())
+
+
+class RecomputeTests(LearnerProgressTestCase):
+    """Course completion follows modules being added and removed."""
+
+    def setUp(self):
+        super().setUp()
+        self.course = self.courses[0]
+        self.submit(self.quizzes[0])
+        self.submit(self.quizzes[1])
+
+    def status(self):
+        return UserCourseProgress.objects.get(user=self.learner, course=self.course).status
+
+    def after_commit(self, change):
+        # Run only the recompute callbacks, not the certificate renders they queue
+        with self.captureOnCommitCallbacks() as callbacks:
+            result = change()
+        for callback in callbacks:
+            callback()
+        return result
+
+    def test_module_add_reopens_and_delete_recompletes(self):
+        self.assertEqual(self.status(), "completed")
+        module = self.after_commit(lambda: Module.objects.create(course=self.course, title="Added later"))
+        self.assertEqual(self.status(), "in_progress")
+        self.assertIsNone(UserCourseProgress.objects.get(user=self.learner, course=self.course).completed_at)
+
+        self.after_commit(module.delete)
+        self.assertEqual(self.status(), "completed")
+
+    def test_grouped_completion_queues_certificates_and_drops_the_matrix(self):
+        course = self.courses[1]
+        UserCourseProgress.objects.create(user=self.learner, course=course, status="in_progress")
+        UserModuleProgress.objects.bulk_create([
+            UserModuleProgress(user=self.learner, module=module, completed=True) for module in course.modules.all()
+        ])
+        cache.set(COMPLIANCE_MATRIX_CACHE_KEY, [])
+
+        self.assertEqual(recompute.recompute_course_progress([course.id]), (0, 1))
+        self.assertEqual(UserCourseProgress.objects.get(user=self.learner, course=course).status, "completed")
+        self.assertEqual(Certificate.objects.get(user=self.learner, course=course).status, "pending")
+        self.assertIsNone(cache.get(COMPLIANCE_MATRIX_CACHE_KEY))
+
+        # Nothing changed: the matrix stays cached
+        cache.set(COMPLIANCE_MATRIX_CACHE_KEY, [])
+        self.assertEqual(recompute.recompute_course_progress([course.id]), (0, 0))
+        self.assertEqual(cache.get(COMPLIANCE_MATRIX_CACHE_KEY), [])
+
+    def test_large_courses_recompute_in_the_background(self):
+        with self.settings(PROGRESS_RECOMPUTE_SYNC_LIMIT=0), \
+                mock.patch.object(recompute._executor, "submit") as submit:
+            self.after_commit(lambda: Module.objects.create(course=self.course, title="Added later"))
+        submit.assert_called_once_with(recompute._run_in_background, {self.course.id})
+        self.assertEqual(self.status(), "completed")
+
+        with mock.patch.object(recompute, "connections"), mock.patch.object(recompute, "close_old_connections"):
+            recompute._run_in_background({self.course.id})
+        self.assertEqual(self.status(), "in_progress")
+
+    def test_background_failure_is_logged(self):
+        with mock.patch.object(recompute, "connections") as connections, \
+                mock.patch.object(recompute, "close_old_connections"), \
+                mock.patch.object(recompute, "recompute_course_progress", side_effect=RuntimeError), \
+                self.assertLogs("progress.recompute", "ERROR"):
+            recompute._run_in_background({self.course.id})
+        connections.close_all.assert_called_once_with()
+
+
+class TrainingStatusTests(LearnerProgressTestCase):
+    """The nightly summary and the digest read from it."""
+
+    def setUp(self):
+        super().setUp()
+        self.now = timezone.now()
+        self.today = timezone.localdate(self.now)
+
+    def statuses(self):
+        refresh_training_status(self.now)
+        return {
+            course_id: (status, due_date)
+            for course_id, status, due_date in TrainingStatus.objects.filter(user=self.learner)
+            .values_list("course_id", "status", "due_date")
+        }
+
+    def complete(self, course, days_ago):
+        return UserCourseProgress.objects.create(
+            user=self.learner, course=course, status="completed", completed_at=self.now - timedelta(days=days_ago)
+        )
+
+    def test_overdue_and_never_started(self):
+        overdue, upcoming = self.courses
+        CourseAssignment.objects.filter(user=self.learner, course=overdue).update(
+            due_date=self.today - timedelta(days=1)
+        )
+        upcoming_due = CourseAssignment.objects.get(user=self.learner, course=upcoming).due_date
+        self.assertEqual(self.statuses(), {
+            overdue.id: ("overdue", self.today - timedelta(days=1)),
+            upcoming.id: ("never_started", upcoming_due),
+        })
+
+        # Started but not yet due, and completed past the due date, need nothing
+        UserCourseProgress.objects.create(user=self.learner, course=upcoming, status="in_progress")
+        self.complete(overdue, days_ago=0)
+        self.assertEqual(self.statuses(), {})
+
+    def test_expiry_is_grouped_per_validity_days(self):
+        yearly, monthly = self.courses
+        Course.objects.filter(id=yearly.id).update(validity_days=365)
+        Course.objects.filter(id=monthly.id).update(validity_days=30)
+        current = Course.objects.create(title="First aid", ship_type=self.ship_type, validity_days=365)
+        current.positions.set([self.position])
+
+        expiring = self.complete(yearly, days_ago=350)
+        expired = self.complete(monthly, days_ago=40)
+        self.complete(current, days_ago=400)
+        self.complete(current, days_ago=10)  # only the latest completion counts
+
+        self.assertEqual(self.statuses(), {
+            yearly.id: ("expiring", timezone.localdate(expiring.completed_at + timedelta(days=365))),
+            monthly.id: ("overdue", timezone.localdate(expired.completed_at + timedelta(days=30))),
+        })
+
+    def test_admin_endpoint_filters_by_status(self):
+        CourseAssignment.objects.filter(user=self.learner, course=self.courses[0]).update(
+            due_date=self.today - timedelta(days=1)
+        )
+        refresh_training_status(self.now)
+        self.client.force_authenticate(self.admin)
+        url = reverse("training-status")
+        response = self.client.get(url, {"status": "overdue"})
+        rows = json.loads(b"".join(response.streaming_content))
+        self.assertEqual([row["course_id"] for row in rows], [self.courses[0].id])
+        self.assertEqual(self.client.get(url, {"status": "late"}).status_code, 400)
+
+    def test_digest_lists_the_most_urgent_first(self):
+        CourseAssignment.objects.filter(user=self.learner, course=self.courses[1]).update(
+            due_date=self.today - timedelta(days=1)
+        )
+        refresh_training_status(self.now)
+
+        out = StringIO()
+        call_command("send_training_digest", dry_run=True, stdout=out)
+        self.assertIn("Would send 1 training digests.", out.getvalue())
+        self.assertEqual(mail.outbox, [])
+
+        call_command("send_training_digest", stdout=StringIO())
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, ["learner@example.com"])
+        body = mail.outbox[0].body
+        self.assertLess(body.index("Overdue: Ballast"), body.index("Never Started: Fire fighting"))
+
+
+@override_settings(REST_FRAMEWORK={
+    **settings.REST_FRAMEWORK,
+    "DEFAULT_THROTTLE_RATES": {"quiz_submit": "2/min", "quiz_submit_ip": "100/min"},
+})
+class QuizSubmitThrottleTests(LearnerProgressTestCase):
+
+    def submit_at(self, at, quiz=None):
+        # 1000 minutes in, i.e. the start of a one-minute window
+        with mock.patch.object(SlidingWindowThrottle, "timer", return_value=60.0 * 1000 + at):
+            return self.submit(quiz or self.quizzes[0])
+
+    def test_user_limit_returns_429_with_retry_after(self):
+        self.assertEqual(self.submit_at(0).status_code, 201)
+        self.assertEqual(self.submit_at(1).status_code, 201)
+
+        response = self.submit_at(2, self.quizzes[1])
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response["Retry-After"], "88")
+        self.assertEqual(QuizAttempt.objects.count(), 2)
+
+    def test_limit_is_per_user(self):
+        self.submit_at(0)
+        self.submit_at(1)
+        self.client.force_authenticate(User.objects.create_user(
+            "second", "second@example.com", "pw", ship_type=self.ship_type, position=self.position
+        ))
+        self.assertEqual(self.submit_at(2).status_code, 201)
@@ -0,0 +1,123 @@
+"""
+Fleet-wide training status, rebuilt in one pass by
+``manage.py refresh_training_status``.
+
+Every set is one grouped query over CourseAssignment / UserCourseProgress:
+
+* overdue - assigned, never completed and past the assignment due date, or
+  the latest completion is older than the course's ``validity_days``;
+* expiring - the latest completion expires within
+  TRAINING_EXPIRY_WARNING_DAYS;
+* never_started - assigned, not started, not yet due.
+
+Expiry is evaluated once per distinct ``validity_days`` value, which keeps
+the date arithmetic in Python and the queries portable.
+
+``training_digests`` reads the summary back per crew member for
+``manage.py send_training_digest``.
+"""
+from datetime import timedelta
+from itertools import groupby
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Exists, Max, OuterRef, Q
+from django.utils import timezone
+from courses.models import Course
+from .models import CourseAssignment, TrainingStatus, UserCourseProgress
+
+BATCH_SIZE = 1000
+
+
+def refresh_training_status(now=None):
+    """Replace the TrainingStatus table; returns ``{status: rows}``."""
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    counts = {status: 0 for status, _ in TrainingStatus.STATUS_CHOICES}
+
+    with transaction.atomic():
+        TrainingStatus.objects.all().delete()
+        batch = []
+        for status, user_id, course_id, due_date in _status_rows(now, today):
+            batch.append(TrainingStatus(
+                user_id=user_id, course_id=course_id, status=status,
+                due_date=due_date, computed_at=now
+            ))
+            counts[status] += 1
+            if len(batch) >= BATCH_SIZE:
+                TrainingStatus.objects.bulk_create(batch)
+                batch = []
+        TrainingStatus.objects.bulk_create(batch)
+    return counts
+
+
+def _status_rows(now, today):
+    assignments = CourseAssignment.objects.filter(
+        user__role="employee",
+        user__deleted_at__isnull=True,
+        course__deleted_at__isnull=True
+    )
+    progress = UserCourseProgress.objects.filter(user=OuterRef("user"), course=OuterRef("course"))
+    completed = progress.filter(status="completed")
+    started = progress.filter(status__in=["in_progress", "completed"])
+
+    # Never completed
+    overdue = (
+        assignments.filter(due_date__lt=today)
+        .exclude(Exists(completed))
+        .values_list("user_id", "course_id", "due_date")
+    )
+    for user_id, course_id, due_date in overdue.iterator(chunk_size=BATCH_SIZE):
+        yield "overdue", user_id, course_id, due_date
+
+    never_started = (
+        assignments.filter(Q(due_date__gte=today) | Q(due_date__isnull=True))
+        .exclude(Exists(started))
+        .values_list("user_id", "course_id", "due_date")
+    )
+    for user_id, course_id, due_date in never_started.iterator(chunk_size=BATCH_SIZE):
+        yield "never_started", user_id, course_id, due_date
+
+    # Completed, but the latest completion has expired or is about to
+    warning = timedelta(days=settings.TRAINING_EXPIRY_WARNING_DAYS)
+    still_assigned = assignments.filter(user=OuterRef("user"), course=OuterRef("course"))
+    validities = (
+        Course.objects.filter(validity_days__isnull=False)
+        .values_list("validity_days", flat=True).distinct().order_by()
+    )
+    for validity_days in validities:
+        validity = timedelta(days=validity_days)
+        expired_before = now - validity
+        latest = (
+            UserCourseProgress.objects
+            .filter(status="completed", completed_at__isnull=False, course__validity_days=validity_days)
+            .filter(Exists(still_assigned))
+            .values("user_id", "course_id")
+            .annotate(last_completed=Max("completed_at"))
+            .filter(last_completed__lt=expired_before + warning)
+            .values_list("user_id", "course_id", "last_completed")
+        )
+        for user_id, course_id, last_completed in latest.iterator(chunk_size=BATCH_SIZE):
+            status = "overdue" if last_completed < expired_before else "expiring"
+            yield status, user_id, course_id, timezone.localdate(last_completed + validity)
+
+
+def training_digests():
+    """
+    ``(user, rows)`` per crew member with training needing attention, read
+    from the TrainingStatus summary in one query. ``user`` has the id,
+    username and email; ``rows`` are ``(status, course title, due date)``,
+    most urgent first.
+    """
+    urgency = {"overdue": 0, "expiring": 1, "never_started": 2}
+    rows = (
+        TrainingStatus.objects
+        .filter(user__is_active=True, user__deleted_at__isnull=True, course__deleted_at__isnull=True)
+        .exclude(user__email="")
+        .order_by("user_id", "due_date", "course__title")
+        .values_list("user_id", "user__username", "user__email", "status", "course__title", "due_date")
+        .iterator(chunk_size=BATCH_SIZE)
+    )
+    for (user_id, username, email), group in groupby(rows, key=lambda row: row[:3]):
+        statuses = sorted((row[3:] for row in group), key=lambda row: urgency[row[0]])
+        yield {"id": user_id, "username": username, "email": email}, statuses
+
@@ -1,5 +1,15 @@
 from django.urls import path
-from .views import UserCourseProgressAPIView, QuizAttemptAPIView, CourseProgressAPIView
+from .views import (
+    UserCourseProgressAPIView,
+    QuizAttemptAPIView,
+    QuizAnalyticsAPIView,
+    QuizDrawAPIView,
+    CourseProgressAPIView,
+    BatchCourseProgressAPIView,
+    WatchHeartbeatAPIView,
+    ComplianceMatrixAPIView,
+    TrainingStatusAPIView
+)
 
 urlpatterns = [
     # User Course Progress
@@ -9,6 +19,14 @@ urlpatterns = [
     # Quiz Attempts
     path('quiz-attempts/', QuizAttemptAPIView.as_view(), name='quizattempt-list-create'),
     path('quiz-attempts/<int:pk>/', QuizAttemptAPIView.as_view(), name='quizattempt-detail'),
+    path('quiz-attempts/analytics/<int:quiz_id>/', QuizAnalyticsAPIView.as_view(), name='quizattempt-analytics'),
+    path('quiz-attempts/draw/<int:quiz_id>/', QuizDrawAPIView.as_view(), name='quizattempt-draw'),
 
     path("course/<int:course_id>/", CourseProgressAPIView.as_view(), name="course-progress"),
+    path("course/batch/", BatchCourseProgressAPIView.as_view(), name="course-progress-batch"),
+    path("watch/", WatchHeartbeatAPIView.as_view(), name="watch-heartbeat"),
+
+    # Admin reporting
+    path("compliance-matrix/", ComplianceMatrixAPIView.as_view(), name="compliance-matrix"),
+    path("training-status/", TrainingStatusAPIView.as_view(), name="training-status"),
 ]
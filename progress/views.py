@@ -1,22 +1,43 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status, permissions
-from .models import UserCourseProgress, QuizAttempt, UserModuleProgress
-from courses.models import Module, Course, Quiz
+from django.conf import settings
+from django.core.cache import cache
+from django.contrib.auth import get_user_model
+from django.db.models import Count, Exists, F, FilteredRelation, OuterRef, Q, Subquery
+from .models import UserCourseProgress, QuizAttempt, UserModuleProgress, CourseAssignment, TrainingStatus
+from courses.models import Course, Module, Quiz, Question
 from django.utils import timezone
 from .serializers import UserCourseProgressSerializer, QuizAttemptSerializer
+from .compliance import COMPLIANCE_MATRIX_CACHE_KEY
+from .answers import pack_answers
+from .analytics import question_statistics
+from .heartbeats import maybe_flush, record_heartbeat
+from .attempts import make_attempt_token, read_attempt_token
+from courses.cache import LEARNER_QUESTION_FIELDS
+from courses.pools import draw_question_ids
+from courses.snapshots import latest_version, latest_versions, published_answer_key, published_quiz
+from marine_lms import metrics
+from marine_lms.performance import SerializerTimingMixin
+from marine_lms.streaming import StreamingListMixin
+from marine_lms.throttling import IPThrottle, UserThrottle
+
+User = get_user_model()
 
 # ----------------------------
 # Base API for common CRUD
 # ----------------------------
-class BaseAPIView(APIView):
+class BaseAPIView(SerializerTimingMixin, StreamingListMixin, APIView):
     model = None
     serializer_class = None
     permission_classes = [permissions.IsAuthenticated]
 
+    def get_queryset(self):
+        return self.model.objects.all()
+
     def get_object(self, pk):
         try:
-            return self.model.objects.get(pk=pk)
+            return self.get_queryset().get(pk=pk)
         except self.model.DoesNotExist:
             return None
 
@@ -26,16 +47,15 @@ class BaseAPIView(APIView):
             if not obj:
                 return Response({"detail": "Not found"}, status=status.HTTP_404_NOT_FOUND)
             serializer = self.serializer_class(obj)
-            return Response(serializer.data)
-        objs = self.model.objects.all()
-        serializer = self.serializer_class(objs, many=True)
-        return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
+        objs = self.get_queryset()
+        return self.list_response(request, objs)
 
     def post(self, request):
         serializer = self.serializer_class(data=request.data)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data, status=status.HTTP_201_CREATED)
+            return Response(self.get_serializer_data(serializer), status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def put(self, request, pk):
@@ -45,7 +65,7 @@ class BaseAPIView(APIView):
         serializer = self.serializer_class(obj, data=request.data)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def patch(self, request, pk):
@@ -55,7 +75,7 @@ class BaseAPIView(APIView):
         serializer = self.serializer_class(obj, data=request.data, partial=True)
         if serializer.is_valid():
             serializer.save()
-            return Response(serializer.data)
+            return Response(self.get_serializer_data(serializer))
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
     def delete(self, request, pk):
@@ -72,10 +92,18 @@ class BaseAPIView(APIView):
 class UserCourseProgressAPIView(BaseAPIView):
     model = UserCourseProgress
     serializer_class = UserCourseProgressSerializer
+    stream_list = True
+
+    def get_queryset(self):
+        return UserCourseProgress.objects.filter(
+            user__deleted_at__isnull=True, course__deleted_at__isnull=True
+        ).select_related("user", "course")
 
 
 class QuizAttemptAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
+    throttle_scope = "quiz_submit"
+    throttle_classes = [UserThrottle, IPThrottle]
 
     def post(self, request):
         user = request.user
@@ -84,42 +112,103 @@ class QuizAttemptAPIView(APIView):
 
         # Validate quiz
         try:
-            quiz = Quiz.objects.get(id=quiz_id)
-        except Quiz.DoesNotExist:
+            quiz = Quiz.objects.select_related("module__course").get(
+                id=quiz_id, module__course__deleted_at__isnull=True
+            )
+        except (Quiz.DoesNotExist, ValueError, TypeError):
             return Response({"detail": "Quiz not found"}, status=404)
 
-        questions = quiz.questions.all()
+        if not (user.is_staff or user.role == 'admin') and not CourseAssignment.objects.filter(
+            user=user, course_id=quiz.module.course_id
+        ).exists():
+            return Response({"detail": "You do not have access to this quiz."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        # Drawn quizzes are graded only against the questions that were served
+        course_id = quiz.module.course_id
+        served_ids = None
+        token = request.data.get("attempt_token")
+        if token:
+            served = read_attempt_token(token, user.id, quiz.id)
+            if served is None:
+                return Response(
+                    {"detail": "Invalid or expired attempt token"},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            served_ids, snapshot = served
+        elif quiz.draw_size is not None:
+            return Response(
+                {"detail": "attempt_token is required; draw the questions first"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        else:
+            # Never a client-supplied version: grade against the latest snapshot
+            snapshot = latest_versions([course_id]).get(course_id)
+
+        # Published courses are graded against the published answer key
+        if snapshot is None:
+            questions = list(quiz.questions.order_by("id").values("id", "question_text", "correct_answer"))
+        else:
+            published = published_quiz(course_id, snapshot, quiz.id)
+            if published is None:
+                return Response(
+                    {"detail": "This quiz is not in that published version of the course."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            answers = published_answer_key(course_id, snapshot)
+            questions = [
+                {**question, "correct_answer": answers.get(str(question["id"]))}
+                for question in published["questions"]
+            ]
+        if served_ids is not None:
+            served_ids = set(served_ids)
+            questions = [q for q in questions if q["id"] in served_ids]
 
         correct_count = 0
-        total_questions = questions.count()
         detailed_results = []
 
         # ---------- VALIDATION ----------
         for q in questions:
-            user_answer = user_answers.get(str(q.id))  # user's selected option
-            is_correct = (user_answer == q.correct_answer)
+            user_answer = user_answers.get(str(q["id"]))  # user's selected option
+            is_correct = (user_answer == q["correct_answer"])
 
             if is_correct:
                 correct_count += 1
 
             detailed_results.append({
-                "question_id": q.id,
-                "question_text": q.question_text,
+                "question_id": q["id"],
+                "question_text": q["question_text"],
                 "your_answer": user_answer,
-                "correct_answer": q.correct_answer,
+                "correct_answer": q["correct_answer"],
                 "is_correct": is_correct,
             })
 
+        # Nothing to grade (empty bank, or every served question deleted) is not a pass
+        if not detailed_results:
+            return Response(
+                {"detail": "This attempt has no questions to grade."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
         # quiz passed ONLY if all answers correct
+        total_questions = len(detailed_results)
         passed = (correct_count == total_questions)
 
         # ---------- Save quiz attempt ----------
+        question_ids = [result["question_id"] for result in detailed_results]
+        packed_answers, answered = pack_answers(question_ids, user_answers)
         attempt = QuizAttempt.objects.create(
             user=user,
             quiz=quiz,
             score=correct_count,
-            passed=passed
+            passed=passed,
+            question_ids=question_ids,
+            answers=packed_answers,
+            answered=answered
         )
+        metrics.increment("quiz_submissions_total")
+        if passed:
+            metrics.increment("quiz_passes_total")
 
         # ---------- Update Module Progress ----------
         module = quiz.module
@@ -142,7 +231,7 @@ class QuizAttemptAPIView(APIView):
 
         # ---------- Update Course Progress ----------
         course = module.course
-        total_modules = course.modules.count()
+        total_modules = course.modules_count
         completed_modules = UserModuleProgress.objects.filter(
             user=user, module__course=course, completed=True
         ).count()
@@ -176,15 +265,65 @@ class QuizAttemptAPIView(APIView):
 
 
 
+class QuizDrawAPIView(APIView):
+    """
+    Questions for one attempt (without answers) and the signed token to
+    submit them with.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request, quiz_id):
+        try:
+            quiz = Quiz.objects.annotate(
+                course_id=F("module__course_id"),
+                snapshot=latest_version("module__course_id")
+            ).get(id=quiz_id, module__course__deleted_at__isnull=True)
+        except Quiz.DoesNotExist:
+            return Response({"detail": "Quiz not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        user = request.user
+        if not (user.is_staff or user.role == 'admin') and not CourseAssignment.objects.filter(
+            user=user, course_id=quiz.course_id
+        ).exists():
+            return Response({"detail": "You do not have access to this quiz."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        # Published courses draw from the quiz as published
+        if quiz.snapshot is None:
+            question_ids = draw_question_ids(quiz)
+            questions = {
+                question["id"]: question
+                for question in Question.objects.filter(id__in=question_ids).values(*LEARNER_QUESTION_FIELDS)
+            }
+        else:
+            published = published_quiz(quiz.course_id, quiz.snapshot, quiz.id)
+            if published is None:
+                return Response({"detail": "Quiz not found"}, status=status.HTTP_404_NOT_FOUND)
+            questions = {question["id"]: question for question in published["questions"]}
+            question_ids = draw_question_ids(quiz, list(questions))
+
+        return Response({
+            "quiz_id": quiz.id,
+            "attempt_token": make_attempt_token(user.id, quiz.id, question_ids, quiz.snapshot),
+            "questions": [
+                {field: questions[i][field] for field in LEARNER_QUESTION_FIELDS}
+                for i in question_ids if i in questions
+            ],
+        })
+
+
+
 class CourseProgressAPIView(APIView):
     permission_classes = [permissions.IsAuthenticated]
 
     def get(self, request, course_id):
         user = request.user
 
-        total_modules = Module.objects.filter(course_id=course_id).count()
+        total_modules = (
+            Course.objects.filter(id=course_id).values_list("modules_count", flat=True).first() or 0
+        )
         completed_modules = UserModuleProgress.objects.filter(
-            user=user, module__course_id=course_id, completed=True
+            user=user, module__course_id=course_id, module__course__deleted_at__isnull=True, completed=True
         ).count()
 
         percentage = 0
@@ -197,3 +336,253 @@ class CourseProgressAPIView(APIView):
             "total_modules": total_modules,
             "progress_percentage": percentage
         })
+
+
+
+class QuizAnalyticsAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request, quiz_id):
+        try:
+            quiz = Quiz.objects.get(id=quiz_id, module__course__deleted_at__isnull=True)
+        except Quiz.DoesNotExist:
+            return Response({"detail": "Quiz not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        data = question_statistics(quiz)
+        return Response({"quiz_id": quiz.id, **data})
+
+
+class BatchCourseProgressAPIView(APIView):
+    """
+    Module completion for many courses in one grouped query.
+
+    Every course the user is assigned is returned; ?ids=1,2,3 limits the
+    result to those of them. Admins may pass ?user=<id>.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+
+        user_id = request.query_params.get("user")
+        if user_id:
+            if not (request.user.is_staff or request.user.role == 'admin'):
+                return Response({"detail": "You do not have permission to perform this action."},
+                                status=status.HTTP_403_FORBIDDEN)
+            try:
+                user = User.objects.get(id=user_id)
+            except (User.DoesNotExist, ValueError):
+                return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
+
+        # Only courses assigned to the user; Course.objects hides soft-deleted ones
+        courses = Course.objects.filter(assignments__user=user)
+
+        ids = request.query_params.get("ids")
+        if ids:
+            try:
+                course_ids = [int(course_id) for course_id in ids.split(",") if course_id.strip()]
+            except ValueError:
+                return Response({"detail": "ids must be a comma separated list of course ids."},
+                                status=status.HTTP_400_BAD_REQUEST)
+            courses = courses.filter(id__in=course_ids)
+
+        rows = (
+            courses
+            .annotate(completed=FilteredRelation(
+                "modules__usermoduleprogress",
+                condition=Q(
+                    modules__usermoduleprogress__user=user,
+                    modules__usermoduleprogress__completed=True
+                )
+            ))
+            .values("id", "modules_count")
+            .annotate(completed_modules=Count("completed", distinct=True))
+            .order_by("id")
+        )
+
+        results = []
+        for row in rows:
+            percentage = 0
+            if row["modules_count"] > 0:
+                percentage = round((row["completed_modules"] / row["modules_count"]) * 100, 2)
+            results.append({
+                "course_id": row["id"],
+                "completed_modules": row["completed_modules"],
+                "total_modules": row["modules_count"],
+                "progress_percentage": percentage,
+            })
+
+        return Response({"user_id": user.id, "courses": results})
+
+
+# ----------------------------
+# Video watch heartbeats
+# ----------------------------
+class WatchHeartbeatAPIView(APIView):
+    """
+    Sent by the player every few seconds with the current position (seconds).
+
+    Nothing is written to the database here; heartbeats for assigned modules
+    are coalesced in the cache and flushed in bulk by progress.heartbeats.
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def post(self, request):
+        try:
+            module_id = int(request.data.get("module"))
+            position = int(float(request.data.get("position")))
+            duration = int(float(request.data.get("duration")))
+        except (TypeError, ValueError):
+            return Response(
+                {"detail": "module, position and duration are required numbers"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if position < 0 or duration <= 0:
+            return Response(
+                {"detail": "position must be >= 0 and duration > 0"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        stored = UserModuleProgress.objects.filter(user=request.user, module=OuterRef("pk"))
+        module = (
+            Module.objects
+            .filter(id=module_id, course__deleted_at__isnull=True)
+            .annotate(
+                assigned=Exists(CourseAssignment.objects.filter(course=OuterRef("course"), user=request.user)),
+                watched=Subquery(stored.values("watched_seconds")[:1]),
+                stored_duration=Subquery(stored.values("video_duration")[:1]),
+            )
+            .values("assigned", "watched", "stored_duration")
+            .first()
+        )
+        if module is None:
+            return Response({"detail": "Module not found"}, status=status.HTTP_404_NOT_FOUND)
+        if not module["assigned"]:
+            return Response({"detail": "You do not have access to this module."},
+                            status=status.HTTP_403_FORBIDDEN)
+
+        watched, duration = record_heartbeat(
+            request.user.id, module_id, position, duration,
+            module["watched"] or 0, module["stored_duration"] or 0
+        )
+        maybe_flush()
+        return Response(
+            {"module": module_id, "watched_seconds": watched, "duration": duration},
+            status=status.HTTP_202_ACCEPTED
+        )
+
+
+# ----------------------------
+# Admin: Compliance matrix
+# ----------------------------
+class ComplianceMatrixAPIView(APIView):
+    permission_classes = [permissions.IsAdminUser]
+
+    def get(self, request):
+        data = cache.get(COMPLIANCE_MATRIX_CACHE_KEY)
+        if data is None:
+            data = {"cells": self.build_matrix()}
+            cache.set(
+                COMPLIANCE_MATRIX_CACHE_KEY,
+                data,
+                settings.COMPLIANCE_MATRIX_CACHE_TIMEOUT
+            )
+        return Response(data)
+
+    def build_matrix(self):
+        """
+        One row per (ship type, position, course) eligibility cell, grouped
+        from the CourseAssignment table; anyone assigned without a completed
+        progress row counts as not done.
+        """
+        completed = UserCourseProgress.objects.filter(
+            user=OuterRef("user"),
+            course=OuterRef("course"),
+            status="completed"
+        )
+        rows = (
+            CourseAssignment.objects
+            .filter(
+                user__role="employee",
+                user__deleted_at__isnull=True,
+                course__deleted_at__isnull=True
+            )
+            .values(
+                "course__ship_type_id", "course__ship_type__name",
+                "user__position_id", "user__position__name",
+                "course_id", "course__title"
+            )
+            .annotate(
+                assigned_users=Count("id"),
+                completed_users=Count("id", filter=Q(Exists(completed)))
+            )
+            .order_by("course__ship_type__name", "user__position__name", "course__title")
+        )
+
+        cells = []
+        for row in rows:
+            percentage = 0
+            if row["assigned_users"] > 0:
+                percentage = round((row["completed_users"] / row["assigned_users"]) * 100, 2)
+            cells.append({
+                "ship_type_id": row["course__ship_type_id"],
+                "ship_type": row["course__ship_type__name"],
+                "position_id": row["user__position_id"],
+                "position": row["user__position__name"],
+                "course_id": row["course_id"],
+                "course_title": row["course__title"],
+                "assigned_users": row["assigned_users"],
+                "completed_users": row["completed_users"],
+                "completion_percentage": percentage,
+            })
+        return cells
+
+
+class TrainingStatusAPIView(StreamingListMixin, APIView):
+    """
+    Overdue, expiring-soon and never-started training from the nightly
+    TrainingStatus summary. Filter with ?status=, ?course=<id> and
+    ?ship_type=<id> (the crew member's).
+    """
+    permission_classes = [permissions.IsAdminUser]
+    stream_list = True
+
+    def get(self, request):
+        rows = TrainingStatus.objects.filter(
+            user__deleted_at__isnull=True, course__deleted_at__isnull=True
+        )
+
+        training_status = request.query_params.get("status")
+        if training_status:
+            if training_status not in dict(TrainingStatus.STATUS_CHOICES):
+                return Response({"detail": "Unknown status."}, status=status.HTTP_400_BAD_REQUEST)
+            rows = rows.filter(status=training_status)
+
+        for param, field in (("course", "course_id"), ("ship_type", "user__ship_type_id")):
+            value = request.query_params.get(param)
+            if value:
+                try:
+                    rows = rows.filter(**{field: int(value)})
+                except ValueError:
+                    return Response({"detail": f"{param} must be an integer id."},
+                                    status=status.HTTP_400_BAD_REQUEST)
+
+        return self.list_response(request, rows)
+
+    def serialize_many(self, queryset):
+        return [
+            {
+                "user_id": row["user_id"],
+                "username": row["user__username"],
+                "course_id": row["course_id"],
+                "course_title": row["course__title"],
+                "status": row["status"],
+                "due_date": row["due_date"],
+                "computed_at": row["computed_at"],
+            }
+            for row in queryset.values(
+                "user_id", "user__username", "course_id", "course__title",
+                "status", "due_date", "computed_at"
+            )
+        ]
+